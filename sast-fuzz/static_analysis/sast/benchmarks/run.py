@@ -0,0 +1,217 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Benchmarks of the SAST flag groupings and the reachability filter on synthetic inputs.
+
+Usage (from the analyzer directory):
+
+    PYTHONPATH=src python -m benchmarks.run --output results.json [--baseline baseline.json] [--scale 1000 ...]
+
+The results are written as JSON; given a baseline (the results of an earlier run on the same machine), each benchmark is
+compared against it, and the exit code is non-zero if one got slower than the tolerance allows.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_flags, synthetic_sfi
+from sfa import ScoreWeights
+from sfa.analysis import SASTFlags
+from sfa.analysis.filter import ReachabilityFilter
+from sfa.analysis.grouping import BasicBlockGrouping, BasicBlockV2Grouping, FunctionGrouping
+from sfa.analysis.sfi import SFIData
+
+# Default scales, i.e., no. of SAST flags
+DEFAULT_SCALES: List[int] = [10**3, 10**4, 10**5, 10**6]
+
+# Default max. ratio of the time of a benchmark to its baseline time
+DEFAULT_TOLERANCE: float = 1.25
+
+# Min. difference (in seconds) between the time of a benchmark and its baseline time to count as a regression; shorter
+# runs are dominated by noise
+MIN_REGRESSION_SECS: float = 0.01
+
+# Result of a benchmark at a certain scale; the time is the minimum of the repeated runs
+BenchResult = namedtuple("BenchResult", ["benchmark", "scale", "n_flags", "n_out", "secs"])
+
+# Benchmarks: setup of the SAST flag filter / grouping (incl. the index creation) and its application
+BENCHMARKS: Dict[str, Callable[[SFIData, SASTFlags], int]] = {
+    "BasicBlockGrouping": lambda sfi, flags: len(BasicBlockGrouping(sfi, ScoreWeights()).group(flags)),
+    "BasicBlockV2Grouping": lambda sfi, flags: len(BasicBlockV2Grouping(sfi, ScoreWeights()).group(flags)),
+    "FunctionGrouping": lambda sfi, flags: len(FunctionGrouping(sfi, ScoreWeights()).group(flags)),
+    "ReachabilityFilter": lambda sfi, flags: len(ReachabilityFilter(sfi).filter(flags)),
+}
+
+
+def run_benchmarks(
+    scales: List[int], flags_per_func: int, funcs_per_file: int, bbs_per_func: int, repeat: int, seed: int = 0
+) -> List[BenchResult]:
+    """
+    Run all benchmarks on synthetic inputs of the given scales.
+
+    :param scales: No. of SAST flags per input
+    :param flags_per_func: No. of SAST flags per function (determines the no. of functions)
+    :param funcs_per_file: No. of functions per source file
+    :param bbs_per_func: No. of basic blocks per function
+    :param repeat: No. of runs per benchmark
+    :param seed:
+    :return:
+    """
+    results = []
+
+    for scale in scales:
+        n_funcs = max(scale // flags_per_func, 1)
+
+        sfi_data = synthetic_sfi(
+            max(n_funcs // funcs_per_file, 1), min(n_funcs, funcs_per_file), bbs_per_func, seed=seed
+        )
+        sfi = SFIData(sfi_data)
+        flags = synthetic_flags(sfi_data, scale, seed=seed)
+
+        del sfi_data
+
+        logging.info(
+            f"Scale {scale}: {len(sfi.funcs)} function(s), {len(sfi.bbs)} basic block(s), {len(flags)} flag(s)"
+        )
+
+        for name, bench in BENCHMARKS.items():
+            times = []
+
+            for _ in range(repeat):
+                gc.collect()
+
+                start = time.perf_counter()
+                n_out = bench(sfi, flags)
+                times.append(time.perf_counter() - start)
+
+            results.append(BenchResult(name, scale, len(flags), n_out, min(times)))
+
+            logging.info(f"{name} @ {scale}: {min(times):.3f}s ({n_out} flag(s))")
+
+    return results
+
+
+def compare(results: List[BenchResult], baseline: List[BenchResult], tolerance: float) -> List[str]:
+    """
+    Compare benchmark results against baseline results.
+
+    :param results:
+    :param baseline:
+    :param tolerance: Max. ratio of the time of a benchmark to its baseline time
+    :return: Descriptions of the regressions
+    """
+    base_secs = {(result.benchmark, result.scale): result.secs for result in baseline}
+
+    regressions = []
+
+    for result in results:
+        secs = base_secs.get((result.benchmark, result.scale))
+
+        if secs is None:
+            logging.info(f"{result.benchmark} @ {result.scale}: no baseline")
+            continue
+
+        ratio = result.secs / max(secs, 1e-9)
+        logging.info(f"{result.benchmark} @ {result.scale}: {secs:.3f}s -> {result.secs:.3f}s ({ratio:.2f}x)")
+
+        if ratio > tolerance and result.secs - secs >= MIN_REGRESSION_SECS:
+            regressions.append(f"{result.benchmark} @ {result.scale}: {ratio:.2f}x slower than baseline")
+
+    return regressions
+
+
+def write_results(file: Path, results: List[BenchResult], params: Dict) -> None:
+    """
+    Write benchmark results into a JSON file (along with the parameters and the environment).
+
+    :param file:
+    :param results:
+    :param params: Parameters of the synthetic inputs
+    :return:
+    """
+    meta = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "params": params,
+    }
+
+    file.write_text(json.dumps({"meta": meta, "results": [result._asdict() for result in results]}, indent=2))
+
+
+def read_results(file: Path) -> List[BenchResult]:
+    """
+    Read benchmark results from a JSON file.
+
+    :param file:
+    :return:
+    """
+    return [BenchResult(**result) for result in json.loads(file.read_text())["results"]]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the SAST flag groupings and filters on synthetic inputs.")
+    parser.add_argument("--scale", type=int, action="append", help="No. of SAST flags (repeatable).")
+    parser.add_argument("--flags-per-func", type=int, default=10, help="No. of SAST flags per function.")
+    parser.add_argument("--funcs-per-file", type=int, default=100, help="No. of functions per source file.")
+    parser.add_argument("--bbs-per-func", type=int, default=8, help="No. of basic blocks per function.")
+    parser.add_argument("--repeat", type=int, default=3, help="No. of runs per benchmark (the fastest one counts).")
+    parser.add_argument("--output", type=Path, help="Path to the results file (JSON).")
+    parser.add_argument("--baseline", type=Path, help="Path to the results file of an earlier run to compare against.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Max. slowdown vs. the baseline.")
+
+    args = parser.parse_args(argv)
+
+    params = {
+        "flags_per_func": args.flags_per_func,
+        "funcs_per_file": args.funcs_per_file,
+        "bbs_per_func": args.bbs_per_func,
+        "repeat": args.repeat,
+    }
+
+    results = run_benchmarks(args.scale or DEFAULT_SCALES, **params)
+
+    if args.output is not None:
+        write_results(args.output, results, params)
+
+    if args.baseline is not None:
+        if json.loads(args.baseline.read_text())["meta"]["params"] != params:
+            logging.warning("Baseline was run with different input parameters")
+
+        regressions = compare(results, read_results(args.baseline), args.tolerance)
+
+        for regression in regressions:
+            logging.error(regression)
+
+        return 1 if len(regressions) > 0 else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(asctime)s SFA[%(levelname)s]: %(message)s", level=logging.INFO, stream=sys.stdout)
+
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import random
+from typing import Dict, List
+
+from sfa.analysis import SASTFlag, SASTFlags
+
+# Lines between two functions of a synthetic source file (not covered by any code block)
+FUNC_GAP: int = 2
+
+
+def synthetic_sfi(
+    n_files: int, n_funcs: int, n_bbs: int, bb_lines: int = 3, reachable_rate: float = 0.5, seed: int = 0
+) -> Dict:
+    """
+    Generate synthetic SFI data (in the format of the SFI file). The functions are laid out one after another in each
+    file; the basic blocks of a function cover its lines without gaps.
+
+    :param n_files: No. of source files
+    :param n_funcs: No. of functions per file
+    :param n_bbs: No. of basic blocks per function
+    :param bb_lines: No. of lines per basic block
+    :param reachable_rate: Fraction of the functions reachable from the main function
+    :param seed:
+    :return:
+    """
+    rand = random.Random(seed)
+
+    functions: List[Dict] = []
+    bb_id = 0
+
+    for file_num in range(n_files):
+        file = f"file{file_num}.c"
+        line = 1
+
+        for func_num in range(n_funcs):
+            func_start = line
+
+            basic_blocks = []
+            for _ in range(n_bbs):
+                basic_blocks.append(
+                    {"id": bb_id, "location": {"line": {"start": line, "end": line + bb_lines - 1}}, "LoC": bb_lines}
+                )
+
+                bb_id += 1
+                line += bb_lines
+
+            functions.append(
+                {
+                    "name": f"func{func_num}",
+                    "location": {
+                        "filename": file,
+                        "line": {"start": func_start, "end": line - 1},
+                        "reachable_from_main": rand.random() < reachable_rate,
+                    },
+                    "LoC": line - func_start,
+                    "basic_blocks": basic_blocks,
+                }
+            )
+
+            line += FUNC_GAP
+
+    return {"functions": functions}
+
+
+def synthetic_flags(
+    sfi_data: Dict, n_flags: int, n_tools: int = 5, n_vulns: int = 20, outside_rate: float = 0.1, seed: int = 0
+) -> SASTFlags:
+    """
+    Generate synthetic SAST flags for synthetic SFI data. Duplicates are dropped, so slightly fewer flags than requested
+    may be returned.
+
+    :param sfi_data: SFI data (see 'synthetic_sfi')
+    :param n_flags: No. of flags
+    :param n_tools: No. of distinct tools
+    :param n_vulns: No. of distinct vulnerabilities
+    :param outside_rate: Fraction of the flags placed outside of any function (between functions or in unknown files)
+    :param seed:
+    :return:
+    """
+    rand = random.Random(seed)
+
+    funcs = [(func["location"]["filename"], func["location"]["line"]) for func in sfi_data["functions"]]
+
+    tools = [f"tool{i}" for i in range(n_tools)]
+    vulns = [f"vuln{i}" for i in range(n_vulns)]
+
+    flags = SASTFlags()
+
+    for _ in range(n_flags):
+        file, lines = rand.choice(funcs)
+
+        if rand.random() < outside_rate:
+            if rand.random() < 0.5:
+                file, line = "unknown.c", rand.randint(1, lines["end"])
+            else:
+                line = lines["end"] + rand.randint(1, FUNC_GAP)
+        else:
+            line = rand.randint(lines["start"], lines["end"])
+
+        flags.add(SASTFlag(rand.choice(tools), file, line, rand.choice(vulns)))
+
+    return flags
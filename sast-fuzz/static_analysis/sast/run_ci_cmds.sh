@@ -1,6 +1,6 @@
 #!/usr/bin/env bash
 
-poetry run isort --profile black src
-poetry run black --line-length 120 --skip-magic-trailing-comma src
-poetry run mypy src
+poetry run isort --profile black src benchmarks
+poetry run black --line-length 120 --skip-magic-trailing-comma src benchmarks
+poetry run mypy src benchmarks
 poetry run bandit --recursive src
\ No newline at end of file
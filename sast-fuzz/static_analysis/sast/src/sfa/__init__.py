@@ -13,19 +13,45 @@
 # limitations under the License.
 
 from collections import namedtuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 import yaml
 
 ScoreWeights = namedtuple("ScoreWeights", ["flags", "tools"], defaults=[0.5, 0.5])
 
-# SAST tool configuration
+# SAST tool configuration; the memory budget (in MB) is used by the scheduler of parallel tool runs, the timeout (in
+# seconds) limits each command run by the tool runner (values < 1 mean "no timeout")
 SASTToolConfig = namedtuple(
-    "SASTToolConfig", ["sanity_checks", "path", "checks", "num_threads"], defaults=["", "", "", -1]
+    "SASTToolConfig",
+    ["sanity_checks", "path", "checks", "num_threads", "memory", "timeout"],
+    defaults=["", "", "", -1, -1, -1],
 )
 
+# Result cache location, max. entry age (in days), and max. total size (in MB)
+CacheConfig = namedtuple(
+    "CacheConfig", ["path", "max_age", "max_size"], defaults=[Path.home() / ".cache" / "sfa", 30, 1024]
+)
+
+# Global limits of parallel tool runs: max. no. of threads and max. memory (in MB); values < 1 mean "all available".
+# With 'in_process', the parallel tool runs are driven by threads of the sfa process instead of worker processes.
+SchedConfig = namedtuple("SchedConfig", ["max_threads", "max_memory", "in_process"], defaults=[-1, -1, False])
+
+
+@dataclass
+class FilterConfig:
+    """
+    Flag filter settings: glob patterns of excluded file paths, per-tool glob patterns of allowed and denied vuln.
+    types, and min. vuln. score of grouped flags.
+    """
+
+    exclude_paths: Tuple[str, ...] = ()
+    allow_vulns: Dict[str, List[str]] = field(default_factory=dict)
+    deny_vulns: Dict[str, List[str]] = field(default_factory=dict)
+    min_score: float = 0.0
+
 
 @dataclass
 class AppConfig:
@@ -41,6 +67,10 @@ class AppConfig:
     codeql: SASTToolConfig
     clang_scan: SASTToolConfig
 
+    cache: CacheConfig = CacheConfig()
+    scheduling: SchedConfig = SchedConfig()
+    filters: FilterConfig = field(default_factory=FilterConfig)
+
     @classmethod
     def from_yaml(cls, file: Path) -> "AppConfig":
         """
@@ -51,6 +81,10 @@ class AppConfig:
         """
         config = yaml.safe_load(file.read_text())
 
+        cache = config.get("cache", {})
+        scheduling = config.get("scheduling", {})
+        filters = config.get("filters", {})
+
         codeql_checks = [
             check.replace("%LIBRARY_PATH%", config["tools"]["codeql"]["lib_path"])
             for check in config["tools"]["codeql"]["checks"]
@@ -63,29 +97,55 @@ class AppConfig:
                 config["tools"]["flawfinder"]["path"],
                 config["tools"]["flawfinder"]["checks"],
                 -1,
+                config["tools"]["flawfinder"].get("memory", -1),
+                config["tools"]["flawfinder"].get("timeout", -1),
             ),
             semgrep=SASTToolConfig(
                 config["tools"]["semgrep"]["sanity_checks"],
                 config["tools"]["semgrep"]["path"],
                 config["tools"]["semgrep"]["checks"],
                 config["tools"]["semgrep"]["num_threads"],
+                config["tools"]["semgrep"].get("memory", -1),
+                config["tools"]["semgrep"].get("timeout", -1),
             ),
             infer=SASTToolConfig(
                 config["tools"]["infer"]["sanity_checks"],
                 config["tools"]["infer"]["path"],
                 config["tools"]["infer"]["checks"],
                 config["tools"]["infer"]["num_threads"],
+                config["tools"]["infer"].get("memory", -1),
+                config["tools"]["infer"].get("timeout", -1),
             ),
             codeql=SASTToolConfig(
                 config["tools"]["codeql"]["sanity_checks"],
                 config["tools"]["codeql"]["path"],
                 codeql_checks,
                 config["tools"]["codeql"]["num_threads"],
+                config["tools"]["codeql"].get("memory", -1),
+                config["tools"]["codeql"].get("timeout", -1),
             ),
             clang_scan=SASTToolConfig(
                 config["tools"]["clang_scan"]["sanity_checks"],
                 config["tools"]["clang_scan"]["path"],
                 config["tools"]["clang_scan"]["checks"],
                 -1,
+                config["tools"]["clang_scan"].get("memory", -1),
+                config["tools"]["clang_scan"].get("timeout", -1),
+            ),
+            cache=CacheConfig(
+                Path(cache.get("path", CacheConfig().path)).expanduser(),
+                cache.get("max_age", CacheConfig().max_age),
+                cache.get("max_size", CacheConfig().max_size),
+            ),
+            scheduling=SchedConfig(
+                scheduling.get("max_threads", SchedConfig().max_threads),
+                scheduling.get("max_memory", SchedConfig().max_memory),
+                scheduling.get("in_process", SchedConfig().in_process),
+            ),
+            filters=FilterConfig(
+                tuple(filters.get("exclude_paths") or ()),
+                filters.get("allow_vulns") or {},
+                filters.get("deny_vulns") or {},
+                filters.get("min_score", FilterConfig().min_score),
             ),
         )
@@ -12,14 +12,44 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import csv
+import json
+import logging
+import operator
 import os
+import struct
+from array import array
 from collections import namedtuple
 from pathlib import Path
-from typing import Generator, Optional, Set, Union
+from typing import Any, Dict, Generator, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
 
 # CSV separator
 CSV_SEP: str = ","
 
+# File extension selecting the binary flag format (instead of CSV)
+BINARY_SUFFIX: str = ".sfb"
+
+# Magic bytes (incl. format version) at the start of binary flag files
+BINARY_MAGIC: bytes = b"SFAFLG01"
+
+# Columns of binary flag files (name, little-endian NumPy dtype). The base columns cover all flags; the extended
+# columns only cover the flags which are not stored in compact form, i.e. the trailing rows.
+BINARY_BASE_COLUMNS: List[Tuple[str, str]] = [("tool", "<u4"), ("file", "<u4"), ("line", "<i8"), ("vuln", "<u4")]
+BINARY_EXT_COLUMNS: List[Tuple[str, str]] = [
+    ("n_columns", "<u1"),
+    ("n_flg_lines", "<i8"),
+    ("n_all_lines", "<i8"),
+    ("n_run_tools", "<i8"),
+    ("n_all_tools", "<i8"),
+    ("score", "<f8"),
+    ("func", "<i8"),
+]
+
+# Alignment (in bytes) of the columns of binary flag files
+BINARY_ALIGN: int = 8
+
 # SAST flag
 SASTFlag = namedtuple("SASTFlag", ["tool", "file", "line", "vuln"])
 
@@ -37,6 +67,10 @@ GroupedSASTFlag_with_funcname = namedtuple(
 # SAST flag type
 SASTFlagType = Union[SASTFlag, GroupedSASTFlag, GroupedSASTFlag_with_funcname]
 
+# Columnar view of SAST flags: string tables of tools, files, and vulns. as well as per-flag tool codes, file codes,
+# lines, and vuln. codes (64-bit integer arrays)
+FlagColumns = namedtuple("FlagColumns", ["tools", "files", "vulns", "tool_codes", "file_codes", "lines", "vuln_codes"])
+
 
 def div(a: Union[int, float], b: Union[int, float]) -> float:
     """
@@ -49,13 +83,148 @@ def div(a: Union[int, float], b: Union[int, float]) -> float:
     return 0 if b == 0 else (a / b)
 
 
+class StringTable:
+    """
+    Table of interned strings, mapping each distinct string to a dense integer code.
+    """
+
+    def __init__(self) -> None:
+        self._codes: Dict[str, int] = {}
+        self._strings: List[str] = []
+
+    def encode(self, string: str) -> int:
+        """
+        Get the code of a string (added to the table if not present yet).
+
+        :param string:
+        :return:
+        """
+        code = self._codes.get(string)
+
+        if code is None:
+            code = self._codes[string] = len(self._strings)
+            self._strings.append(string)
+
+        return code
+
+    def lookup(self, string: str) -> Optional[int]:
+        """
+        Get the code of a string without adding it to the table.
+
+        :param string:
+        :return: Code or None if the string is not in the table
+        """
+        return self._codes.get(string)
+
+    def decode(self, code: int) -> str:
+        return self._strings[code]
+
+    def copy(self) -> "StringTable":
+        table = StringTable()
+        table._codes = self._codes.copy()
+        table._strings = self._strings.copy()
+
+        return table
+
+    @property
+    def strings(self) -> List[str]:
+        return self._strings
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+# Bit width of each field of a packed SAST flag key
+KEY_FIELD_BITS: int = 32
+
+# Mask of a single field of a packed SAST flag key
+KEY_FIELD_MASK: int = (1 << KEY_FIELD_BITS) - 1
+
+
 class SASTFlags:
     """
-    SAST flag container.
+    SAST flag container with set semantics.
+
+    Plain SAST flags are stored in a compact form: their tool, file, and vuln. strings are interned in per-container
+    string tables, and each flag is kept as a single integer packing the string codes and the line number. Other flag
+    types (e.g. grouped flags) are kept as-is.
     """
 
-    def __init__(self, flags: Optional[Set[SASTFlagType]] = None) -> None:
-        self._flags = set() if flags is None else flags
+    def __init__(self, flags: Optional[Iterable[SASTFlagType]] = None) -> None:
+        self._tools = StringTable()
+        self._files = StringTable()
+        self._vulns = StringTable()
+
+        # Packed keys of the plain SAST flags
+        self._keys: Set[int] = set()
+
+        # Flags which can't be packed (other flag types or unexpected field values)
+        self._others: Set[SASTFlagType] = set()
+
+        for flag in flags or []:
+            self.add(flag)
+
+    @staticmethod
+    def _packable_line(flag: SASTFlagType) -> Optional[int]:
+        """
+        Get the line of a plain SAST flag as int, e.g. for lines given as NumPy integers.
+
+        :param flag:
+        :return: Line or None if the flag can't be packed
+        """
+        if not (
+            type(flag) is SASTFlag and type(flag.tool) is str and type(flag.file) is str and type(flag.vuln) is str
+        ):
+            return None
+
+        try:
+            line = operator.index(flag.line)
+        except TypeError:
+            return None
+
+        return line if 0 <= line <= KEY_FIELD_MASK else None
+
+    @staticmethod
+    def _pack(tool: int, file: int, line: int, vuln: int) -> int:
+        return (((((tool << KEY_FIELD_BITS) | file) << KEY_FIELD_BITS) | vuln) << KEY_FIELD_BITS) | line
+
+    @staticmethod
+    def _unpack(key: int) -> Tuple[int, int, int, int]:
+        """
+        Unpack a SAST flag key.
+
+        :param key:
+        :return: Tool code, file code, line, and vuln. code
+        """
+        line = key & KEY_FIELD_MASK
+        key >>= KEY_FIELD_BITS
+        vuln = key & KEY_FIELD_MASK
+        key >>= KEY_FIELD_BITS
+        file = key & KEY_FIELD_MASK
+
+        return key >> KEY_FIELD_BITS, file, line, vuln
+
+    def _lookup_key(self, flag: SASTFlagType, line: int) -> Optional[int]:
+        """
+        Get the packed key of a plain SAST flag without interning its strings.
+
+        :param flag:
+        :param line: Line of the flag (as int)
+        :return: Key or None if one of the strings is unknown
+        """
+        tool = self._tools.lookup(flag.tool)
+        file = self._files.lookup(flag.file)
+        vuln = self._vulns.lookup(flag.vuln)
+
+        if tool is None or file is None or vuln is None:
+            return None
+
+        return self._pack(tool, file, line, vuln)
+
+    def _decode(self, key: int) -> SASTFlag:
+        tool, file, line, vuln = self._unpack(key)
+
+        return SASTFlag(self._tools.decode(tool), self._files.decode(file), line, self._vulns.decode(vuln))
 
     def add(self, flag: SASTFlagType) -> None:
         """
@@ -63,7 +232,14 @@ class SASTFlags:
         :param flag:
         :return:
         """
-        self._flags.add(flag)
+        if (line := self._packable_line(flag)) is not None:
+            tool = self._tools.encode(flag.tool)
+            file = self._files.encode(flag.file)
+            vuln = self._vulns.encode(flag.vuln)
+
+            self._keys.add(self._pack(tool, file, line, vuln))
+        else:
+            self._others.add(flag)
 
     def update(self, *var_flags: "SASTFlags") -> None:
         """
@@ -73,7 +249,16 @@ class SASTFlags:
         :return:
         """
         for flags in var_flags:
-            self._flags.update(flags._flags)
+            # Translate the string codes of the other container into codes of this container once per string
+            tool_codes = list(map(self._tools.encode, flags._tools.strings))
+            file_codes = list(map(self._files.encode, flags._files.strings))
+            vuln_codes = list(map(self._vulns.encode, flags._vulns.strings))
+
+            for key in flags._keys:
+                tool, file, line, vuln = self._unpack(key)
+                self._keys.add(self._pack(tool_codes[tool], file_codes[file], line, vuln_codes[vuln]))
+
+            self._others.update(flags._others)
 
     def remove(self, flag: SASTFlagType) -> None:
         """
@@ -82,7 +267,15 @@ class SASTFlags:
         :param flag:
         :return:
         """
-        self._flags.remove(flag)
+        if (line := self._packable_line(flag)) is not None:
+            key = self._lookup_key(flag, line)
+
+            if key is None:
+                raise KeyError(flag)
+
+            self._keys.remove(key)
+        else:
+            self._others.remove(flag)
 
     def to_csv(self, file: Path) -> None:
         """
@@ -91,50 +284,320 @@ class SASTFlags:
         :param file:
         :return:
         """
-        with file.open("w+") as csv_file:
-            for flag in self._flags:
-                csv_file.write(CSV_SEP.join(map(str, flag)) + os.linesep)
+        write_csv(file, self._rows())
+
+    def read_csv(self, file: Path) -> None:
+        """
+        Add the SAST flags of a CSV file.
+
+        :param file:
+        :return:
+        """
+        tools, files, vulns, keys, pack = self._tools, self._files, self._vulns, self._keys, self._pack
+
+        for row in _read_rows(file):
+            # Plain SAST flags are packed right away, without creating intermediate flag objects
+            if len(row) == 4:
+                line = int(row[2])
+
+                if 0 <= line <= KEY_FIELD_MASK:
+                    keys.add(pack(tools.encode(row[0]), files.encode(row[1]), line, vulns.encode(row[3])))
+                    continue
+
+            self._others.add(_parse_row(row))
+
+    @classmethod
+    def from_csv(cls, *files: Path) -> "SASTFlags":
+        """
+        Read SAST flags from one or more CSV files.
+
+        :param files:
+        :return:
+        """
+        flags = SASTFlags()
+
+        for file in files:
+            flags.read_csv(file)
+
+        return flags
+
+    def to_binary(self, file: Path) -> None:
+        """
+        Write SAST flags to a binary (columnar) file. The file consists of the magic bytes, the length-prefixed JSON
+        header holding the string tables and row counts, and the aligned columns; it can be memory-mapped for reading.
+
+        :param file:
+        :return:
+        """
+        cols = self.columns()
+        others = list(self._others)
+
+        funcs = StringTable()
+        ext: List[List[Any]] = [[] for _ in BINARY_EXT_COLUMNS]
+
+        # 'columns' lists the compact flags first, followed by the other flags in iteration order
+        for flag in others:
+            vals = [len(flag), *flag[4:9]] if len(flag) >= 9 else [len(flag), 0, 0, 0, 0, 0.0]
+            vals.append(funcs.encode(flag[9]) if len(flag) >= 10 else -1)  # type: ignore
+
+            for col, val in zip(ext, vals):
+                col.append(val)
+
+        header = {
+            "n_flags": len(self),
+            "n_others": len(others),
+            "tools": cols.tools,
+            "files": cols.files,
+            "vulns": cols.vulns,
+            "funcs": funcs.strings,
+        }
+
+        base = [cols.tool_codes, cols.file_codes, cols.lines, cols.vuln_codes]
+
+        with file.open("wb") as bin_file:
+            header_bytes = json.dumps(header).encode()
+
+            bin_file.write(BINARY_MAGIC + struct.pack("<Q", len(header_bytes)) + header_bytes)
+
+            for (_, dtype), vals in zip(BINARY_BASE_COLUMNS + BINARY_EXT_COLUMNS, base + ext):
+                bin_file.write(bytes(-bin_file.tell() % BINARY_ALIGN))
+                bin_file.write(np.asarray(vals, dtype=dtype).tobytes())
+
+    def read_binary(self, file: Path) -> None:
+        """
+        Add the SAST flags of a binary file (see 'to_binary').
+
+        :param file:
+        :return:
+        """
+        data = np.memmap(file, dtype=np.uint8, mode="r")
+
+        if bytes(data[: len(BINARY_MAGIC)]) != BINARY_MAGIC:
+            raise ValueError(f"Not a binary SAST flag file: {file}")
+
+        offset = len(BINARY_MAGIC) + 8
+        (header_len,) = struct.unpack("<Q", bytes(data[len(BINARY_MAGIC) : offset]))
+        header = json.loads(bytes(data[offset : offset + header_len]))
+        offset += header_len
+
+        n_flags, n_others = header["n_flags"], header["n_others"]
+
+        cols: Dict[str, np.ndarray] = {}
+        for i, (name, dtype) in enumerate(BINARY_BASE_COLUMNS + BINARY_EXT_COLUMNS):
+            count = n_flags if i < len(BINARY_BASE_COLUMNS) else n_others
+
+            offset += -offset % BINARY_ALIGN
+            cols[name] = data[offset : offset + count * np.dtype(dtype).itemsize].view(dtype)
+            offset += cols[name].nbytes
+
+        # Translate the string codes of the file into codes of this container
+        tool_codes = np.array([self._tools.encode(s) for s in header["tools"]] or [0], dtype=np.uint64)
+        file_codes = np.array([self._files.encode(s) for s in header["files"]] or [0], dtype=np.uint64)
+        vuln_codes = np.array([self._vulns.encode(s) for s in header["vulns"]] or [0], dtype=np.uint64)
+
+        n_keys = n_flags - n_others
+        bits = np.uint64(KEY_FIELD_BITS)
+
+        # Packed keys are split into two 64-bit halves, (tool, file) and (vuln., line)
+        high = (tool_codes[cols["tool"][:n_keys]] << bits) | file_codes[cols["file"][:n_keys]]
+        low = (vuln_codes[cols["vuln"][:n_keys]] << bits) | cols["line"][:n_keys].astype(np.uint64)
+
+        self._keys.update((hi << (2 * KEY_FIELD_BITS)) | lo for hi, lo in zip(high.tolist(), low.tolist()))
+
+        for i in range(n_others):
+            j = n_keys + i
+            vals: List[Any] = [
+                header["tools"][cols["tool"][j]],
+                header["files"][cols["file"][j]],
+                int(cols["line"][j]),
+                header["vulns"][cols["vuln"][j]],
+            ]
+
+            n_columns = int(cols["n_columns"][i])
+            if n_columns >= 9:
+                vals.extend(int(cols[name][i]) for name, _ in BINARY_EXT_COLUMNS[1:5])
+                vals.append(float(cols["score"][i]))
+            if n_columns >= 10:
+                vals.append(header["funcs"][cols["func"][i]])
+
+            self.add(CSV_COLUMNS[n_columns](*vals))
 
     @classmethod
-    def from_csv(cls, file: Path) -> "SASTFlags":
+    def from_binary(cls, *files: Path) -> "SASTFlags":
         """
-        Read SAST flags from a CSV file.
+        Read SAST flags from one or more binary files.
+
+        :param files:
+        :return:
+        """
+        flags = SASTFlags()
+
+        for file in files:
+            flags.read_binary(file)
+
+        return flags
+
+    def to_file(self, file: Path) -> None:
+        """
+        Write SAST flags to a binary file (if the file has the binary extension) or a CSV file.
 
         :param file:
         :return:
         """
+        if file.suffix == BINARY_SUFFIX:
+            self.to_binary(file)
+        else:
+            self.to_csv(file)
+
+    @classmethod
+    def from_files(cls, *files: Path) -> "SASTFlags":
+        """
+        Read SAST flags from one or more binary or CSV files (selected by file extension).
+
+        :param files:
+        :return:
+        """
         flags = SASTFlags()
 
-        with file.open("r") as csv_file:
-            for line in csv_file:
-                vals = line.strip().split(CSV_SEP)
-
-                if len(vals) == 4:  # Regular SAST flag
-                    flags.add(SASTFlag(vals[0], vals[1], int(vals[2]), vals[3]))
-
-                if len(vals) == 9:  # Grouped SAST flag
-                    flags.add(
-                        GroupedSASTFlag(
-                            vals[0],
-                            vals[1],
-                            int(vals[2]),
-                            vals[3],
-                            int(vals[4]),
-                            int(vals[5]),
-                            int(vals[6]),
-                            int(vals[7]),
-                            float(vals[8]),
-                        )
-                    )
+        for file in files:
+            if file.suffix == BINARY_SUFFIX:
+                flags.read_binary(file)
+            else:
+                flags.read_csv(file)
 
         return flags
 
+    def _rows(self) -> Generator[Sequence[Any], None, None]:
+        """
+        Get the CSV rows of the SAST flags (without creating intermediate flag objects for the packed flags).
+
+        :return:
+        """
+        tools, files, vulns = self._tools.strings, self._files.strings, self._vulns.strings
+
+        for key in self._keys:
+            tool, file, line, vuln = self._unpack(key)
+            yield tools[tool], files[file], line, vulns[vuln]
+
+        yield from self._others
+
+    def columns(self) -> FlagColumns:
+        """
+        Get a columnar view of the (tool, file, line, vuln.) fields of the SAST flags. Flags which are not stored in
+        compact form contribute their first four fields.
+
+        :return:
+        """
+        tools, files, vulns = self._tools, self._files, self._vulns
+
+        if len(self._others) > 0:
+            tools, files, vulns = tools.copy(), files.copy(), vulns.copy()
+
+        tool_codes, file_codes, lines, vuln_codes = array("q"), array("q"), array("q"), array("q")
+
+        for key in self._keys:
+            tool, file, line, vuln = self._unpack(key)
+
+            tool_codes.append(tool)
+            file_codes.append(file)
+            lines.append(line)
+            vuln_codes.append(vuln)
+
+        for flag in self._others:
+            tool_codes.append(tools.encode(flag.tool))
+            file_codes.append(files.encode(flag.file))
+            lines.append(int(flag.line))
+            vuln_codes.append(vulns.encode(flag.vuln))
+
+        return FlagColumns(tools.strings, files.strings, vulns.strings, tool_codes, file_codes, lines, vuln_codes)
+
     def __eq__(self, other: object) -> bool:
-        return False if not isinstance(other, SASTFlags) else self._flags == other._flags
+        if not isinstance(other, SASTFlags) or len(self) != len(other):
+            return False
+
+        if self._others != other._others:
+            return False
+
+        return set(map(self._decode, self._keys)) == set(map(other._decode, other._keys))
+
+    def __contains__(self, flag: object) -> bool:
+        if (line := self._packable_line(flag)) is not None:  # type: ignore
+            return self._lookup_key(flag, line) in self._keys  # type: ignore
+
+        return flag in self._others
 
     def __iter__(self) -> Generator[SASTFlagType, None, None]:
-        for flag in self._flags:
+        for key in self._keys:
+            yield self._decode(key)
+
+        for flag in self._others:
             yield flag
 
     def __len__(self) -> int:
-        return len(self._flags)
+        return len(self._keys) + len(self._others)
+
+
+# Number of CSV columns per SAST flag type
+CSV_COLUMNS: Dict[int, Any] = {
+    len(SASTFlag._fields): SASTFlag,
+    len(GroupedSASTFlag._fields): GroupedSASTFlag,
+    len(GroupedSASTFlag_with_funcname._fields): GroupedSASTFlag_with_funcname,
+}
+
+
+def _parse_row(row: List[str]) -> SASTFlagType:
+    """
+    Convert a CSV row into a SAST flag; the flag type is determined by the number of columns.
+
+    :param row:
+    :return:
+    """
+    if len(row) == 4:
+        return SASTFlag(row[0], row[1], int(row[2]), row[3])
+
+    return CSV_COLUMNS[len(row)](
+        row[0], row[1], int(row[2]), row[3], int(row[4]), int(row[5]), int(row[6]), int(row[7]), float(row[8]), *row[9:]
+    )
+
+
+def _read_rows(file: Path) -> Generator[List[str], None, None]:
+    """
+    Read the CSV rows of a SAST flag file, skipping empty and malformed rows.
+
+    :param file:
+    :return:
+    """
+    n_skipped = 0
+
+    with file.open("r", newline="") as csv_file:
+        for row in csv.reader(csv_file):
+            if len(row) in CSV_COLUMNS:
+                yield row
+            elif len(row) > 0:
+                n_skipped += 1
+
+    if n_skipped > 0:
+        logging.warning(f"Skipped {n_skipped} malformed row(s) in {file}")
+
+
+def read_csv(file: Path) -> Generator[SASTFlagType, None, None]:
+    """
+    Stream the SAST flags of a CSV file.
+
+    :param file:
+    :return:
+    """
+    for row in _read_rows(file):
+        yield _parse_row(row)
+
+
+def write_csv(file: Path, flags: Iterable[Sequence[Any]]) -> None:
+    """
+    Stream SAST flags into a CSV file. Fields containing separators or quotes are quoted.
+
+    :param file:
+    :param flags:
+    :return:
+    """
+    with file.open("w", newline="") as csv_file:
+        csv.writer(csv_file, delimiter=CSV_SEP, lineterminator=os.linesep).writerows(flags)
@@ -0,0 +1,147 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import logging
+import os
+import time
+from itertools import chain
+from pathlib import Path
+from typing import Any, Optional
+
+from sfa import CacheConfig
+from sfa.analysis import SASTFlags
+
+# File extension of the cache entries
+CACHE_ENTRY_EXT: str = ".csv"
+
+# Sub-directory holding the incremental analysis states
+STATE_DIR_NAME: str = "incremental"
+
+# File extension of the incremental analysis states
+STATE_FILE_EXT: str = ".json"
+
+# Seconds per day
+SECONDS_PER_DAY: int = 24 * 60 * 60
+
+# Bytes per megabyte
+BYTES_PER_MB: int = 1024 * 1024
+
+
+def cache_key(*parts: Any) -> str:
+    """
+    Create a content-addressed cache key from a sequence of key parts.
+
+    :param parts:
+    :return: Hex digest
+    """
+    digest = hashlib.sha256()
+
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\0")
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent cache of (formatted) SAST tool results and incremental analysis states. Both are evicted once they
+    exceed the max. age or the cache exceeds its max. size (least recently used entries first).
+    """
+
+    def __init__(self, config: CacheConfig) -> None:
+        self._cache_dir = Path(config.path)
+        self._max_age = config.max_age * SECONDS_PER_DAY
+        self._max_size = config.max_size * BYTES_PER_MB
+
+    def _entry(self, key: str) -> Path:
+        return self._cache_dir / f"{key}{CACHE_ENTRY_EXT}"
+
+    def state_file(self, key: str) -> Path:
+        """
+        Get the file holding the incremental analysis state stored under a key.
+
+        :param key:
+        :return:
+        """
+        return self._cache_dir / STATE_DIR_NAME / f"{key}{STATE_FILE_EXT}"
+
+    def get(self, key: str) -> Optional[SASTFlags]:
+        """
+        Look up the SAST flags stored under a key.
+
+        :param key:
+        :return: SAST flags or None on a cache miss
+        """
+        entry = self._entry(key)
+
+        if not entry.exists() or (time.time() - entry.stat().st_mtime) > self._max_age:
+            return None
+
+        # Refresh the entry's timestamp for the LRU eviction
+        os.utime(entry)
+
+        return SASTFlags.from_csv(entry)
+
+    def put(self, key: str, flags: SASTFlags) -> None:
+        """
+        Store SAST flags under a key and evict outdated entries.
+
+        :param key:
+        :param flags:
+        :return:
+        """
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first, so that parallel runners never see partially written entries
+        temp_file = self._cache_dir / f".{key}.{os.getpid()}.tmp"
+        flags.to_csv(temp_file)
+        os.replace(temp_file, self._entry(key))
+
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove entries and incremental analysis states exceeding the max. age, then the least recently used ones until
+        the max. size is met.
+
+        :return:
+        """
+        now = time.time()
+
+        entries = []
+        for entry in chain(
+            self._cache_dir.glob(f"*{CACHE_ENTRY_EXT}"), (self._cache_dir / STATE_DIR_NAME).glob(f"*{STATE_FILE_EXT}")
+        ):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            if (now - stat.st_mtime) > self._max_age:
+                entry.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total_size = sum(size for _, size, _ in entries)
+
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total_size <= self._max_size:
+                break
+
+            logging.debug(f"Evict cache entry: {entry.name}")
+
+            entry.unlink(missing_ok=True)
+            total_size -= size
@@ -14,10 +14,11 @@
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, Iterable
+from functools import partial
+from typing import Any, Callable, Dict, Iterable
 
 from sfa import SASTToolConfig
-from sfa.analysis.filter import ReachabilityFilter
+from sfa.analysis.filter import PathFilter, ReachabilityFilter, ScoreFilter, VulnFilter
 from sfa.analysis.grouping import BasicBlockGrouping, BasicBlockV2Grouping, FunctionGrouping
 from sfa.analysis.tool_runner import (
     AddressSanitizerRunner,
@@ -42,6 +43,9 @@ class SASTTool(Enum):
 
 class SASTFlagFilterMode(Enum):
     REH = "reachability"
+    PTH = "path"
+    VLN = "vuln"
+    SCR = "score"
 
 
 class SASTFlagGroupingMode(Enum):
@@ -52,20 +56,27 @@ class SASTFlagGroupingMode(Enum):
 
 class Factory(ABC):
     """
-    Abstract factory.
+    Abstract factory. Instances are created on first request, so only the requested components pay their setup cost.
     """
 
     @abstractmethod
-    def _create_instances(self, param: Any) -> Dict:
+    def _create_registry(self, param: Any) -> Dict[Any, Callable[[], Any]]:
+        """
+        Create the mapping between keys and instance constructors.
+
+        :param param:
+        :return:
+        """
         pass
 
     def __init__(self, param: Any) -> None:
-        if param is None:
-            self._instances = {}
-        else:
-            self._instances = self._create_instances(param)
+        self._registry = {} if param is None else self._create_registry(param)
+        self._instances: Dict = {}
 
     def get_instance(self, key: Any) -> Any:
+        if key not in self._instances:
+            self._instances[key] = self._registry[key]()
+
         return self._instances[key]
 
     def get_instances(self, keys: Iterable) -> Iterable:
@@ -77,16 +88,16 @@ class SASTToolRunnerFactory(Factory):
     SAST tool runner factory.
     """
 
-    def _create_instances(self, param: Any) -> Dict:
-        subject_dir, app_config = param
+    def _create_registry(self, param: Any) -> Dict[Any, Callable[[], Any]]:
+        subject_dir, app_config, cache, incremental, workspace = param
         return {
-            SASTTool.FLF: FlawfinderRunner(subject_dir, app_config.flawfinder),
-            SASTTool.SGR: SemgrepRunner(subject_dir, app_config.semgrep),
-            SASTTool.IFR: InferRunner(subject_dir, app_config.infer),
-            SASTTool.CQL: CodeQLRunner(subject_dir, app_config.codeql),
-            SASTTool.CLS: ClangScanRunner(subject_dir, app_config.clang_scan),
-            SASTTool.ASN: AddressSanitizerRunner(subject_dir, SASTToolConfig()),
-            SASTTool.MSN: MemorySanitizerRunner(subject_dir, SASTToolConfig()),
+            SASTTool.FLF: partial(FlawfinderRunner, subject_dir, app_config.flawfinder, cache, incremental),
+            SASTTool.SGR: partial(SemgrepRunner, subject_dir, app_config.semgrep, cache, incremental),
+            SASTTool.IFR: partial(InferRunner, subject_dir, app_config.infer, cache, workspace),
+            SASTTool.CQL: partial(CodeQLRunner, subject_dir, app_config.codeql, cache, workspace),
+            SASTTool.CLS: partial(ClangScanRunner, subject_dir, app_config.clang_scan, cache, workspace),
+            SASTTool.ASN: partial(AddressSanitizerRunner, subject_dir, SASTToolConfig(), cache, workspace),
+            SASTTool.MSN: partial(MemorySanitizerRunner, subject_dir, SASTToolConfig(), cache, workspace),
         }
 
 
@@ -95,8 +106,14 @@ class SASTFlagFilterFactory(Factory):
     SAST flag filter factory.
     """
 
-    def _create_instances(self, param: Any) -> Dict:
-        return {SASTFlagFilterMode.REH: ReachabilityFilter(param)}
+    def _create_registry(self, param: Any) -> Dict[Any, Callable[[], Any]]:
+        sfi, app_config = param
+        return {
+            SASTFlagFilterMode.REH: partial(ReachabilityFilter, sfi),
+            SASTFlagFilterMode.PTH: partial(PathFilter, app_config.filters.exclude_paths),
+            SASTFlagFilterMode.VLN: partial(VulnFilter, app_config.filters.allow_vulns, app_config.filters.deny_vulns),
+            SASTFlagFilterMode.SCR: partial(ScoreFilter, app_config.filters.min_score),
+        }
 
 
 class SASTFlagGroupingFactory(Factory):
@@ -104,10 +121,10 @@ class SASTFlagGroupingFactory(Factory):
     SAST flag grouping factory.
     """
 
-    def _create_instances(self, param: Any) -> Dict:
-        inspec_file, app_config = param
+    def _create_registry(self, param: Any) -> Dict[Any, Callable[[], Any]]:
+        sfi, app_config = param
         return {
-            SASTFlagGroupingMode.BASIC_BLOCK: BasicBlockGrouping(inspec_file, app_config.score_weights),
-            SASTFlagGroupingMode.BASIC_BLOCK_V2: BasicBlockV2Grouping(inspec_file, app_config.score_weights),
-            SASTFlagGroupingMode.FUNCTION: FunctionGrouping(inspec_file, app_config.score_weights),
+            SASTFlagGroupingMode.BASIC_BLOCK: partial(BasicBlockGrouping, sfi, app_config.score_weights),
+            SASTFlagGroupingMode.BASIC_BLOCK_V2: partial(BasicBlockV2Grouping, sfi, app_config.score_weights),
+            SASTFlagGroupingMode.FUNCTION: partial(FunctionGrouping, sfi, app_config.score_weights),
         }
@@ -12,14 +12,39 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
+import logging
+import os
+import re
+import time
 from abc import ABC, abstractmethod
-from collections import defaultdict
-from functools import lru_cache
-from pathlib import Path
-from typing import Dict, List
+from collections import defaultdict, namedtuple
+from fnmatch import translate
+from typing import ClassVar, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from sfa.analysis import SASTFlags
+from sfa.analysis import SASTFlags, SASTFlagType
+from sfa.analysis.sfi import SFIData
+from sfa.utils.interval import IntervalSet
+
+# Number of flags the filter engine processes at once; the filters are re-ordered after each chunk
+ENGINE_CHUNK_SIZE: int = 4096
+
+# Lower bound of the removal rate when ranking filters (avoids a division by zero for filters removing nothing)
+MIN_REMOVAL_RATE: float = 1e-3
+
+# Statistics of a filter: no. of flags checked, no. of flags removed, and time spent (in seconds)
+FilterStats = namedtuple("FilterStats", ["name", "n_in", "n_removed", "secs"], defaults=[0, 0, 0.0])
+
+
+def compile_globs(patterns: Iterable[str]) -> Optional["re.Pattern[str]"]:
+    """
+    Compile glob patterns into a single regex.
+
+    :param patterns:
+    :return: Regex matching any of the patterns or None if there are no patterns
+    """
+    patterns = list(patterns)
+
+    return re.compile("|".join(map(translate, patterns))) if len(patterns) > 0 else None
 
 
 class SASTFlagFilter(ABC):
@@ -27,10 +52,34 @@ class SASTFlagFilter(ABC):
     Abstract SAST flag filter.
     """
 
-    def __init__(self, inspec_file: Path) -> None:
-        self._inspec_file = inspec_file
+    # Name of the filter (used in the statistics)
+    name: ClassVar[str] = ""
+
+    # Estimated relative cost per flag, used to order the filters until their cost is measured
+    cost: ClassVar[float] = 1.0
+
+    # Whether the filter applies to grouped flags, i.e., runs after the grouping
+    after_grouping: ClassVar[bool] = False
 
     @abstractmethod
+    def keep(self, flag: SASTFlagType) -> bool:
+        """
+        Check if a SAST flag passes the filter.
+
+        :param flag:
+        :return:
+        """
+        pass
+
+    def filter_iter(self, flags: Iterable[SASTFlagType]) -> Iterator[SASTFlagType]:
+        """
+        Filter out certain SAST flags of a stream (lazily).
+
+        :param flags:
+        :return:
+        """
+        return filter(self.keep, flags)
+
     def filter(self, flags: SASTFlags) -> SASTFlags:
         """
         Filter out certain SAST flags.
@@ -38,7 +87,7 @@ class SASTFlagFilter(ABC):
         :param flags:
         :return:
         """
-        pass
+        return SASTFlags(self.filter_iter(flags))
 
 
 class ReachabilityFilter(SASTFlagFilter):
@@ -46,37 +95,216 @@ class ReachabilityFilter(SASTFlagFilter):
     SAST flag reachability filter.
     """
 
-    def __init__(self, inspec_file: Path) -> None:
-        super().__init__(inspec_file)
-        self._reachable_code: Dict[str, List[Dict]] = defaultdict(list)
+    name = "reachability"
+    cost = 2.0
+
+    def __init__(self, sfi: SFIData) -> None:
+        self._sfi = sfi
 
-        data = json.loads(inspec_file.read_text())
+        ranges: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for func_info in sfi.reachable_funcs.values():
+            ranges[func_info.file].append((func_info.line_start, func_info.line_end))
 
-        for func in data["functions"]:
-            if func["location"]["reachable_from_main"]:
-                self._reachable_code[func["location"]["filename"]].append(func["location"]["line"])
+        # Merged line ranges of the reachable functions (per file)
+        self._reachable_code: Dict[str, IntervalSet] = {
+            file: IntervalSet(file_ranges) for file, file_ranges in ranges.items()
+        }
 
-    @lru_cache(maxsize=None)
     def _is_reachable(self, file: str, line: int) -> bool:
         """
         Check if a code location is reachable from the main function.
 
-        :param file:
+        :param file: File path (SFI data identifies files by name)
         :param line:
         :return:
         """
-        if file in self._reachable_code.keys():
-            for line_range in self._reachable_code[file]:
-                if line_range["start"] <= line <= line_range["end"]:
-                    return True
+        reachable_code = self._reachable_code.get(os.path.basename(file))
+
+        return reachable_code is not None and line in reachable_code
+
+    def keep(self, flag: SASTFlagType) -> bool:
+        """
+        Check if a SAST flag is reachable from the main function.
+
+        :param flag:
+        :return:
+        """
+        return self._is_reachable(flag.file, flag.line)
+
+
+class PathFilter(SASTFlagFilter):
+    """
+    SAST flag path filter, e.g. to exclude third-party code. The patterns are matched against the flags' file paths
+    relative to the subject, both as they are and rooted at '/' (e.g. '/third_party/lib.c'), so that '*/third_party/*'
+    covers top-level directories as well.
+    """
+
+    name = "path"
+    cost = 0.5
+
+    def __init__(self, exclude_paths: Iterable[str]) -> None:
+        self._regex = compile_globs(exclude_paths)
+
+        # Decisions per file (the no. of distinct files is small compared to the no. of flags)
+        self._decisions: Dict[str, bool] = {}
+
+    def _keep_path(self, path: str) -> bool:
+        if self._regex is None:
+            return True
+
+        return self._regex.match(path) is None and self._regex.match(f"/{path}") is None
+
+    def keep(self, flag: SASTFlagType) -> bool:
+        """
+        Check if a SAST flag is in a file not matching any of the excluded path patterns.
+
+        :param flag:
+        :return:
+        """
+        decision = self._decisions.get(flag.file)
+
+        if decision is None:
+            decision = self._decisions[flag.file] = self._keep_path(flag.file)
+
+        return decision
+
+
+class VulnFilter(SASTFlagFilter):
+    """
+    SAST flag vuln. type filter based on per-tool allow and deny lists.
+    """
+
+    name = "vuln"
+    cost = 0.5
+
+    def __init__(self, allow_vulns: Dict[str, List[str]], deny_vulns: Dict[str, List[str]]) -> None:
+        self._allow = {tool: compile_globs(patterns) for tool, patterns in allow_vulns.items()}
+        self._deny = {tool: compile_globs(patterns) for tool, patterns in deny_vulns.items()}
+
+        # Decisions per (tool, vuln.) pair
+        self._decisions: Dict[Tuple[str, str], bool] = {}
+
+    def _decide(self, tool: str, vuln: str) -> bool:
+        allow = self._allow.get(tool)
+        deny = self._deny.get(tool)
+
+        if tool in self._allow and (allow is None or allow.match(vuln) is None):
+            return False
+
+        return deny is None or deny.match(vuln) is None
+
+    def keep(self, flag: SASTFlagType) -> bool:
+        """
+        Check if the vuln. type of a SAST flag is allowed (if the tool has an allow list) and not denied.
+
+        :param flag:
+        :return:
+        """
+        key = (flag.tool, flag.vuln)
+        decision = self._decisions.get(key)
+
+        if decision is None:
+            decision = self._decisions[key] = self._decide(*key)
+
+        return decision
+
+
+class ScoreFilter(SASTFlagFilter):
+    """
+    SAST flag vuln. score filter; applies to grouped flags only.
+    """
+
+    name = "score"
+    cost = 0.2
+    after_grouping = True
+
+    def __init__(self, min_score: float) -> None:
+        self._min_score = min_score
+
+    def keep(self, flag: SASTFlagType) -> bool:
+        """
+        Check if a grouped SAST flag has at least the min. vuln. score (other flags pass).
+
+        :param flag:
+        :return:
+        """
+        return len(flag) < 9 or flag[8] >= self._min_score  # type: ignore
+
+
+class SASTFlagFilterEngine:
+    """
+    Multi-stage SAST flag filter. The flags are processed in chunks; after each chunk, the filters are re-ordered by
+    their measured time per flag divided by their removal rate, so cheap and highly selective filters run first.
+    """
+
+    def __init__(self, filters: Iterable[SASTFlagFilter]) -> None:
+        # Until they are measured, the filters are ordered by their estimated cost
+        self._filters = sorted(filters, key=lambda flag_filter: flag_filter.cost)
+        self._stats = {id(flag_filter): FilterStats(flag_filter.name) for flag_filter in self._filters}
+
+    @property
+    def stats(self) -> List[FilterStats]:
+        """
+        Get the statistics of the filters (in their current order).
+
+        :return:
+        """
+        return [self._stats[id(flag_filter)] for flag_filter in self._filters]
+
+    def _rank(self, flag_filter: SASTFlagFilter) -> Tuple[bool, float]:
+        stats = self._stats[id(flag_filter)]
+
+        if stats.n_in == 0:
+            return True, flag_filter.cost
+
+        return False, (stats.secs / stats.n_in) / max(stats.n_removed / stats.n_in, MIN_REMOVAL_RATE)
+
+    def _filter_chunk(self, chunk: List[SASTFlagType]) -> List[SASTFlagType]:
+        for flag_filter in self._filters:
+            if len(chunk) == 0:
+                break
+
+            start = time.perf_counter()
+            kept = list(filter(flag_filter.keep, chunk))
+            secs = time.perf_counter() - start
+
+            stats = self._stats[id(flag_filter)]
+            self._stats[id(flag_filter)] = stats._replace(
+                n_in=stats.n_in + len(chunk), n_removed=stats.n_removed + len(chunk) - len(kept), secs=stats.secs + secs
+            )
+
+            chunk = kept
+
+        self._filters.sort(key=self._rank)
+
+        return chunk
+
+    def filter_iter(self, flags: Iterable[SASTFlagType]) -> Iterator[SASTFlagType]:
+        """
+        Filter a stream of SAST flags (lazily, chunk by chunk); the statistics are logged once the stream is consumed.
+
+        :param flags:
+        :return:
+        """
+        chunk: List[SASTFlagType] = []
+
+        for flag in flags:
+            chunk.append(flag)
+
+            if len(chunk) == ENGINE_CHUNK_SIZE:
+                yield from self._filter_chunk(chunk)
+                chunk = []
+
+        yield from self._filter_chunk(chunk)
 
-        return False
+        for stats in self.stats:
+            logging.info(f"Filter {stats.name}: {stats.n_removed} of {stats.n_in} flag(s) removed in {stats.secs:.3f}s")
 
     def filter(self, flags: SASTFlags) -> SASTFlags:
         """
-        Filter out SAST flags unreachable from the main function.
+        Filter SAST flags.
 
         :param flags:
         :return:
         """
-        return SASTFlags(set(filter(lambda flag: self._is_reachable(flag.file, flag.line), flags)))
+        return SASTFlags(self.filter_iter(flags))
@@ -12,14 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
 from abc import ABC, abstractmethod
-from collections import defaultdict, namedtuple
-from pathlib import Path
-from typing import Dict, List, Tuple
+from array import array
+from itertools import islice
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from sfa import ScoreWeights
-from sfa.analysis import GroupedSASTFlag, SASTFlags, div, GroupedSASTFlag_with_funcname
+from sfa.analysis import (
+    FlagColumns,
+    GroupedSASTFlag,
+    GroupedSASTFlag_with_funcname,
+    SASTFlags,
+    SASTFlagType,
+    StringTable,
+)
+from sfa.analysis.sfi import SFIData
+from sfa.utils.interval import IntervalIndex
 
 # Decimal precision of the vulnerability scores
 SCORE_PRECISION = 3
@@ -27,189 +37,315 @@ SCORE_PRECISION = 3
 # Character to concatenate values
 CONCAT_CHAR = "-"
 
-# Container for code block information
-CodeBlockInfo = namedtuple("CodeBlockInfo", ["file", "line_start", "line_end", "n_lines"])
+# Block number of flags outside of all code blocks
+NO_BLOCK: int = -1
 
+# Number of flags assigned to code blocks at once when grouping a stream of flags
+CHUNK_SIZE: int = 65536
 
-class SASTFlagGrouping(ABC):
+
+def unique_rows(*cols: np.ndarray) -> Tuple[np.ndarray, ...]:
     """
-    Abstract SAST flag grouping.
+    Get the distinct rows of a table given by its columns, sorted lexicographically (first column first).
+
+    :param cols:
+    :return: Columns of the distinct rows
     """
+    order = np.lexsort(cols[::-1])
+    sorted_cols = [col[order] for col in cols]
 
-    def __init__(self, inspec_file: Path, weights: ScoreWeights) -> None:
-        self._inspec_file = inspec_file
-        self._weights = weights
+    # A row is a duplicate if it equals its predecessor in all columns
+    is_dup = np.zeros(len(order), dtype=bool)
+    is_dup[1:] = True
 
-    @abstractmethod
-    def group(self, flags: SASTFlags) -> SASTFlags:
+    for col in sorted_cols:
+        is_dup[1:] &= col[1:] == col[:-1]
+
+    return tuple(col[~is_dup] for col in sorted_cols)
+
+
+class BlockStats:
+    """
+    Statistics of SAST flags grouped per code block. All statistics except the scores are independent of the score
+    weights, so the same statistics can be scored with different weights.
+    """
+
+    def __init__(
+        self,
+        tool_strs: List[str],
+        vuln_strs: List[str],
+        n_all_tools: int,
+        rows: Tuple[np.ndarray, ...],
+        blocks: Sequence[Hashable],
+        n_lines: np.ndarray,
+    ) -> None:
         """
-        Group SAST flags based on a certain code granularity.
+        :param tool_strs: Tools by tool code
+        :param vuln_strs: Vuln. types by vuln. code
+        :param n_all_tools: Number of tools with at least one flag (including flags outside of all blocks)
+        :param rows: Block numbers, tool codes, lines, and vuln. codes of the flags inside the blocks
+        :param blocks: Block keys by block number
+        :param n_lines: Number of lines by block number
+        """
+        self.tool_strs = tool_strs
+        self.vuln_strs = vuln_strs
+        self.n_all_tools = n_all_tools
+
+        block_nums, tool_codes, lines, vuln_codes = rows
+
+        # Flagged blocks, and the flags' index into them
+        block_ids, flag_idx = np.unique(block_nums, return_inverse=True)
+
+        self.blocks = [blocks[i] for i in block_ids]
+        self.n_all_lines = n_lines[block_ids]
+
+        # Flag fields sorted by flagged block
+        order = np.argsort(flag_idx, kind="stable")
+        self.flag_idx = flag_idx[order]
+        self.tool_codes = tool_codes[order]
+        self.lines = lines[order]
+        self.vuln_codes = vuln_codes[order]
+
+        n_blocks = len(block_ids)
+        block_lines, _ = unique_rows(self.flag_idx, self.lines)
+        block_tools, tools = unique_rows(self.flag_idx, self.tool_codes)
+        block_vulns, vulns, vuln_lines = unique_rows(self.flag_idx, self.vuln_codes, self.lines)
+
+        self.n_flg_lines = np.bincount(block_lines, minlength=n_blocks)
+        self.n_run_tools = np.bincount(block_tools, minlength=n_blocks)
+
+        tool_bounds = np.searchsorted(block_tools, np.arange(n_blocks + 1))
+        vuln_bounds = np.searchsorted(block_vulns, np.arange(n_blocks + 1))
+
+        self.tools = [
+            CONCAT_CHAR.join(self.tool_strs[t] for t in tools[slice(*tool_bounds[i : i + 2])]) for i in range(n_blocks)
+        ]
+        self.vulns = [
+            CONCAT_CHAR.join(
+                f"{self.vuln_strs[v]}:{line}"
+                for v, line in zip(vulns[slice(*vuln_bounds[i : i + 2])], vuln_lines[slice(*vuln_bounds[i : i + 2])])
+            )
+            for i in range(n_blocks)
+        ]
 
-        :param flags:
+        # Bounds of each flagged block's flags
+        self.flag_bounds = np.searchsorted(self.flag_idx, np.arange(n_blocks + 1))
+
+    def scores(self, weights: ScoreWeights) -> List[float]:
+        """
+        Calculate the vulnerability scores of the flagged blocks.
+
+        :param weights:
         :return:
         """
-        pass
+        r_flg_lines = np.divide(
+            self.n_flg_lines, self.n_all_lines, out=np.zeros(len(self.blocks)), where=self.n_all_lines != 0
+        )
+        r_run_tools = self.n_run_tools / self.n_all_tools if self.n_all_tools != 0 else np.zeros(len(self.blocks))
 
+        scores = (weights.flags * r_flg_lines) + (weights.tools * r_run_tools)
 
-class BasicBlockGrouping(SASTFlagGrouping):
+        return [round(float(score), SCORE_PRECISION) for score in scores]
+
+
+class SASTFlagGrouping(ABC):
     """
-    SAST flag basic block grouping.
+    Abstract SAST flag grouping. Flags are assigned to code blocks with a vectorized lookup (per file) in the sorted
+    block segments of the SFI line index; the per-block statistics are computed with array operations.
     """
 
-    def __init__(self, inspec_file: Path, weights: ScoreWeights) -> None:
-        super().__init__(inspec_file, weights)
-        self._bb_infos: Dict[int, CodeBlockInfo] = {}
+    def __init__(self, sfi: SFIData, weights: ScoreWeights) -> None:
+        self._sfi = sfi
+        self._weights = weights
 
-        data = json.loads(inspec_file.read_text())
+        # Block keys by block number, mapping between block keys and block numbers, and number of lines by block number
+        self._blocks: List[Hashable] = []
+        self._block_nums: Dict[Any, int] = {}
+        self._n_lines = np.zeros(0, dtype=np.int64)
 
-        for func in data["functions"]:
-            for bb in func["basic_blocks"]:
-                self._bb_infos[bb["id"]] = CodeBlockInfo(
-                    func["location"]["filename"],
-                    bb["location"]["line"]["start"],
-                    bb["location"]["line"]["end"],
-                    bb["LoC"],
-                )
+        # NumPy views of the SFI line index segments (per file)
+        self._segments: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
 
-    def group(self, flags: SASTFlags) -> SASTFlags:
+    def _segment_arrays(self, index: IntervalIndex, block_nums: Dict[Any, int]) -> Tuple[np.ndarray, ...]:
         """
-        Group SAST flags based on basic block granularity.
+        Get the segments of a line index as arrays of start points, end points, and block numbers.
 
-        :param flags:
+        :param index:
+        :param block_nums:
         :return:
         """
-        flags_per_bb: Dict = defaultdict(set)
+        if id(index) not in self._segments:
+            starts, ends, values = index.segments()
 
-        for flag in flags:
-            for bb_id, bb_info in self._bb_infos.items():
-                if flag.file == bb_info.file:
-                    if bb_info.line_start <= flag.line <= bb_info.line_end:
-                        flags_per_bb[bb_id].add(flag)
-                        break
+            self._segments[id(index)] = (
+                np.asarray(starts, dtype=np.int64),
+                np.asarray(ends, dtype=np.int64),
+                np.asarray([block_nums[value] for value in values], dtype=np.int64),
+            )
 
-        n_tools = len({flag.tool for flag in flags})
-        grouped_flags = SASTFlags()
+        return self._segments[id(index)]
+
+    def _assign_blocks(
+        self, cols: FlagColumns, index_of: Callable[[str], Optional[IntervalIndex]], block_nums: Dict[Any, int]
+    ) -> np.ndarray:
+        """
+        Assign the flags to code blocks.
 
-        for bb_id, bb_flags in flags_per_bb.items():
-            bb_tools = {flag.tool for flag in bb_flags}
-            bb_vulns = {f"{flag.vuln}:{flag.line}" for flag in bb_flags}
+        :param cols: Flag columns
+        :param index_of: Function returning the line index of a file
+        :param block_nums: Mapping between block keys and block numbers
+        :return: Block number per flag (NO_BLOCK if the flag is outside of all blocks)
+        """
+        file_codes = np.frombuffer(cols.file_codes, dtype=np.int64)
+        lines = np.frombuffer(cols.lines, dtype=np.int64)
 
-            n_flg_lines = len({flag.line for flag in bb_flags})
-            n_all_lines = self._bb_infos[bb_id].n_lines
-            n_run_tools = len(bb_tools)
-            n_all_tools = n_tools
+        result = np.full(len(lines), NO_BLOCK, dtype=np.int64)
 
-            r_flg_lines = div(n_flg_lines, n_all_lines)
-            r_run_tools = div(n_run_tools, n_all_tools)
+        order = np.argsort(file_codes, kind="stable")
+        files, bounds = np.unique(file_codes[order], return_index=True)
+        bounds = np.append(bounds, len(order))
 
-            # Calculate the vulnerability score
-            score = round((self._weights.flags * r_flg_lines) + (self._weights.tools * r_run_tools), SCORE_PRECISION)
+        for i, file_code in enumerate(files):
+            index = index_of(cols.files[file_code])
 
-            grouped_flags.add(
-                GroupedSASTFlag(
-                    CONCAT_CHAR.join(bb_tools),
-                    self._bb_infos[bb_id].file,
-                    self._bb_infos[bb_id].line_start,
-                    CONCAT_CHAR.join(bb_vulns),
-                    n_flg_lines,
-                    n_all_lines,
-                    n_run_tools,
-                    n_all_tools,
-                    score,
-                    bb_id,
-                )
-            )
+            if index is None:
+                continue
 
-        return grouped_flags
+            starts, ends, nums = self._segment_arrays(index, block_nums)
 
+            flag_idx = order[bounds[i] : bounds[i + 1]]
+            flag_lines = lines[flag_idx]
 
-class BasicBlockV2Grouping(SASTFlagGrouping):
-    """
-    SAST flag basic block grouping with function-level vuln. score.
-    """
+            pos = np.searchsorted(starts, flag_lines, side="right") - 1
+            found = pos >= 0
+            found[found] = flag_lines[found] <= ends[pos[found]]
+
+            result[flag_idx[found]] = nums[pos[found]]
+
+        return result
+
+    @abstractmethod
+    def _line_index(self, file: str) -> Optional[IntervalIndex]:
+        """
+        Get the line index of the code blocks of a file.
+
+        :param file:
+        :return: Line index or None if the file has no code blocks
+        """
+        pass
 
-    def __init__(self, inspec_file: Path, weights: ScoreWeights) -> None:
-        super().__init__(inspec_file, weights)
-        self._func_infos: Dict[str, Tuple[CodeBlockInfo, List[CodeBlockInfo]]] = {}
+    def _block_rows(self, cols: FlagColumns) -> Tuple[np.ndarray, ...]:
+        """
+        Get the distinct (block number, tool code, line, vuln. code) rows of the flags inside the code blocks.
 
-        data = json.loads(inspec_file.read_text())
+        :param cols:
+        :return:
+        """
+        block_nums = self._assign_blocks(cols, self._line_index, self._block_nums)
+        mask = block_nums != NO_BLOCK
 
-        for func in data["functions"]:
-            func_file = func["location"]["filename"]
-            func_name = f"{func['location']['filename']}:{func['name']}"
+        return unique_rows(
+            block_nums[mask],
+            *(np.frombuffer(col, dtype=np.int64)[mask] for col in (cols.tool_codes, cols.lines, cols.vuln_codes)),
+        )
 
-            func_info = CodeBlockInfo(
-                func_file, func["location"]["line"]["start"], func["location"]["line"]["end"], func["LoC"]
+    def block_stats(self, flags: Iterable[SASTFlagType]) -> BlockStats:
+        """
+        Compute the (weight-independent) statistics of the SAST flags per code block. Besides containers, the flags
+        can be given as a stream; the stream is consumed in chunks, keeping only the flags inside code blocks.
+
+        :param flags:
+        :return:
+        """
+        if isinstance(flags, SASTFlags):
+            cols = flags.columns()
+            n_all_tools = len(np.unique(np.frombuffer(cols.tool_codes, dtype=np.int64)))
+
+            return BlockStats(cols.tools, cols.vulns, n_all_tools, self._block_rows(cols), self._blocks, self._n_lines)
+
+        tools, files, vulns = StringTable(), StringTable(), StringTable()
+        chunks = []
+
+        flag_iter = iter(flags)
+        chunk = list(islice(flag_iter, CHUNK_SIZE))
+
+        while len(chunk) > 0:
+            cols = FlagColumns(
+                tools.strings,
+                files.strings,
+                vulns.strings,
+                array("q", [tools.encode(flag.tool) for flag in chunk]),
+                array("q", [files.encode(flag.file) for flag in chunk]),
+                array("q", [int(flag.line) for flag in chunk]),
+                array("q", [vulns.encode(flag.vuln) for flag in chunk]),
             )
+            chunks.append(self._block_rows(cols))
 
-            blk_infos = []
-            for bb in func["basic_blocks"]:
-                blk_infos.append(
-                    CodeBlockInfo(
-                        func["location"]["filename"],
-                        bb["location"]["line"]["start"],
-                        bb["location"]["line"]["end"],
-                        bb["LoC"],
-                    )
-                )
+            chunk = list(islice(flag_iter, CHUNK_SIZE))
+
+        if len(chunks) > 0:
+            rows = unique_rows(*map(np.concatenate, zip(*chunks)))
+        else:
+            rows = tuple(np.zeros(0, dtype=np.int64) for _ in range(4))
 
-            self._func_infos[func_name] = (func_info, blk_infos)
+        # The tool table only holds the tools of the streamed flags
+        return BlockStats(tools.strings, vulns.strings, len(tools), rows, self._blocks, self._n_lines)
 
-    def group(self, flags: SASTFlags) -> SASTFlags:
-        flags_per_func: Dict = defaultdict(set)
-        flagged_blocks: Dict = defaultdict(set)
+    @abstractmethod
+    def emit(self, stats: BlockStats, weights: ScoreWeights) -> SASTFlags:
+        """
+        Create the grouped SAST flags from the block statistics.
 
-        for flag in flags:
-            for func_name, (func_info, blk_infos) in self._func_infos.items():
-                if flag.file == func_info.file:
-                    if func_info.line_start <= flag.line <= func_info.line_end:
-                        flags_per_func[func_name].add(flag)
+        :param stats:
+        :param weights:
+        :return:
+        """
+        pass
 
-                        for bb_info in blk_infos:
-                            if bb_info.line_start <= flag.line <= bb_info.line_end:
-                                flagged_blocks[func_name].add(bb_info)
+    def group(self, flags: Iterable[SASTFlagType]) -> SASTFlags:
+        """
+        Group SAST flags (container or stream) based on a certain code granularity.
 
-                        break
+        :param flags:
+        :return:
+        """
+        return self.emit(self.block_stats(flags), self._weights)
 
-        n_tools = len({flag.tool for flag in flags})
-        grouped_flags = SASTFlags()
 
-        for func_name, func_flags in flags_per_func.items():
-            func_tools = {flag.tool for flag in func_flags}
-            func_vulns = {f"{flag.vuln}:{flag.line}" for flag in func_flags}
+class BasicBlockGrouping(SASTFlagGrouping):
+    """
+    SAST flag basic block grouping.
+    """
 
-            n_flg_lines = len({flag.line for flag in func_flags})
-            n_all_lines = self._func_infos[func_name][0].n_lines
-            n_run_tools = len(func_tools)
-            n_all_tools = n_tools
+    def __init__(self, sfi: SFIData, weights: ScoreWeights) -> None:
+        super().__init__(sfi, weights)
 
-            r_flg_lines = div(n_flg_lines, n_all_lines)
-            r_run_tools = div(n_run_tools, n_all_tools)
+        self._blocks = list(sfi.bbs)
+        self._block_nums = {bb_id: i for i, bb_id in enumerate(self._blocks)}
+        self._n_lines = np.asarray([bb.n_lines for bb in sfi.bbs.values()], dtype=np.int64)
 
-            # Calculate the vulnerability score
-            score = round((self._weights.flags * r_flg_lines) + (self._weights.tools * r_run_tools), SCORE_PRECISION)
+    def _line_index(self, file: str) -> Optional[IntervalIndex]:
+        return self._sfi.bb_index(file)
 
-            for bb_info in flagged_blocks[func_name]:
-                bb_flags = [flag for flag in func_flags if bb_info.line_start <= flag.line <= bb_info.line_end]
+    def emit(self, stats: BlockStats, weights: ScoreWeights) -> SASTFlags:
+        grouped_flags = SASTFlags()
 
-                bb_tools = {flag.tool for flag in bb_flags}
-                bb_vulns = {f"{flag.vuln}:{flag.line}" for flag in bb_flags}
+        for i, (bb_id, score) in enumerate(zip(stats.blocks, stats.scores(weights))):
+            bb_info = self._sfi.bbs[bb_id]
 
-                grouped_flags.add(
-                    GroupedSASTFlag_with_funcname(
-                        CONCAT_CHAR.join(bb_tools),
-                        bb_info.file,
-                        bb_info.line_start,
-                        CONCAT_CHAR.join(bb_vulns),
-                        n_flg_lines,
-                        n_all_lines,
-                        n_run_tools,
-                        n_all_tools,
-                        score,
-                        # Add function name to the grouped flag
-                        func_name,
-                    )
+            grouped_flags.add(
+                GroupedSASTFlag(
+                    stats.tools[i],
+                    bb_info.file,
+                    bb_info.line_start,
+                    stats.vulns[i],
+                    int(stats.n_flg_lines[i]),
+                    bb_info.n_lines,
+                    int(stats.n_run_tools[i]),
+                    stats.n_all_tools,
+                    score,
                 )
+            )
 
         return grouped_flags
 
@@ -219,67 +355,78 @@ class FunctionGrouping(SASTFlagGrouping):
     SAST flag function grouping.
     """
 
-    def __init__(self, inspec_file: Path, weights: ScoreWeights) -> None:
-        super().__init__(inspec_file, weights)
-        self._func_infos: Dict[str, CodeBlockInfo] = {}
+    def __init__(self, sfi: SFIData, weights: ScoreWeights) -> None:
+        super().__init__(sfi, weights)
+
+        self._blocks = list(sfi.funcs)
+        self._block_nums = {func_name: i for i, func_name in enumerate(self._blocks)}
+        self._n_lines = np.asarray([func.n_lines for func in sfi.funcs.values()], dtype=np.int64)
 
-        data = json.loads(inspec_file.read_text())
+    def _line_index(self, file: str) -> Optional[IntervalIndex]:
+        return self._sfi.func_index(file)
 
-        for func in data["functions"]:
-            func_name = f"{func['location']['filename']}:{func['name']}"
-            self._func_infos[func_name] = CodeBlockInfo(
-                func["location"]["filename"],
-                func["location"]["line"]["start"],
-                func["location"]["line"]["end"],
-                func["LoC"],
+    def emit(self, stats: BlockStats, weights: ScoreWeights) -> SASTFlags:
+        grouped_flags = SASTFlags()
+
+        for i, (func_name, score) in enumerate(zip(stats.blocks, stats.scores(weights))):
+            func_info = self._sfi.funcs[func_name]
+
+            grouped_flags.add(
+                GroupedSASTFlag(
+                    stats.tools[i],
+                    func_info.file,
+                    func_info.line_start + 1,
+                    stats.vulns[i],
+                    int(stats.n_flg_lines[i]),
+                    func_info.n_lines,
+                    int(stats.n_run_tools[i]),
+                    stats.n_all_tools,
+                    score,
+                )
             )
 
-    def group(self, flags: SASTFlags) -> SASTFlags:
-        """
-        Group SAST flags based on basic block granularity.
+        return grouped_flags
 
-        :param flags:
-        :return:
-        """
-        flags_per_func: Dict = defaultdict(set)
 
-        for flag in flags:
-            for func_name, func_info in self._func_infos.items():
-                if flag.file == func_info.file:
-                    if func_info.line_start <= flag.line <= func_info.line_end:
-                        flags_per_func[func_name].add(flag)
-                        break
+class BasicBlockV2Grouping(FunctionGrouping):
+    """
+    SAST flag basic block grouping with function-level vuln. score.
+    """
 
-        n_tools = len({flag.tool for flag in flags})
+    def emit(self, stats: BlockStats, weights: ScoreWeights) -> SASTFlags:
         grouped_flags = SASTFlags()
 
-        for func_name, func_flags in flags_per_func.items():
-            func_tools = {flag.tool for flag in func_flags}
-            func_vulns = {f"{flag.vuln}:{flag.line}" for flag in func_flags}
+        for i, (func_name, score) in enumerate(zip(stats.blocks, stats.scores(weights))):
+            start, end = stats.flag_bounds[i], stats.flag_bounds[i + 1]
 
-            n_flg_lines = len({flag.line for flag in func_flags})
-            n_all_lines = self._func_infos[func_name].n_lines
-            n_run_tools = len(func_tools)
-            n_all_tools = n_tools
+            func_lines = stats.lines[start:end]
+            func_tools = stats.tool_codes[start:end]
+            func_vulns = stats.vuln_codes[start:end]
 
-            r_flg_lines = div(n_flg_lines, n_all_lines)
-            r_run_tools = div(n_run_tools, n_all_tools)
+            # All (distinct) basic blocks of the function containing at least one flag
+            for bb_info in dict.fromkeys(self._sfi.func_bbs[func_name]):
+                in_bb = (func_lines >= bb_info.line_start) & (func_lines <= bb_info.line_end)
 
-            # Calculate the vulnerability score
-            score = round((self._weights.flags * r_flg_lines) + (self._weights.tools * r_run_tools), SCORE_PRECISION)
+                if not in_bb.any():
+                    continue
 
-            grouped_flags.add(
-                GroupedSASTFlag(
-                    CONCAT_CHAR.join(func_tools),
-                    self._func_infos[func_name].file,
-                    self._func_infos[func_name].line_start + 1,
-                    CONCAT_CHAR.join(func_vulns),
-                    n_flg_lines,
-                    n_all_lines,
-                    n_run_tools,
-                    n_all_tools,
-                    score,
+                bb_tools = {stats.tool_strs[t] for t in func_tools[in_bb]}
+                bb_vulns = {f"{stats.vuln_strs[v]}:{line}" for v, line in zip(func_vulns[in_bb], func_lines[in_bb])}
+
+                grouped_flags.add(
+                    GroupedSASTFlag_with_funcname(
+                        CONCAT_CHAR.join(bb_tools),
+                        bb_info.file,
+                        bb_info.line_start,
+                        CONCAT_CHAR.join(bb_vulns),
+                        int(stats.n_flg_lines[i]),
+                        self._sfi.funcs[func_name].n_lines,
+                        int(stats.n_run_tools[i]),
+                        stats.n_all_tools,
+                        score,
+                        # Add function name to the grouped flag
+                        func_name,
+                    )
                 )
-            )
 
         return grouped_flags
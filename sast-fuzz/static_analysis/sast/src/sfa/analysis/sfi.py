@@ -0,0 +1,134 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+from collections import defaultdict, namedtuple
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sfa.utils.interval import IntervalIndex
+
+# Container for code block information
+CodeBlockInfo = namedtuple("CodeBlockInfo", ["file", "line_start", "line_end", "n_lines"])
+
+
+def build_line_index(blocks: Iterable[Tuple[Any, CodeBlockInfo]]) -> Dict[str, IntervalIndex]:
+    """
+    Build per-file line indexes over code blocks. If blocks overlap, the first one (in iteration order) wins.
+
+    :param blocks: Pairs of block key and block information
+    :return:
+    """
+    ranges: Dict[str, List] = defaultdict(list)
+
+    for key, info in blocks:
+        ranges[info.file].append((info.line_start, info.line_end, key))
+
+    return {file: IntervalIndex(file_ranges) for file, file_ranges in ranges.items()}
+
+
+class SFIData:
+    """
+    SASTFuzz Inspector (SFI) data container. The SFI file is parsed once and shared by all SAST flag filters and
+    groupings.
+    """
+
+    def __init__(self, data: Dict) -> None:
+        # Functions are identified by "<file>:<name>", basic blocks by their SFI ID
+        self.funcs: Dict[str, CodeBlockInfo] = {}
+        self.func_bbs: Dict[str, List[CodeBlockInfo]] = {}
+        self.bbs: Dict[int, CodeBlockInfo] = {}
+        self.reachable_funcs: Dict[str, CodeBlockInfo] = {}
+
+        for func in data["functions"]:
+            func_file = func["location"]["filename"]
+            func_name = f"{func_file}:{func['name']}"
+
+            func_info = CodeBlockInfo(
+                func_file, func["location"]["line"]["start"], func["location"]["line"]["end"], func["LoC"]
+            )
+
+            blk_infos = []
+            for bb in func["basic_blocks"]:
+                bb_info = CodeBlockInfo(
+                    func_file, bb["location"]["line"]["start"], bb["location"]["line"]["end"], bb["LoC"]
+                )
+
+                self.bbs[bb["id"]] = bb_info
+                blk_infos.append(bb_info)
+
+            self.funcs[func_name] = func_info
+            self.func_bbs[func_name] = blk_infos
+
+            if func["location"]["reachable_from_main"]:
+                self.reachable_funcs[func_name] = func_info
+
+        self._func_index = build_line_index(self.funcs.items())
+        self._bb_index = build_line_index(self.bbs.items())
+
+    @classmethod
+    def from_file(cls, inspec_file: Path) -> "SFIData":
+        """
+        Load SFI data from a JSON file.
+
+        :param inspec_file:
+        :return:
+        """
+        with inspec_file.open("r") as json_file:
+            return cls(json.load(json_file))
+
+    def func_index(self, file: str) -> Optional[IntervalIndex]:
+        """
+        Get the line index of the functions in a file.
+
+        :param file: File path (SFI data identifies files by name)
+        :return: Index or None if the file contains no functions
+        """
+        return self._func_index.get(os.path.basename(file))
+
+    def bb_index(self, file: str) -> Optional[IntervalIndex]:
+        """
+        Get the line index of the basic blocks in a file.
+
+        :param file: File path (SFI data identifies files by name)
+        :return: Index or None if the file contains no basic blocks
+        """
+        return self._bb_index.get(os.path.basename(file))
+
+    def find_func(self, file: str, line: int) -> Optional[str]:
+        """
+        Find the function containing a code location. If several functions contain the location, the first one listed
+        in the SFI file wins.
+
+        :param file: File path (SFI data identifies files by name)
+        :param line:
+        :return: Function name or None if no function contains the location
+        """
+        func_index = self.func_index(file)
+
+        return None if func_index is None else func_index.find(line)
+
+    def find_bb(self, file: str, line: int) -> Optional[int]:
+        """
+        Find the basic block containing a code location. If several (overlapping) basic blocks contain the location,
+        the first one listed in the SFI file wins.
+
+        :param file: File path (SFI data identifies files by name)
+        :param line:
+        :return: Basic block ID or None if no basic block contains the location
+        """
+        bb_index = self.bb_index(file)
+
+        return None if bb_index is None else bb_index.find(line)
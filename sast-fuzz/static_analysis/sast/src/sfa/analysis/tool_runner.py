@@ -15,17 +15,22 @@
 import json
 import logging
 import os
-import time
+import shlex
 import traceback
 from abc import ABC, abstractmethod
+from collections import defaultdict, namedtuple
 from itertools import chain
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Callable, ClassVar, Dict, Optional
+from typing import Callable, ClassVar, ContextManager, Dict, Iterator, List, Optional, TextIO, Union
 
 from sfa import SASTToolConfig
 from sfa.analysis import SASTFlag, SASTFlags
-from sfa.utils.fs import copy_dir, find_files
+from sfa.analysis.cache import ResultCache, cache_key
+from sfa.analysis.workspace import SOURCE_FILE_EXTS, SubjectWorkspace
+from sfa.utils.fs import copy_dir, find_files, hash_dir, hash_file, wait_for_file
+from sfa.utils.json_stream import JSONStream
+from sfa.utils.metrics import MetricsRecorder
 from sfa.utils.proc import run_shell_command
 
 # Build script name
@@ -40,6 +45,19 @@ CLANG_SCAN_ENVVAR: str = "CLANG_SCAN"
 # Supported SARIF version
 SARIF_VERSION: str = "2.1.0"
 
+# Prefix of SARIF artifact URIs using the file scheme
+FILE_URI_PREFIX: str = "file://"
+
+# Version of the runners' flag format, e.g. their file paths (part of the cache keys, so that results cached in an
+# older format are not reused)
+FLAG_FORMAT_VERSION: int = 2
+
+# Max. time (in seconds) to wait for a SAST tool report to be complete once the tool exited
+REPORT_TIMEOUT: float = 60.0
+
+# Max. number of files passed to a single SAST tool invocation in incremental mode
+ANALYSIS_BATCH_SIZE: int = 256
+
 # SAST tool setup environment variables
 SAST_SETUP_ENV: Dict[str, str] = {
     **os.environ.copy(),
@@ -57,51 +75,143 @@ def is_cmake_project(subject_dir: Path) -> bool:
     return (subject_dir / "CMakeLists.txt").exists()
 
 
-def default_sarif_checks(string: str) -> Dict:
-    """
-    Run default checks on SARIF string.
+# Container for the SARIF run information needed by the sanity checks
+SARIFRunInfo = namedtuple("SARIFRunInfo", ["tool", "properties"])
 
-    :param string:
-    :return:
+
+class SARIFReader:
+    """
+    Streaming SARIF reader. Iterating over the reader yields the SAST flags of all runs one result at a time, i.e.,
+    without materializing the whole SARIF document. The metadata needed for the sanity checks (SARIF version, run
+    information) is collected during the same pass.
     """
-    if len(string.strip()) == 0:
-        raise ValueError("Empty input / no JSON string.")
 
-    sarif_data = json.loads(string)
+    def __init__(self, source: Union[str, TextIO], keep_paths: bool = False) -> None:
+        self._source = source
+        self._keep_paths = keep_paths
+
+        self.version: Optional[str] = None
+        self.runs: List[SARIFRunInfo] = []
+
+    def _convert_result(self, tool: str, rules: Dict[str, str], result: Dict) -> Iterator[SASTFlag]:
+        """
+        Convert a SARIF result into our SAST flag format.
+
+        :param tool:
+        :param rules:
+        :param result:
+        :return:
+        """
+        vuln = rules[result["ruleId"]]
+
+        for loc in result["locations"]:
+            file = loc["physicalLocation"]["artifactLocation"]["uri"]
+            line = loc["physicalLocation"]["region"]["startLine"]
+
+            if not self._keep_paths:
+                file = Path(file).name
+
+            yield SASTFlag(tool, file, line, vuln)
+
+    def _read_run(self, doc: JSONStream) -> Iterator[SASTFlag]:
+        """
+        Read a single SARIF run.
+
+        :param doc:
+        :return:
+        """
+        tool: Optional[str] = None
+        rules: Dict[str, str] = {}
+        properties: Dict = {}
+
+        # Results listed before the tool information (SARIF does not fix the key order)
+        pending: List[Dict] = []
+
+        for key in doc.iter_object():
+            if key == "tool":
+                driver = doc.read_value()["driver"]
+
+                tool = driver["name"].lower()
+
+                # Create a mapping between rule ID and vulnerability name
+                rules = {rule["id"]: rule["name"] for rule in driver["rules"]}
+
+            elif key == "results":
+                for _ in doc.iter_array():
+                    result = doc.read_value()
+
+                    if tool is None:
+                        pending.append(result)
+                    else:
+                        yield from self._convert_result(tool, rules, result)
 
-    if sarif_data["version"] != SARIF_VERSION:
-        raise ValueError(f"SARIF version {sarif_data['version']} is not supported.")
+            elif key == "properties":
+                properties = doc.read_value()
 
-    return sarif_data
+            else:
+                doc.skip_value()
 
+        if tool is None:
+            raise ValueError("No tool information found in SARIF run.")
 
-def convert_sarif(string: str) -> SASTFlags:
+        for result in pending:
+            yield from self._convert_result(tool, rules, result)
+
+        self.runs.append(SARIFRunInfo(tool, properties))
+
+    def __iter__(self) -> Iterator[SASTFlag]:
+        doc = JSONStream(self._source)
+
+        if doc.peek() == "":
+            raise ValueError("Empty input / no JSON string.")
+
+        for key in doc.iter_object():
+            if key == "version":
+                self.version = doc.read_value()
+
+            elif key == "runs":
+                for _ in doc.iter_array():
+                    yield from self._read_run(doc)
+
+            else:
+                doc.skip_value()
+
+
+def default_sarif_checks(reader: SARIFReader) -> None:
     """
-    Convert SARIF data into our SAST flag format.
+    Run default checks on the metadata collected by a SARIF reader.
 
-    :param string:
+    :param reader:
     :return:
     """
-    sarif_data = json.loads(string)
+    if reader.version != SARIF_VERSION:
+        raise ValueError(f"SARIF version {reader.version} is not supported.")
 
-    flags = SASTFlags()
 
-    for run in sarif_data["runs"]:
-        tool = run["tool"]["driver"]["name"].lower()
+def convert_sarif(
+    source: Union[str, TextIO],
+    checks: Optional[Callable[[SARIFReader], None]] = None,
+    flags: Optional[SASTFlags] = None,
+    map_path: Optional[Callable[[str], str]] = None,
+) -> SASTFlags:
+    """
+    Convert SARIF data into our SAST flag format. The flags are added one by one while the data is read.
 
-        # Create a mapping between rule ID and vulnerability name
-        rule_dict = {rule["id"]: rule["name"] for rule in run["tool"]["driver"]["rules"]}
+    :param source: SARIF string or text stream
+    :param checks: Sanity checks to be run on the SARIF metadata once the data has been read
+    :param flags: SAST flags to add the converted flags to (a new container if not given)
+    :param map_path: Function mapping the artifact URIs onto the flags' file paths (default: file names only)
+    :return: SAST flags
+    """
+    reader = SARIFReader(source, keep_paths=map_path is not None)
 
-        for flag in run["results"]:
-            vuln = rule_dict[flag["ruleId"]]
+    flags = flags if flags is not None else SASTFlags()
 
-            for loc in flag["locations"]:
-                file = loc["physicalLocation"]["artifactLocation"]["uri"]
-                line = loc["physicalLocation"]["region"]["startLine"]
+    for flag in reader:
+        flags.add(flag if map_path is None else flag._replace(file=map_path(flag.file)))
 
-                file = Path(file).name
-
-                flags.add(SASTFlag(tool, file, line, vuln))
+    if checks is not None:
+        checks(reader)
 
     return flags
 
@@ -111,12 +221,41 @@ class SASTToolRunner(ABC):
     Abstract SAST tool runner.
     """
 
-    def __init__(self, subject_dir: Path, config: SASTToolConfig) -> None:
+    # Scheduling priority of parallel runs; long-running tools get a higher priority to be started first
+    priority: ClassVar[int] = 0
+
+    def __init__(
+        self,
+        subject_dir: Path,
+        config: SASTToolConfig,
+        cache: Optional[ResultCache] = None,
+        workspace: Optional[SubjectWorkspace] = None,
+    ) -> None:
         self._subject_dir = subject_dir
         self._config = config
+        self._cache = cache
+        self._workspace = workspace
 
         self._is_cmake_project = is_cmake_project(subject_dir)
 
+        # Tool version of the current run (determined on first use, as it requires running the tool)
+        self._run_tool_version: Optional[str] = None
+
+        # Working copy of the current run (if any); the tools may report their file paths relative to it
+        self._work_dir: Optional[Path] = None
+
+        # Timing and resource usage of the run's stages (setup, analyze, sanity checks, format)
+        self.metrics = MetricsRecorder()
+
+    def _stage(self, name: str) -> ContextManager[Dict[str, Optional[int]]]:
+        """
+        Measure a stage of the run (named after the runner).
+
+        :param name:
+        :return:
+        """
+        return self.metrics.stage(f"{type(self).__name__}.{name}")
+
     @abstractmethod
     def _setup(self, temp_dir: Path) -> Path:
         """
@@ -128,52 +267,205 @@ class SASTToolRunner(ABC):
         pass
 
     @abstractmethod
-    def _analyze(self, working_dir: Path) -> str:
+    def _analyze(self, working_dir: Path) -> Path:
         """
         Analyze target program using SAST tool.
 
         :param working_dir:
-        :return:
+        :return: Path to the SAST tool report (file or directory); valid until the setup's temp. directory is removed
         """
         pass
 
     @abstractmethod
-    def _sanity_checks(self, string: str) -> None:
+    def _sanity_checks(self, report: Path) -> None:
         """
         Run sanity checks on SAST tool output.
 
-        :param string:
+        :param report:
         :return:
         """
         pass
 
     @abstractmethod
-    def _format(self, string: str) -> SASTFlags:
+    def _format(self, report: Path) -> SASTFlags:
         """
-        Format SAST tool output.
+        Format SAST tool output. The report is read as a stream, i.e., it is never held in memory as a whole.
 
-        :param flags:
+        :param report:
         :return:
         """
         pass
 
-    def run(self) -> SASTFlags:
+    def _check_and_format(self, report: Path, sanity_checks: bool) -> SASTFlags:
+        """
+        Run sanity checks on SAST tool output (if requested) and format it.
+
+        :param report:
+        :param sanity_checks:
+        :return:
+        """
+        if sanity_checks:
+            with self._stage("sanity_checks"):
+                self._sanity_checks(report)
+
+        return self._format(report)
+
+    @property
+    def num_threads(self) -> int:
+        """
+        Number of threads used by the SAST tool.
+
+        :return:
+        """
+        return max(self._config.num_threads, 1)
+
+    @property
+    def memory(self) -> int:
+        """
+        Memory budget (in MB) of the SAST tool; 0 if unknown.
+
+        :return:
+        """
+        return max(self._config.memory, 0)
+
+    @property
+    def _timeout(self) -> Optional[float]:
+        """
+        Timeout (in seconds) of each command run for the SAST tool; None if unlimited.
+
+        :return:
+        """
+        return float(self._config.timeout) if self._config.timeout > 0 else None
+
+    def _checkout(self, temp_dir: Path) -> Path:
+        """
+        Create a working copy of the target program, cloned from the shared workspace if one is given.
+
+        :param temp_dir:
+        :return:
+        """
+        if self._workspace is None:
+            self._work_dir = copy_dir(self._subject_dir, temp_dir)
+        else:
+            self._work_dir = self._workspace.checkout(temp_dir)
+
+        return self._work_dir  # type: ignore
+
+    def _relative_path(self, path: str) -> str:
+        """
+        Map a file path (or SARIF artifact URI) reported by the SAST tool onto a path relative to the subject directory.
+        Relative paths are resolved against the working copy (if any) or the current directory; paths outside of the
+        subject and its working copy are kept as absolute paths.
+
+        :param path:
+        :return:
+        """
+        path = path[len(FILE_URI_PREFIX) :] if path.startswith(FILE_URI_PREFIX) else path
+
+        base_dir = self._work_dir if self._work_dir is not None else Path.cwd()
+        abs_path = base_dir.absolute() / path
+
+        for root in (self._subject_dir, self._work_dir):
+            if root is None:
+                continue
+
+            for root_path in (root.absolute(), root.resolve()):
+                try:
+                    return str(abs_path.relative_to(root_path))
+                except ValueError:
+                    pass
+
+        return str(abs_path)
+
+    def _sanity_checks_enabled(self) -> bool:
+        """
+        Check if the sanity checks are enabled for the subject.
+
+        :return:
+        """
+        return self._config.sanity_checks == "always" or (
+            self._config.sanity_checks == "cmake" and self._is_cmake_project
+        )
+
+    def _run_tool(self) -> SASTFlags:
         """
         Setup target program, run SAST tool (+ sanity checks), and format output.
 
         :return:
         """
-        try:
-            with TemporaryDirectory() as temp_dir:
+        # Keep the working copy on the workspace's file system, so that it can be cloned copy-on-write
+        with TemporaryDirectory(dir=None if self._workspace is None else self._workspace.root_dir) as temp_dir:
+            with self._stage("setup"):
                 working_dir = self._setup(Path(temp_dir))
-                flags = self._analyze(working_dir)
 
-            if self._config.sanity_checks == "always" or (
-                self._config.sanity_checks == "cmake" and self._is_cmake_project
-            ):
-                self._sanity_checks(flags)
+            with self._stage("analyze"):
+                report = self._analyze(working_dir)
+
+            # Includes the sanity checks (run in the same pass by the SARIF runners)
+            with self._stage("format") as counts:
+                flags = self._check_and_format(report, self._sanity_checks_enabled())
+                counts["n_flags"] = len(flags)
+
+        return flags
+
+    def _tool_version(self) -> str:
+        """
+        Get the version of the SAST tool.
+
+        :return:
+        """
+        return run_shell_command(f"{self._config.path} --version").strip()
+
+    def _current_tool_version(self) -> str:
+        """
+        Get the version of the SAST tool, determined once per run.
+
+        :return:
+        """
+        if self._run_tool_version is None:
+            self._run_tool_version = self._tool_version()
 
-            return self._format(flags)
+        return self._run_tool_version
+
+    def _cache_key(self) -> str:
+        """
+        Get the result cache key, i.e., a hash of the subject tree, the tool configuration, and the tool version.
+
+        :return:
+        """
+        return cache_key(
+            type(self).__name__,
+            FLAG_FORMAT_VERSION,
+            hash_dir(self._subject_dir),
+            self._config.path,
+            list(self._config.checks),
+            self._config.sanity_checks,
+            self._current_tool_version(),
+        )
+
+    def _run_cached(self) -> SASTFlags:
+        """
+        Setup target program, run SAST tool (+ sanity checks), and format output. Results are served from / stored in
+        the result cache if one is given.
+
+        :return:
+        """
+        try:
+            key = None
+
+            if self._cache is not None:
+                key = self._cache_key()
+
+                if (cached_flags := self._cache.get(key)) is not None:
+                    logging.info(f"{type(self).__name__}: Using cached results")
+                    return cached_flags
+
+            flags = self._run_tool()
+
+            if self._cache is not None and key is not None:
+                self._cache.put(key, flags)
+
+            return flags
 
         except Exception as ex:
             logging.error(ex)
@@ -181,45 +473,199 @@ class SASTToolRunner(ABC):
 
             return SASTFlags()
 
+    def run(self) -> SASTFlags:
+        """
+        Run the SAST tool (see '_run_cached'); the timing and resource usage of the stages are recorded in 'metrics'.
+
+        :return:
+        """
+        # The tool may be updated between runs
+        self._run_tool_version = None
+        self._work_dir = None
+
+        with self._stage("run") as counts:
+            flags = self._run_cached()
+            counts["n_flags"] = len(flags)
+
+        return flags
+
 
-class FlawfinderRunner(SASTToolRunner):
+class SARIFRunner(SASTToolRunner):
     """
-    Flawfinder runner.
+    Abstract runner for SAST tools reporting in SARIF format.
     """
 
-    def _setup(self, temp_dir: Path) -> Path:
-        return self._subject_dir
+    def _check_sarif(self, reader: SARIFReader) -> None:
+        """
+        Run sanity checks on the SARIF metadata.
 
-    def _analyze(self, working_dir: Path) -> str:
-        return run_shell_command(
-            f"{self._config.path} --dataonly --sarif {' '.join(self._config.checks)} {working_dir}"
-        )
+        :param reader:
+        :return:
+        """
+        default_sarif_checks(reader)
+
+    def _sanity_checks(self, report: Path) -> None:
+        self._check_and_format(report, True)
 
-    def _sanity_checks(self, string: str) -> None:
-        default_sarif_checks(string)
+    def _format(self, report: Path) -> SASTFlags:
+        return self._check_and_format(report, False)
 
-    def _format(self, string: str) -> SASTFlags:
-        return convert_sarif(string)
+    def _check_and_format(self, report: Path, sanity_checks: bool) -> SASTFlags:
+        # The sanity checks run on the metadata collected while reading the flags, i.e., in the same single pass
+        with report.open("r") as sarif:
+            return convert_sarif(sarif, self._check_sarif if sanity_checks else None, map_path=self._relative_path)
 
 
-class SemgrepRunner(SASTToolRunner):
+class SourceSARIFRunner(SARIFRunner):
     """
-    Semgrep runner.
+    Abstract runner for SARIF-reporting SAST tools scanning the source files directly. In incremental mode, only the
+    source files changed since the last run are re-analyzed; the flags of unchanged files are taken from the last run.
     """
 
+    def __init__(
+        self, subject_dir: Path, config: SASTToolConfig, cache: Optional[ResultCache] = None, incremental: bool = False
+    ) -> None:
+        super().__init__(subject_dir, config, cache)
+        self._incremental = incremental
+
+    @abstractmethod
+    def _analyze_targets(self, targets: List[Path], report_file: Path) -> None:
+        """
+        Analyze the given source files/directories using SAST tool; the SARIF report is streamed into a file.
+
+        :param targets:
+        :param report_file:
+        :return:
+        """
+        pass
+
     def _setup(self, temp_dir: Path) -> Path:
-        return self._subject_dir
+        # The sources are scanned in place; the temp. directory takes the report
+        return temp_dir
+
+    def _analyze(self, working_dir: Path) -> Path:
+        report_file = working_dir / "report.sarif"
+        self._analyze_targets([self._subject_dir], report_file)
+
+        return report_file
+
+    def _state_key(self) -> str:
+        """
+        Get the key of the incremental analysis state, i.e., a hash of the subject location and the tool configuration.
+
+        :return:
+        """
+        return cache_key(
+            type(self).__name__,
+            FLAG_FORMAT_VERSION,
+            str(self._subject_dir.resolve()),
+            self._config.path,
+            list(self._config.checks),
+            self._config.sanity_checks,
+            self._current_tool_version(),
+        )
+
+    def _run_tool(self) -> SASTFlags:
+        if not self._incremental or self._cache is None:
+            return super()._run_tool()
+
+        with TemporaryDirectory() as temp_dir:
+            return self._run_incremental(Path(temp_dir))
+
+    def _run_incremental(self, temp_dir: Path) -> SASTFlags:
+        """
+        Re-analyze the source files changed since the last run, and merge their flags with the ones of the unchanged
+        files.
+
+        :param temp_dir: Directory for the SARIF reports
+        :return:
+        """
+        state_file = self._cache.state_file(self._state_key())  # type: ignore
+        state: Dict[str, Dict] = json.loads(state_file.read_text()) if state_file.exists() else {}
+
+        hashes = {
+            str(file.relative_to(self._subject_dir)): hash_file(file)
+            for file in find_files(self._subject_dir, exts=SOURCE_FILE_EXTS)
+            if file.is_file()
+        }
+        changed = sorted(file for file, file_hash in hashes.items() if state.get(file, {}).get("hash") != file_hash)
 
-    def _analyze(self, working_dir: Path) -> str:
-        return run_shell_command(
-            f"{self._config.path} scan --quiet --sarif --jobs {self._config.num_threads} {' '.join([f'--config {check}' for check in self._config.checks])} {working_dir}"
+        logging.info(f"{type(self).__name__}: {len(changed)} of {len(hashes)} source file(s) changed")
+
+        if len(state) == 0:
+            # No previous run -- analyze the whole subject at once
+            batches = [[self._subject_dir]]
+        else:
+            batches = [
+                [self._subject_dir / file for file in changed[i : i + ANALYSIS_BATCH_SIZE]]
+                for i in range(0, len(changed), ANALYSIS_BATCH_SIZE)
+            ]
+
+        new_flags: Dict[str, List[List]] = defaultdict(list)
+
+        for i, batch in enumerate(batches):
+            report_file = temp_dir / f"report{i}.sarif"
+
+            with self._stage("analyze"):
+                self._analyze_targets(batch, report_file)
+
+            with report_file.open("r") as report:
+                reader = SARIFReader(report, keep_paths=True)
+
+                for flag in reader:
+                    file = self._relative_path(flag.file)
+                    new_flags[file].append(list(flag._replace(file=file)))
+
+            if self._sanity_checks_enabled():
+                self._check_sarif(reader)
+
+            report_file.unlink()
+
+        state = {
+            file: {"hash": file_hash, "flags": new_flags[file] if file in changed else state[file]["flags"]}
+            for file, file_hash in hashes.items()
+        }
+
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        state_file.write_text(json.dumps(state))
+
+        # Flags outside of the tracked source files (e.g. unmappable URIs) are reported, but not carried over
+        untracked = [flag for file, file_flags in new_flags.items() if file not in hashes for flag in file_flags]
+
+        if len(untracked) > 0:
+            logging.warning(f"{type(self).__name__}: {len(untracked)} flag(s) outside of the tracked source files")
+
+        flags = SASTFlags()
+        for flag in chain(chain.from_iterable(file_state["flags"] for file_state in state.values()), untracked):
+            flags.add(SASTFlag(*flag))
+
+        return flags
+
+
+class FlawfinderRunner(SourceSARIFRunner):
+    """
+    Flawfinder runner.
+    """
+
+    def _analyze_targets(self, targets: List[Path], report_file: Path) -> None:
+        run_shell_command(
+            f"{self._config.path} --dataonly --sarif {' '.join(self._config.checks)} {' '.join(map(shlex.quote, map(str, targets)))}",
+            timeout=self._timeout,
+            stdout_file=report_file,
         )
 
-    def _sanity_checks(self, string: str) -> None:
-        default_sarif_checks(string)
 
-    def _format(self, string: str) -> SASTFlags:
-        return convert_sarif(string)
+class SemgrepRunner(SourceSARIFRunner):
+    """
+    Semgrep runner.
+    """
+
+    def _analyze_targets(self, targets: List[Path], report_file: Path) -> None:
+        run_shell_command(
+            f"{self._config.path} scan --quiet --sarif --jobs {self._config.num_threads} {' '.join([f'--config {check}' for check in self._config.checks])} {' '.join(map(shlex.quote, map(str, targets)))}",
+            timeout=self._timeout,
+            stdout_file=report_file,
+        )
 
 
 class InferRunner(SASTToolRunner):
@@ -227,6 +673,8 @@ class InferRunner(SASTToolRunner):
     Infer runner.
     """
 
+    priority: ClassVar[int] = 2
+
     def _setup(self, temp_dir: Path) -> Path:
         result_dir = temp_dir / "infer_res"
 
@@ -235,77 +683,101 @@ class InferRunner(SASTToolRunner):
         else:
             setup_cmd = f'./{BUILD_SCRIPT_NAME} "{self._config.path} capture --results-dir {result_dir} -- make"'
 
-        run_shell_command(setup_cmd, cwd=copy_dir(self._subject_dir, temp_dir), env=SAST_SETUP_ENV)
+        run_shell_command(setup_cmd, cwd=self._checkout(temp_dir), env=SAST_SETUP_ENV, timeout=self._timeout)
 
         return result_dir
 
-    def _analyze(self, working_dir: Path) -> str:
+    def _analyze(self, working_dir: Path) -> Path:
         run_shell_command(
-            f"{self._config.path} analyze --results-dir {working_dir} --jobs {self._config.num_threads} --keep-going {' '.join(self._config.checks)}"
+            f"{self._config.path} analyze --results-dir {working_dir} --jobs {self._config.num_threads} --keep-going {' '.join(self._config.checks)}",
+            check=True,
+            timeout=self._timeout,
         )
 
-        time.sleep(5)
-
         # By default, Infer writes the results into the 'report.json' file once the analysis is complete.
-        return (working_dir / "report.json").read_text()
+        return wait_for_file(working_dir / "report.json", REPORT_TIMEOUT)
 
-    def _sanity_checks(self, string: str) -> None:
+    def _sanity_checks(self, report: Path) -> None:
         pass
 
-    def _format(self, string: str) -> SASTFlags:
+    def _format(self, report: Path) -> SASTFlags:
         flags = SASTFlags()
 
-        for flag in json.loads(string):
+        with report.open("r") as report_json:
+            for flag in self._read_report(JSONStream(report_json)):
+                flags.add(flag)
+
+        return flags
+
+    def _read_report(self, doc: JSONStream) -> Iterator[SASTFlag]:
+        """
+        Read the flags of an Infer report (JSON array of issues) one by one.
+
+        :param doc:
+        :return:
+        """
+        for _ in doc.iter_array():
+            flag = doc.read_value()
+
             tool = "infer"
             file = flag["file"]
             line = flag["line"]
             vuln = flag["bug_type"]
 
-            file = Path(file).name
-
-            flags.add(SASTFlag(tool, file, line, vuln))
+            file = self._relative_path(file)
 
-        return flags
+            yield SASTFlag(tool, file, line, vuln)
 
 
-class CodeQLRunner(SASTToolRunner):
+class CodeQLRunner(SARIFRunner):
     """
     CodeQL runner.
     """
 
+    priority: ClassVar[int] = 3
+
+    def _ram_option(self) -> str:
+        """
+        Get the option limiting CodeQL's memory usage to the memory budget (if any).
+
+        :return:
+        """
+        return f"--ram={self.memory}" if self.memory > 0 else ""
+
     def _setup(self, temp_dir: Path) -> Path:
         result_dir = temp_dir / "codeql_res"
 
         run_shell_command(
             f"{self._config.path} database create --language=cpp --command=./{BUILD_SCRIPT_NAME} --threads={self._config.num_threads} {result_dir}",
-            cwd=copy_dir(self._subject_dir, temp_dir),
+            cwd=self._checkout(temp_dir),
             env=SAST_SETUP_ENV,
+            timeout=self._timeout,
         )
 
         return result_dir
 
-    def _analyze(self, working_dir: Path) -> str:
+    def _analyze(self, working_dir: Path) -> Path:
         result_file = working_dir / "report.sarif"
 
         run_shell_command(
-            f"{self._config.path} database analyze --output={result_file} --format=sarifv2.1.0 --threads={self._config.num_threads} {working_dir} {' '.join(self._config.checks)}"
+            f"{self._config.path} database analyze --output={result_file} --format=sarifv2.1.0 --threads={self._config.num_threads} {self._ram_option()} {working_dir} {' '.join(self._config.checks)}",
+            check=True,
+            timeout=self._timeout,
         )
 
-        time.sleep(5)
-
-        return result_file.read_text()
+        return wait_for_file(result_file, REPORT_TIMEOUT)
 
-    def _sanity_checks(self, string: str) -> None:
-        sarif_data = default_sarif_checks(string)
+    def _check_sarif(self, reader: SARIFReader) -> None:
+        default_sarif_checks(reader)
 
-        n_runs = len(sarif_data["runs"])
+        n_runs = len(reader.runs)
 
         if n_runs == 0:
             raise ValueError("No CodeQL execution runs found.")
 
         # Let's take the last executed SAST run for the sanity check
-        run = sarif_data["runs"][n_runs - 1]
-        metrics = run["properties"].get("metricResults")
+        run = reader.runs[n_runs - 1]
+        metrics = run.properties.get("metricResults")
 
         if metrics is None:
             raise ValueError("No CodeQL metrics data found in SARIF file.")
@@ -324,41 +796,46 @@ class CodeQLRunner(SASTToolRunner):
         if user_loc == 0:
             raise ValueError("No user C/C++ source code found in the CodeQL database.")
 
-    def _format(self, string: str) -> SASTFlags:
-        return convert_sarif(string)
 
-
-class ClangScanRunner(SASTToolRunner):
+class ClangScanRunner(SARIFRunner):
     """
     Clang analyzer (scan-build) runner.
     """
 
+    priority: ClassVar[int] = 1
+
+    def _tool_version(self) -> str:
+        # scan-build has no version option; the analyzer is part of clang
+        return run_shell_command("clang --version").strip()
+
     def _setup(self, temp_dir: Path) -> Path:
         result_dir = temp_dir / "clang-scan_res"
 
         run_shell_command(
             f"./{BUILD_SCRIPT_NAME} \"{self._config.path} --use-cc clang --use-c++ clang++ -o {result_dir} --keep-empty -sarif {' '.join(self._config.checks)} make\"",
-            cwd=copy_dir(self._subject_dir, temp_dir),
+            cwd=self._checkout(temp_dir),
             env={**SAST_SETUP_ENV, **{CLANG_SCAN_ENVVAR: self._config.path}},
+            timeout=self._timeout,
         )
 
         return result_dir
 
-    def _analyze(self, working_dir: Path) -> str:
-        result_files = find_files(working_dir, exts=[".sarif"])
+    def _analyze(self, working_dir: Path) -> Path:
+        # Clang analyzer writes the results of each checker into a separate SARIF file. Therefore, the report is the
+        # result directory.
+        return working_dir
 
-        # Clang analyzer writes the results of each checker into a separate SARIF file. Therefore, we append the results
-        # (JSON string) of each file as one line to the return string.
-        return os.linesep.join(map(lambda file: json.dumps(json.loads(file.read_text()), indent=None), result_files))
+    def _check_and_format(self, report: Path, sanity_checks: bool) -> SASTFlags:
+        checks = self._check_sarif if sanity_checks else None
 
-    def _sanity_checks(self, string: str) -> None:
-        for sarif_str in string.split(os.linesep):
-            default_sarif_checks(sarif_str)
+        flags = SASTFlags()
 
-    def _format(self, string: str) -> SASTFlags:
-        nested_flags = map(convert_sarif, string.split(os.linesep))
+        # Each SARIF file is streamed into the same container, one after another
+        for result_file in sorted(find_files(report, exts=[".sarif"])):
+            with result_file.open("r") as sarif:
+                convert_sarif(sarif, checks, flags, self._relative_path)
 
-        return SASTFlags(set(chain(*nested_flags)))
+        return flags
 
 
 class SanitizerRunner(SASTToolRunner):
@@ -372,30 +849,39 @@ class SanitizerRunner(SASTToolRunner):
     def _env_vars(self, result_file: Path) -> Dict[str, str]:
         pass
 
+    def _tool_version(self) -> str:
+        return run_shell_command(f"{SAST_SETUP_ENV['CC']} --version").strip()
+
     def _setup(self, temp_dir: Path) -> Path:
         result_file = temp_dir / self._report_name
 
         run_shell_command(
-            f"./{BUILD_SCRIPT_NAME}", cwd=copy_dir(self._subject_dir, temp_dir), env=self._env_vars(result_file)
+            f"./{BUILD_SCRIPT_NAME}",
+            cwd=self._checkout(temp_dir),
+            env=self._env_vars(result_file),
+            timeout=self._timeout,
         )
 
         return temp_dir
 
-    def _analyze(self, working_dir: Path) -> str:
-        return (working_dir / self._report_name).read_text()
+    def _analyze(self, working_dir: Path) -> Path:
+        return working_dir / self._report_name
 
-    def _sanity_checks(self, string: str) -> None:
+    def _sanity_checks(self, report: Path) -> None:
         pass
 
-    def _format(self, string: str) -> SASTFlags:
+    def _format(self, report: Path) -> SASTFlags:
         flags = SASTFlags()
 
-        for _line in string.split(os.linesep):
-            if _line != "":
+        with report.open("r") as report_csv:
+            for _line in map(str.rstrip, report_csv):
+                if _line == "":
+                    continue
+
                 vals = _line.split(",")
 
                 tool = vals[0]
-                file = vals[1]
+                file = self._relative_path(vals[1])
                 line = vals[3]
                 vuln = "-"
 
@@ -410,7 +896,8 @@ class AddressSanitizerRunner(SanitizerRunner):
     """
 
     def _env_vars(self, result_file: Path) -> Dict[str, str]:
-        setup_env = SAST_SETUP_ENV
+        # Copy the shared environment, as runners may run in threads of the same process
+        setup_env = SAST_SETUP_ENV.copy()
 
         for flag in ["CFLAGS", "CXXFLAGS"]:
             setup_env[flag] = f"{setup_env[flag]} -g -fsanitize=address"
@@ -426,7 +913,7 @@ class MemorySanitizerRunner(SanitizerRunner):
     """
 
     def _env_vars(self, result_file: Path) -> Dict[str, str]:
-        setup_env = SAST_SETUP_ENV
+        setup_env = SAST_SETUP_ENV.copy()
 
         for flag in ["CFLAGS", "CXXFLAGS"]:
             setup_env[flag] = f"{setup_env[flag]} -g -fsanitize=memory"
@@ -0,0 +1,114 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import fcntl
+import logging
+from pathlib import Path
+from typing import List
+
+from sfa.utils.fs import clone_dir, copy_dir, link_dir, supports_clone, supports_link
+
+# Sub-directory holding the snapshot of the subject
+SNAPSHOT_DIR_NAME: str = "snapshot"
+
+# Lock file guarding the snapshot creation
+LOCK_FILE_NAME: str = ".snapshot.lock"
+
+# C/C++ source file extensions; the builds only read these files, so they can be hard-linked into the working copies
+SOURCE_FILE_EXTS: List[str] = [".c", ".h", ".cc", ".cpp", ".cxx", ".hh", ".hpp", ".hxx"]
+
+
+class SubjectWorkspace:
+    """
+    Workspace shared by the SAST tool runners of a subject; each runner builds in its own working copy of the subject.
+    The subject is copied into the workspace only once (on the first checkout), and the working copies are created
+    from this snapshot: If the workspace's file system supports copy-on-write clones (e.g. Btrfs, XFS), they are cloned
+    from it, i.e., they share their data blocks with it. Otherwise (e.g. ext4, tmpfs), their source files are
+    hard-linked to the snapshot and only the remaining files (e.g. build scripts) are copied; build outputs are always
+    written into the runner's own working copy. Without hard links either, the working copies are copied straight from
+    the subject.
+
+    The workspace only holds paths (and the supported copy mode), so it can be passed to runners in other processes;
+    the snapshot creation is guarded by a file lock.
+    """
+
+    def __init__(self, subject_dir: Path, root_dir: Path) -> None:
+        self._subject_dir = subject_dir
+        self._root_dir = root_dir
+
+        self._root_dir.mkdir(parents=True, exist_ok=True)
+
+        # Checked once, as the working copies are placed in the workspace as well
+        self._use_clones = supports_clone(self._root_dir)
+        self._use_links = not self._use_clones and supports_link(self._root_dir)
+
+        if self._use_links:
+            logging.info(
+                f"No copy-on-write clones in '{self._root_dir}': Hard-link the source files of the working copies"
+            )
+        elif not self._use_clones:
+            logging.warning(
+                f"Neither copy-on-write clones nor hard links in '{self._root_dir}': Copy the subject per working copy"
+            )
+
+    @property
+    def root_dir(self) -> Path:
+        return self._root_dir
+
+    @property
+    def use_snapshot(self) -> bool:
+        return self._use_clones or self._use_links
+
+    @property
+    def snapshot_dir(self) -> Path:
+        return self._root_dir / SNAPSHOT_DIR_NAME / self._subject_dir.name
+
+    def _ensure_snapshot(self) -> Path:
+        """
+        Copy the subject into the workspace unless this has already been done (by any process).
+
+        :return: Snapshot directory
+        """
+        self._root_dir.mkdir(parents=True, exist_ok=True)
+
+        with (self._root_dir / LOCK_FILE_NAME).open("w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            try:
+                if not self.snapshot_dir.exists():
+                    logging.info(f"Create subject snapshot: {self.snapshot_dir}")
+
+                    # Copy into a staging directory first, so that a failed copy never leaves a partial snapshot
+                    staging_dir = self.snapshot_dir.with_name(f".{self.snapshot_dir.name}.tmp")
+                    copy_dir(self._subject_dir, staging_dir, overwrite=True, extend_dst=False)
+                    staging_dir.rename(self.snapshot_dir)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+        return self.snapshot_dir
+
+    def checkout(self, dst_dir: Path) -> Path:
+        """
+        Create a working copy of the subject.
+
+        :param dst_dir: Directory to place the working copy in (extended with the subject directory name)
+        :return: Working copy directory
+        """
+        if not self.use_snapshot:
+            return copy_dir(self._subject_dir, dst_dir, overwrite=False)  # type: ignore
+
+        if not self._use_clones:
+            return link_dir(self._ensure_snapshot(), dst_dir / self._subject_dir.name, SOURCE_FILE_EXTS)
+
+        return clone_dir(self._ensure_snapshot(), dst_dir / self._subject_dir.name)
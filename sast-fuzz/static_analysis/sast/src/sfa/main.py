@@ -14,24 +14,21 @@
 
 import logging
 import sys
+from itertools import chain
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 import typer
+import yaml
 from typing_extensions import Annotated
 
 from sfa import AppConfig
-from sfa.analysis import SASTFlags
-from sfa.analysis.factory import (
-    SASTFlagFilterFactory,
-    SASTFlagFilterMode,
-    SASTFlagGroupingFactory,
-    SASTFlagGroupingMode,
-    SASTTool,
-    SASTToolRunnerFactory,
-)
-from sfa.analysis.tool_runner import BUILD_SCRIPT_NAME, SASTToolRunner
-from sfa.utils.proc import run_with_multiproc
+from sfa.analysis import BINARY_SUFFIX, SASTFlags, SASTFlagType
+from sfa.analysis.factory import SASTFlagFilterMode, SASTFlagGroupingMode, SASTTool
+from sfa.analysis.sfi import SFIData
+from sfa.analysis.tool_runner import BUILD_SCRIPT_NAME
+from sfa.pipeline import needs_sfi, process_flags, read_manifest, run_batch, run_tools, stream_flags, write_output
+from sfa.utils.metrics import METRICS_SUFFIX, MetricsRecorder
 
 logging.basicConfig(format="%(asctime)s SFA[%(levelname)s]: %(message)s", level=logging.INFO, stream=sys.stdout)
 
@@ -43,65 +40,7 @@ DEFAULT_OUTPUT_FILE = Path.cwd() / "output.csv"
 
 app = typer.Typer()
 
-
-def _starter(runner: SASTToolRunner) -> SASTFlags:
-    return runner.run()
-
-
-def run_tools(
-    flags: SASTFlags, tools: List[SASTTool], subject_dir: Path, app_config: AppConfig, parallel: bool
-) -> SASTFlags:
-    """
-    Run SAST tools.
-
-    :param flags:
-    :param tools:
-    :param subject_dir:
-    :param app_config:
-    :param parallel:
-    :return:
-    """
-    logging.info(f"SAST tools: {', '.join([t.value for t in tools])}")
-
-    n_jobs = 1 if not parallel else len(tools)
-    tool_runners = [(runner,) for runner in SASTToolRunnerFactory((subject_dir, app_config)).get_instances(tools)]
-
-    nested_flags = run_with_multiproc(_starter, tool_runners, n_jobs)
-
-    flags.update(*map(SASTFlags, nested_flags))
-
-    return flags
-
-
-def filter_flags(flags: SASTFlags, filter_modes: List[SASTFlagFilterMode], inspec_file: Path) -> SASTFlags:
-    """
-    Filter SAST flags.
-
-    :param flags:
-    :param filter_modes:
-    :param inspec_file:
-    :return:
-    """
-    for flag_filter in SASTFlagFilterFactory(inspec_file).get_instances(filter_modes):
-        flags = flag_filter.filter(flags)
-
-    return flags
-
-
-def group_flags(
-    flags: SASTFlags, grouping_mode: SASTFlagGroupingMode, inspec_file: Path, app_config: AppConfig
-) -> SASTFlags:
-    """
-    Group SAST flags.
-
-    :param flags:
-    :param grouping_mode:
-    :param inspec_file:
-    :return:
-    """
-    flag_grouping = SASTFlagGroupingFactory((inspec_file, app_config)).get_instance(grouping_mode)
-
-    return flag_grouping.group(flags)
+batch_app = typer.Typer()
 
 
 @app.command()
@@ -115,7 +54,7 @@ def main(
             file_okay=True,
             dir_okay=False,
             resolve_path=True,
-            help="Path to the file(s) containing SAST tool flags.",
+            help=f"Path to the file(s) containing SAST tool flags (CSV or binary with extension {BINARY_SUFFIX}).",
         ),
     ] = None,
     subject_dir: Annotated[
@@ -163,7 +102,7 @@ def main(
             file_okay=True,
             dir_okay=False,
             resolve_path=True,
-            help="Path to the CSV output file.",
+            help=f"Path to the output file (CSV or binary with extension {BINARY_SUFFIX}). The stage metrics are written next to it (extension {METRICS_SUFFIX}).",
         ),
     ] = DEFAULT_OUTPUT_FILE,
     tools: Annotated[
@@ -173,12 +112,31 @@ def main(
             help="SAST tool(s) to be used for the analysis. Note: To run the tools, the subject directory must be specified (--subject).",
         ),
     ] = None,
-    parallel: Annotated[bool, typer.Option("--parallel", is_flag=True, help="Run the SAST tools in parallel.")] = False,
+    parallel: Annotated[
+        bool,
+        typer.Option(
+            "--parallel",
+            is_flag=True,
+            help="Run the SAST tools in parallel (within the scheduling limits of the configuration).",
+        ),
+    ] = False,
+    no_cache: Annotated[
+        bool,
+        typer.Option("--no-cache", is_flag=True, help="Neither read nor store SAST tool results in the result cache."),
+    ] = False,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            "--incremental",
+            is_flag=True,
+            help="Re-analyze only the source files changed since the last run (Flawfinder, Semgrep). Note: Requires the result cache.",
+        ),
+    ] = False,
     filter_modes: Annotated[
         Optional[List[SASTFlagFilterMode]],
         typer.Option(
             "--filter",
-            help="Filter(s) to be applied on the SAST flags. Note: To apply the filters, the SFI file must be specified (--inspection).",
+            help="Filter(s) to be applied on the SAST flags (settings in the configuration). Note: To apply the reachability filter, the SFI file must be specified (--inspection).",
         ),
     ] = None,
     grouping_mode: Annotated[
@@ -196,20 +154,118 @@ def main(
         if not (subject_dir / BUILD_SCRIPT_NAME).exists():
             raise typer.BadParameter("Build script couldn't be found in the subject directory.", param_hint="--subject")
 
-    if filter_modes or grouping_mode:
+        if incremental and no_cache:
+            raise typer.BadParameter("Incremental analysis requires the result cache.", param_hint="--incremental")
+
+    if needs_sfi(filter_modes or [], grouping_mode):
         if inspec_file is None:
             raise typer.BadParameter("SASTFuzz Inspector file is not specified.", param_hint="--inspection")
 
     app_config = AppConfig.from_yaml(config_file)
 
-    flags = SASTFlags()
-    flags.update(*map(SASTFlags.from_csv, flag_files or []))
+    metrics = MetricsRecorder()
+
+    # The SFI file is parsed once and shared by the filters and the grouping
+    sfi = SFIData.from_file(inspec_file) if needs_sfi(filter_modes or [], grouping_mode) else None  # type: ignore
+
+    # The flag files are streamed through the filters and the grouping
+    flags: Iterable[SASTFlagType] = stream_flags(flag_files or [])
 
     if tools:
-        flags = run_tools(flags, tools, subject_dir, app_config, parallel)  # type: ignore
-    if filter_modes:
-        flags = filter_flags(flags, filter_modes, inspec_file)  # type: ignore
-    if grouping_mode:
-        flags = group_flags(flags, grouping_mode, inspec_file, app_config)  # type: ignore
+        tool_flags = run_tools(
+            SASTFlags(), tools, subject_dir, app_config, parallel, not no_cache, incremental, metrics  # type: ignore
+        )
+        flags = chain(flags, tool_flags)
+
+    write_output(
+        process_flags(flags, filter_modes or [], grouping_mode, sfi, app_config, metrics), output_file, metrics
+    )
+
+
+@batch_app.command()
+def batch(
+    manifest_file: Annotated[
+        Path,
+        typer.Option(
+            "--manifest",
+            writable=False,
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            resolve_path=True,
+            help="Path to the YAML manifest listing the subjects (subject directory, SFI file, output file, flag files).",
+        ),
+    ],
+    config_file: Annotated[
+        Path,
+        typer.Option(
+            "--config",
+            writable=False,
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            resolve_path=True,
+            help="Path to the YAML configuration file.",
+        ),
+    ] = DEFAULT_CONFIG_FILE,
+    tools: Annotated[
+        Optional[List[SASTTool]], typer.Option("--tool", help="SAST tool(s) to be used for the analysis.")
+    ] = None,
+    parallel: Annotated[
+        bool,
+        typer.Option(
+            "--parallel",
+            is_flag=True,
+            help="Run the SAST tools in parallel (within the scheduling limits of the configuration).",
+        ),
+    ] = False,
+    no_cache: Annotated[
+        bool,
+        typer.Option("--no-cache", is_flag=True, help="Neither read nor store SAST tool results in the result cache."),
+    ] = False,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            "--incremental",
+            is_flag=True,
+            help="Re-analyze only the source files changed since the last run (Flawfinder, Semgrep). Note: Requires the result cache.",
+        ),
+    ] = False,
+    filter_modes: Annotated[
+        Optional[List[SASTFlagFilterMode]],
+        typer.Option(
+            "--filter",
+            help="Filter(s) to be applied on the SAST flags (settings in the configuration). Note: To apply the reachability filter, each subject must specify an SFI file.",
+        ),
+    ] = None,
+    grouping_mode: Annotated[
+        Optional[SASTFlagGroupingMode],
+        typer.Option(
+            "--grouping",
+            help="Grouping to be applied on the SAST flags. Note: To apply the grouping, each subject must specify an SFI file.",
+        ),
+    ] = None,
+) -> None:
+    try:
+        subjects = read_manifest(manifest_file)
+    except (KeyError, TypeError, yaml.YAMLError) as ex:
+        raise typer.BadParameter(f"Invalid manifest: {ex}", param_hint="--manifest")
+
+    if tools and incremental and no_cache:
+        raise typer.BadParameter("Incremental analysis requires the result cache.", param_hint="--incremental")
+
+    for subject in subjects:
+        if tools and not (subject.subject_dir / BUILD_SCRIPT_NAME).exists():
+            raise typer.BadParameter(
+                f"Build script couldn't be found in the subject directory {subject.subject_dir}.",
+                param_hint="--manifest",
+            )
+
+        if needs_sfi(filter_modes or [], grouping_mode) and subject.inspec_file is None:
+            raise typer.BadParameter(
+                f"SASTFuzz Inspector file is not specified for {subject.subject_dir}.", param_hint="--manifest"
+            )
+
+    app_config = AppConfig.from_yaml(config_file)
 
-    flags.to_csv(output_file)
+    run_batch(subjects, tools or [], filter_modes or [], grouping_mode, app_config, parallel, not no_cache, incremental)
@@ -0,0 +1,446 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import time
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from multiprocessing import cpu_count
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import yaml
+
+from sfa import AppConfig
+from sfa.analysis import BINARY_SUFFIX, SASTFlags, SASTFlagType, read_csv
+from sfa.analysis.cache import ResultCache
+from sfa.analysis.factory import (
+    SASTFlagFilterFactory,
+    SASTFlagFilterMode,
+    SASTFlagGroupingFactory,
+    SASTFlagGroupingMode,
+    SASTTool,
+    SASTToolRunnerFactory,
+)
+from sfa.analysis.filter import SASTFlagFilterEngine
+from sfa.analysis.sfi import SFIData
+from sfa.analysis.tool_runner import SASTToolRunner
+from sfa.analysis.workspace import SubjectWorkspace
+from sfa.utils.metrics import (
+    CHILD_SCOPE_PROCESS,
+    CHILD_SCOPE_STAGE,
+    MetricsRecorder,
+    StageMetrics,
+    metrics_file,
+    process_wide,
+)
+from sfa.utils.proc import SchedJob, run_with_multiproc, run_with_scheduler, total_memory
+
+# Subject of a batch run: subject directory, SFI file, output file, and files containing additional SAST flags
+BatchSubject = namedtuple("BatchSubject", ["subject_dir", "inspec_file", "output_file", "flag_files"])
+
+
+def _starter(runner: SASTToolRunner) -> Tuple[SASTFlags, List[StageMetrics]]:
+    # The runner may run in a worker process, so its metrics are passed back along with the flags
+    flags = runner.run()
+
+    return flags, runner.metrics.stages
+
+
+def sched_limits(app_config: AppConfig) -> Tuple[int, int]:
+    """
+    Get the max. no. of threads and max. memory (in MB) of parallel tool runs.
+
+    :param app_config:
+    :return:
+    """
+    max_threads = app_config.scheduling.max_threads
+    max_memory = app_config.scheduling.max_memory
+
+    return (max_threads if max_threads > 0 else cpu_count()), (max_memory if max_memory > 0 else total_memory())
+
+
+def run_tools(
+    flags: SASTFlags,
+    tools: List[SASTTool],
+    subject_dir: Path,
+    app_config: AppConfig,
+    parallel: bool,
+    use_cache: bool = True,
+    incremental: bool = False,
+    metrics: Optional[MetricsRecorder] = None,
+) -> SASTFlags:
+    """
+    Run SAST tools.
+
+    :param flags:
+    :param tools:
+    :param subject_dir:
+    :param app_config:
+    :param parallel:
+    :param use_cache:
+    :param incremental:
+    :param metrics: Recorder taking the metrics of the tool runs
+    :return:
+    """
+    logging.info(f"SAST tools: {', '.join([t.value for t in tools])}")
+
+    cache = ResultCache(app_config.cache) if use_cache else None
+
+    # The subject is copied once into a shared workspace; the building runners work on clones of this copy
+    with TemporaryDirectory() as workspace_dir:
+        workspace = SubjectWorkspace(subject_dir, Path(workspace_dir))
+
+        runner_factory = SASTToolRunnerFactory((subject_dir, app_config, cache, incremental, workspace))
+        tool_runners = list(runner_factory.get_instances(tools))
+
+        if parallel:
+            results = run_with_scheduler(
+                _starter,
+                [SchedJob((runner,), runner.num_threads, runner.memory, runner.priority) for runner in tool_runners],
+                *sched_limits(app_config),
+                in_process=app_config.scheduling.in_process,
+            )
+        else:
+            results = run_with_multiproc(_starter, [(runner,) for runner in tool_runners], 1)
+
+    # Runners in threads of this process share its child processes, so their child values can't be told apart
+    shared_children = parallel and app_config.scheduling.in_process and len(tool_runners) > 1
+
+    for tool_flags, stages in results:
+        flags.update(tool_flags)
+
+        if metrics is not None:
+            metrics.add(*(process_wide(stages) if shared_children else stages))
+
+    return flags
+
+
+def stream_flags(files: Iterable[Path]) -> Iterator[SASTFlagType]:
+    """
+    Stream the SAST flags of CSV or binary files (selected by file extension). CSV files are read row by row; binary
+    files are loaded (memory-mapped) one at a time.
+
+    :param files:
+    :return:
+    """
+    for file in files:
+        if file.suffix == BINARY_SUFFIX:
+            yield from SASTFlags.from_binary(file)
+        else:
+            yield from read_csv(file)
+
+
+def needs_sfi(filter_modes: List[SASTFlagFilterMode], grouping_mode: Optional[SASTFlagGroupingMode]) -> bool:
+    """
+    Check if the filters or the grouping require the SFI data.
+
+    :param filter_modes:
+    :param grouping_mode:
+    :return:
+    """
+    return grouping_mode is not None or SASTFlagFilterMode.REH in filter_modes
+
+
+def filter_flags(
+    flags: Iterable[SASTFlagType],
+    filter_modes: List[SASTFlagFilterMode],
+    sfi: Optional[SFIData],
+    app_config: AppConfig,
+    after_grouping: bool = False,
+    metrics: Optional[MetricsRecorder] = None,
+) -> Iterable[SASTFlagType]:
+    """
+    Filter a stream of SAST flags; the filters are applied lazily by a filter engine.
+
+    :param flags:
+    :param filter_modes:
+    :param sfi: SFI data (required by the reachability filter)
+    :param app_config:
+    :param after_grouping: Apply the filters for grouped flags instead of the ones for ungrouped flags
+    :param metrics: Recorder taking the time and output size of each filter once the stream is consumed
+    :return:
+    """
+    flag_filters = [
+        flag_filter
+        for flag_filter in SASTFlagFilterFactory((sfi, app_config)).get_instances(filter_modes)
+        if flag_filter.after_grouping == after_grouping
+    ]
+
+    if len(flag_filters) == 0:
+        return flags
+
+    engine = SASTFlagFilterEngine(flag_filters)
+
+    if metrics is None:
+        return engine.filter_iter(flags)
+
+    def _record() -> Iterator[SASTFlagType]:
+        yield from engine.filter_iter(flags)
+
+        # The filters run interleaved with the other stages of the stream, so only their own time is known
+        metrics.add(
+            *(
+                StageMetrics(f"filter.{stats.name}", stats.secs, n_flags=stats.n_in - stats.n_removed)
+                for stats in engine.stats
+            )
+        )
+
+    return _record()
+
+
+def group_flags(
+    flags: Iterable[SASTFlagType],
+    grouping_mode: SASTFlagGroupingMode,
+    sfi: SFIData,
+    app_config: AppConfig,
+    metrics: Optional[MetricsRecorder] = None,
+) -> SASTFlags:
+    """
+    Group a stream of SAST flags; only the flags inside code blocks are kept until the grouped flags are created.
+
+    :param flags:
+    :param grouping_mode:
+    :param sfi:
+    :param app_config:
+    :param metrics: Recorder taking the metrics of the grouping (incl. the consumption of the stream)
+    :return:
+    """
+    flag_grouping = SASTFlagGroupingFactory((sfi, app_config)).get_instance(grouping_mode)
+
+    with (metrics or MetricsRecorder()).stage(f"group.{grouping_mode.value}") as counts:
+        grouped = flag_grouping.group(flags)
+        counts["n_flags"] = len(grouped)
+
+    return grouped
+
+
+def process_flags(
+    flags: Iterable[SASTFlagType],
+    filter_modes: List[SASTFlagFilterMode],
+    grouping_mode: Optional[SASTFlagGroupingMode],
+    sfi: Optional[SFIData],
+    app_config: AppConfig,
+    metrics: Optional[MetricsRecorder] = None,
+) -> SASTFlags:
+    """
+    Pass a stream of SAST flags through the filters and the grouping, and collect the result.
+
+    :param flags:
+    :param filter_modes:
+    :param grouping_mode:
+    :param sfi: SFI data (required if 'needs_sfi')
+    :param app_config:
+    :param metrics: Recorder taking the metrics of the whole processing and of its filter and grouping stages
+    :return:
+    """
+    metrics = metrics or MetricsRecorder()
+
+    with metrics.stage("process") as counts:
+        flags = filter_flags(flags, filter_modes, sfi, app_config, metrics=metrics)
+
+        if grouping_mode:
+            flags = group_flags(flags, grouping_mode, sfi, app_config, metrics)  # type: ignore
+
+        # Filters of grouped flags (e.g. min. score) run last, on the grouped flags or on the given flags
+        flags = filter_flags(flags, filter_modes, sfi, app_config, after_grouping=True, metrics=metrics)
+
+        result = flags if isinstance(flags, SASTFlags) else SASTFlags(flags)
+        counts["n_flags"] = len(result)
+
+    return result
+
+
+def write_output(flags: SASTFlags, output_file: Path, metrics: MetricsRecorder) -> None:
+    """
+    Write the SAST flags into the output file, and the metrics into the metrics file next to it.
+
+    :param flags:
+    :param output_file:
+    :param metrics:
+    :return:
+    """
+    with metrics.stage("write") as counts:
+        flags.to_file(output_file)
+        counts["n_flags"] = len(flags)
+
+    metrics.to_json(metrics_file(output_file))
+
+
+def read_manifest(file: Path) -> List[BatchSubject]:
+    """
+    Read a batch manifest, i.e., a YAML file listing the subjects to be analyzed. Relative paths are resolved against
+    the directory of the manifest.
+
+    :param file:
+    :return:
+    """
+    manifest = yaml.safe_load(file.read_text())
+
+    def _path(path: str) -> Path:
+        return (file.parent / Path(path).expanduser()).resolve()
+
+    return [
+        BatchSubject(
+            _path(entry["subject"]),
+            _path(entry["inspection"]) if "inspection" in entry else None,
+            _path(entry["output"]),
+            [_path(flag_file) for flag_file in entry.get("flags", [])],
+        )
+        for entry in manifest["subjects"]
+    ]
+
+
+def run_batch(
+    subjects: List[BatchSubject],
+    tools: List[SASTTool],
+    filter_modes: List[SASTFlagFilterMode],
+    grouping_mode: Optional[SASTFlagGroupingMode],
+    app_config: AppConfig,
+    parallel: bool,
+    use_cache: bool = True,
+    incremental: bool = False,
+) -> None:
+    """
+    Run SAST tools, filters, and grouping on multiple subjects. The tool runs of all subjects share one worker pool;
+    as soon as the tool runs of a subject are done, its workspace is removed and its output is processed and written
+    in a separate thread, so that the pool keeps running the tools of the other subjects meanwhile.
+
+    :param subjects:
+    :param tools:
+    :param filter_modes:
+    :param grouping_mode:
+    :param app_config:
+    :param parallel:
+    :param use_cache:
+    :param incremental:
+    :return:
+    """
+    logging.info(f"Batch: {len(subjects)} subject(s), SAST tools: {', '.join([t.value for t in tools])}")
+
+    batch_start = time.monotonic()
+
+    cache = ResultCache(app_config.cache) if use_cache else None
+
+    # Flags of the tool runs per subject; the subjects' flag files are only read (streamed) when the subject is finished
+    subject_flags: List[Optional[SASTFlags]] = [SASTFlags() for _ in subjects]
+
+    # Runners in threads of this process share its child processes with each other and with the finished subjects'
+    # processing, so the child values can't be told apart
+    shared_children = app_config.scheduling.in_process
+
+    child_scope = CHILD_SCOPE_PROCESS if shared_children else CHILD_SCOPE_STAGE
+    subject_metrics: List[MetricsRecorder] = [MetricsRecorder(child_scope) for _ in subjects]
+
+    tool_times: Dict[str, List[float]] = defaultdict(list)
+    n_failed = 0
+
+    # Workspaces of the subjects' runners (removed as soon as the subject's tool runs are done)
+    workspace_dirs = [TemporaryDirectory() for _ in subjects]
+
+    def _finish(s_idx: int) -> None:
+        nonlocal n_failed
+
+        subject = subjects[s_idx]
+        tool_flags: SASTFlags = subject_flags[s_idx]  # type: ignore
+
+        try:
+            workspace_dirs[s_idx].cleanup()
+        except OSError as ex:
+            logging.warning(f"Batch: {subject.subject_dir.name}: Workspace not removed: {ex}")
+
+        try:
+            # The SFI file is parsed once and shared by the filters and the grouping
+            sfi = SFIData.from_file(subject.inspec_file) if needs_sfi(filter_modes, grouping_mode) else None
+
+            flags = process_flags(
+                chain(stream_flags(subject.flag_files), tool_flags),
+                filter_modes,
+                grouping_mode,
+                sfi,
+                app_config,
+                subject_metrics[s_idx],
+            )
+            write_output(flags, subject.output_file, subject_metrics[s_idx])
+
+            logging.info(
+                f"Batch: {subject.subject_dir.name}: {len(flags)} flag(s) written to {subject.output_file} "
+                f"after {time.monotonic() - batch_start:.1f}s"
+            )
+
+        except Exception as ex:
+            n_failed += 1
+            logging.error(f"Batch: {subject.subject_dir.name}: {ex}")
+
+        # Release the flags of finished subjects
+        subject_flags[s_idx] = None
+
+    jobs: List[SchedJob] = []
+    owners: List[int] = []
+
+    try:
+        # Subjects are finished one at a time, but concurrently with the tool runs
+        with ThreadPoolExecutor(max_workers=1) as finisher:
+            for s_idx, subject in enumerate(subjects):
+                workspace = SubjectWorkspace(subject.subject_dir, Path(workspace_dirs[s_idx].name))
+                runner_factory = SASTToolRunnerFactory((subject.subject_dir, app_config, cache, incremental, workspace))
+
+                for runner in runner_factory.get_instances(tools):
+                    jobs.append(SchedJob((runner,), runner.num_threads, runner.memory, runner.priority))
+                    owners.append(s_idx)
+
+            n_pending = Counter(owners)
+
+            # Subjects without tool runs can be finished right away
+            for s_idx in range(len(subjects)):
+                if n_pending[s_idx] == 0:
+                    finisher.submit(_finish, s_idx)
+
+            def _collect(j_idx: int, res: Any) -> None:
+                flags, stages = res
+                s_idx = owners[j_idx]
+
+                tool = type(jobs[j_idx].args[0]).__name__
+                tool_times[tool].extend(stage.wall_secs for stage in stages if stage.stage == f"{tool}.run")
+
+                subject_flags[s_idx].update(flags)  # type: ignore
+                subject_metrics[s_idx].add(*(process_wide(stages) if shared_children else stages))
+
+                n_pending[s_idx] -= 1
+                if n_pending[s_idx] == 0:
+                    finisher.submit(_finish, s_idx)
+
+            # Without --parallel, the tool runs are executed one after another
+            max_threads, max_memory = sched_limits(app_config) if parallel else (1, total_memory())
+
+            run_with_scheduler(
+                _starter, jobs, max_threads, max_memory, on_result=_collect, in_process=app_config.scheduling.in_process
+            )
+    finally:
+        # Workspaces of subjects left unfinished (e.g. on a failed tool run)
+        for workspace_dir in workspace_dirs:
+            workspace_dir.cleanup()
+
+    logging.info(
+        f"Batch: {len(subjects) - n_failed} of {len(subjects)} subject(s) done, {len(jobs)} tool run(s) "
+        f"in {time.monotonic() - batch_start:.1f}s"
+    )
+
+    for tool, times in sorted(tool_times.items()):
+        logging.info(
+            f"Batch: {tool}: {len(times)} run(s), total {sum(times):.1f}s, mean {sum(times) / len(times):.1f}s, "
+            f"max {max(times):.1f}s"
+        )
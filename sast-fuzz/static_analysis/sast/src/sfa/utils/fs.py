@@ -12,10 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import fcntl
+import hashlib
+import os
 import shutil
-from os import walk
+import time
+from os import PathLike, walk
 from pathlib import Path
-from typing import List, Optional, Set
+from tempfile import TemporaryDirectory
+from typing import List, Optional, Set, Union
+
+# Number of bytes read at once when hashing files
+HASH_CHUNK_SIZE: int = 1 << 20
+
+# Interval (in seconds) between two checks of a file awaited to be complete
+WAIT_POLL_INTERVAL: float = 0.1
+
+# Linux ioctl request for sharing the data blocks of a file (copy-on-write clone)
+FICLONE: int = 0x40049409
 
 
 def get_parent(path: Path, depth: int = 1) -> Path:
@@ -52,6 +66,110 @@ def copy_dir(src_dir: Path, dst_dir: Path, overwrite: bool = True, extend_dst: b
     return dst_dir
 
 
+def _clone(src_file: Union[str, PathLike], dst_file: Union[str, PathLike]) -> None:
+    with open(src_file, "rb") as src, open(dst_file, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def supports_clone(dir: Path) -> bool:
+    """
+    Check whether files in a directory can be cloned copy-on-write, i.e., whether the file system supports it (e.g.
+    Btrfs, XFS).
+
+    :param dir: (Existing) directory
+    :return:
+    """
+    with TemporaryDirectory(dir=dir) as temp_dir:
+        probe_file = Path(temp_dir) / "probe"
+        probe_file.write_bytes(b"probe")
+
+        try:
+            _clone(probe_file, Path(temp_dir) / "clone")
+        except OSError:
+            return False
+
+    return True
+
+
+def clone_file(src_file: Union[str, PathLike], dst_file: Union[str, PathLike]) -> Path:
+    """
+    Copy a file as copy-on-write clone if the file system supports it (e.g. Btrfs, XFS), otherwise, copy its content.
+    In both cases, the file metadata is copied as well.
+
+    :param src_file: Source file
+    :param dst_file: Destination file
+    :return: Destination file path
+    """
+    try:
+        _clone(src_file, dst_file)
+
+        shutil.copystat(src_file, dst_file)
+
+    except OSError:
+        shutil.copy2(src_file, dst_file)
+
+    return Path(dst_file)
+
+
+def supports_link(dir: Path) -> bool:
+    """
+    Check whether files in a directory can be hard-linked, i.e., whether the file system supports it.
+
+    :param dir: (Existing) directory
+    :return:
+    """
+    with TemporaryDirectory(dir=dir) as temp_dir:
+        probe_file = Path(temp_dir) / "probe"
+        probe_file.write_bytes(b"probe")
+
+        try:
+            os.link(probe_file, Path(temp_dir) / "link")
+        except OSError:
+            return False
+
+    return True
+
+
+def link_dir(src_dir: Path, dst_dir: Path, exts: List[str]) -> Path:
+    """
+    Copy the contents of a source to a (new) destination directory, hard-linking the files with the given extensions
+    instead of copying them where possible. A linked file shares its content with the source file, i.e., it must
+    only be replaced, never modified in place.
+
+    :param src_dir: Source directory
+    :param dst_dir: Destination directory
+    :param exts: Extensions of the files to be linked
+    :return: Destination directory path
+    """
+
+    def link_or_copy(src_file: str, dst_file: str) -> str:
+        if Path(src_file).suffix in exts:
+            try:
+                os.link(src_file, dst_file)
+                return dst_file
+            except OSError:
+                pass
+
+        return shutil.copy2(src_file, dst_file)
+
+    shutil.copytree(src_dir, dst_dir, symlinks=True, copy_function=link_or_copy)
+
+    return dst_dir
+
+
+def clone_dir(src_dir: Path, dst_dir: Path) -> Path:
+    """
+    Copy the contents of a source to a (new) destination directory using copy-on-write clones where possible.
+
+    :param src_dir: Source directory
+    :param dst_dir: Destination directory
+    :return: Destination directory path
+    """
+    shutil.copytree(src_dir, dst_dir, symlinks=True, copy_function=clone_file)
+
+    return dst_dir
+
+
 def find_files(root_dir: Path, exts: Optional[List[str]] = None, rec: bool = True) -> Set[Path]:
     """
     Search for files in a directory.
@@ -70,3 +188,69 @@ def find_files(root_dir: Path, exts: Optional[List[str]] = None, rec: bool = Tru
             break
 
     return files
+
+
+def hash_file(file: Path) -> str:
+    """
+    Compute the SHA-256 digest of a file's content.
+
+    :param file:
+    :return: Hex digest
+    """
+    digest = hashlib.sha256()
+
+    with file.open("rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def hash_dir(root_dir: Path) -> str:
+    """
+    Compute a SHA-256 digest over the relative paths and contents of all files in a directory (recursively).
+
+    :param root_dir:
+    :return: Hex digest
+    """
+    digest = hashlib.sha256()
+
+    for file in sorted(find_files(root_dir)):
+        # Skip dangling symlinks
+        if not file.is_file():
+            continue
+
+        digest.update(str(file.relative_to(root_dir)).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(hash_file(file).encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+def wait_for_file(file: Path, timeout: float, interval: float = WAIT_POLL_INTERVAL) -> Path:
+    """
+    Wait until a file exists and is stable, i.e., its size and modification time did not change between two checks.
+
+    :param file: File to wait for
+    :param timeout: Max. time (in seconds) to wait
+    :param interval: Time (in seconds) between two checks
+    :return: File path
+    """
+    deadline = time.monotonic() + timeout
+    last_stat = None
+
+    while True:
+        try:
+            stat = file.stat()
+            curr_stat = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            curr_stat = None
+
+        if curr_stat is not None and curr_stat == last_stat:
+            return file
+
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"File {file} is missing or still being written after {timeout} seconds.")
+
+        last_stat = curr_stat
+        time.sleep(interval)
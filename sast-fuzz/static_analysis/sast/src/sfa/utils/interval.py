@@ -0,0 +1,147 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import operator
+from bisect import bisect_right
+from typing import Any, Iterable, List, Optional, Tuple
+
+
+def _as_point(point: object) -> Optional[int]:
+    """
+    Normalize a point to a plain integer, accepting any integer type (e.g. NumPy integers).
+
+    :param point:
+    :return: Integer or None if the point is not an integer
+    """
+    try:
+        return operator.index(point)  # type: ignore
+    except TypeError:
+        return None
+
+
+class IntervalIndex:
+    """
+    Point-lookup index over (possibly overlapping) closed intervals, e.g. the line ranges of code blocks in a file.
+
+    On construction, the intervals are flattened into sorted, non-overlapping segments. Each segment stores the value of
+    the *first* interval (in insertion order) covering it, so a lookup returns the same result as a linear "first match
+    wins" scan over the intervals, but in O(log n).
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[int, int, Any]]) -> None:
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._values: List[Any] = []
+
+        # Tuple layout: (start, end, insertion rank, value); empty intervals can never match and are dropped.
+        ranked = sorted((start, end, rank, value) for rank, (start, end, value) in enumerate(intervals) if start <= end)
+
+        bounds = sorted({start for start, *_ in ranked} | {end + 1 for _, end, *_ in ranked})
+
+        active: List[Tuple[int, int, Any]] = []
+        ranks: List[int] = []
+        i = 0
+
+        for j, bound in enumerate(bounds[:-1]):
+            while i < len(ranked) and ranked[i][0] == bound:
+                _, end, rank, value = ranked[i]
+                heapq.heappush(active, (rank, end, value))
+                i += 1
+
+            # Drop intervals which ended before the current segment
+            while active and active[0][1] < bound:
+                heapq.heappop(active)
+
+            if not active:
+                continue
+
+            rank, _, value = active[0]
+            seg_end = bounds[j + 1] - 1
+
+            # Merge with the previous segment if both are adjacent and won by the same interval
+            if self._ends and self._ends[-1] == bound - 1 and ranks[-1] == rank:
+                self._ends[-1] = seg_end
+            else:
+                self._starts.append(bound)
+                self._ends.append(seg_end)
+                self._values.append(value)
+                ranks.append(rank)
+
+    def find(self, point: int) -> Optional[Any]:
+        """
+        Find the value of the first interval containing a point.
+
+        :param point:
+        :return: Value of the interval or None if no interval contains the point
+        """
+        i = bisect_right(self._starts, point) - 1
+
+        if i >= 0 and point <= self._ends[i]:
+            return self._values[i]
+
+        return None
+
+    def __contains__(self, point: object) -> bool:
+        return (index := _as_point(point)) is not None and self.find(index) is not None
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def segments(self) -> Tuple[List[int], List[int], List[Any]]:
+        """
+        Get the flattened index segments, i.e., their sorted start and end points and the values of the intervals
+        winning them.
+
+        :return:
+        """
+        return self._starts, self._ends, self._values
+
+
+class IntervalSet:
+    """
+    Membership index over (possibly overlapping) closed intervals. On construction, the intervals are merged into
+    sorted, disjoint intervals, so a lookup is a single binary search.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[int, int]]) -> None:
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+
+        for start, end in sorted(interval for interval in intervals if interval[0] <= interval[1]):
+            # Merge overlapping and adjacent intervals
+            if self._ends and start <= self._ends[-1] + 1:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    def __contains__(self, point: object) -> bool:
+        if (index := _as_point(point)) is None:
+            return False
+
+        i = bisect_right(self._starts, index) - 1
+
+        return i >= 0 and index <= self._ends[i]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def intervals(self) -> List[Tuple[int, int]]:
+        """
+        Get the merged intervals.
+
+        :return:
+        """
+        return list(zip(self._starts, self._ends))
@@ -0,0 +1,177 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import re
+from typing import Any, Iterator, Optional, TextIO, Union
+
+# Number of characters read from the underlying stream at once
+CHUNK_SIZE: int = 1 << 16
+
+# Insignificant JSON whitespace
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class JSONStream:
+    """
+    Minimal pull parser for JSON documents. Objects and arrays can be walked key by key / element by element, so only
+    the values the caller actually reads are materialized.
+    """
+
+    def __init__(self, source: Union[str, TextIO], chunk_size: int = CHUNK_SIZE) -> None:
+        self._stream: Optional[TextIO] = None if isinstance(source, str) else source
+        self._buffer = source if isinstance(source, str) else ""
+        self._pos = 0
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """
+        Drop the consumed part of the buffer and read the next chunk from the stream.
+
+        :param min_size: Minimum number of characters to read
+        :return: False if the stream is exhausted, otherwise, True
+        """
+        if self._stream is None:
+            return False
+
+        chunk = self._stream.read(max(self._chunk_size, min_size))
+
+        if not chunk:
+            self._stream = None
+            return False
+
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+
+        return True
+
+    def _consume(self, char: str) -> None:
+        """
+        Consume a structural character.
+
+        :param char:
+        :return:
+        """
+        if self.peek() != char:
+            raise ValueError(f"Invalid JSON: expected '{char}' at position {self._pos}.")
+
+        self._pos += 1
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and return the next character without consuming it.
+
+        :return: Next character or an empty string at the end of the input
+        """
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore
+
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+
+            if not self._fill():
+                return ""
+
+    def read_value(self) -> Any:
+        """
+        Read the next JSON value.
+
+        :return:
+        """
+        self.peek()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+
+                # A value touching the end of the buffer (e.g. a number) might continue in the next chunk
+                if end < len(self._buffer) or self._stream is None:
+                    self._pos = end
+                    return value
+
+            except json.JSONDecodeError:
+                if self._stream is None:
+                    raise
+
+            # Grow geometrically to keep re-decoding of large values linear
+            self._fill(len(self._buffer) - self._pos)
+
+    def skip_value(self) -> None:
+        """
+        Skip the next JSON value without materializing nested objects or arrays.
+
+        :return:
+        """
+        char = self.peek()
+
+        if char == "{":
+            for _ in self.iter_object():
+                self.skip_value()
+        elif char == "[":
+            for _ in self.iter_array():
+                self.skip_value()
+        else:
+            self.read_value()
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Iterate over the keys of the next JSON object. The caller has to consume the value belonging to each key (read
+        or skip it) before advancing the iterator.
+
+        :return:
+        """
+        self._consume("{")
+
+        if self.peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+
+            if not isinstance(key, str):
+                raise ValueError(f"Invalid JSON: expected object key at position {self._pos}.")
+
+            self._consume(":")
+
+            yield key
+
+            if self.peek() == "}":
+                self._pos += 1
+                return
+
+            self._consume(",")
+
+    def iter_array(self) -> Iterator[None]:
+        """
+        Iterate over the elements of the next JSON array. The caller has to consume each element (read or skip it)
+        before advancing the iterator.
+
+        :return:
+        """
+        self._consume("[")
+
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield None
+
+            if self.peek() == "]":
+                self._pos += 1
+                return
+
+            self._consume(",")
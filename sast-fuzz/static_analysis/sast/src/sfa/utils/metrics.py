@@ -0,0 +1,132 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import resource
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Suffix of the metrics file written next to an output file
+METRICS_SUFFIX: str = ".metrics.json"
+
+# Scopes of the child values of a stage: the child processes of the stage itself, or all child processes of this
+# process waited for during the stage (e.g. if several stages run in threads of this process at the same time)
+CHILD_SCOPE_STAGE: str = "stage"
+CHILD_SCOPE_PROCESS: str = "process"
+
+# Resource usage of a single stage. The CPU time is the one of this process (all threads); the child values cover the
+# child processes waited for during the stage (see 'child_scope'). Note: The max. RSS (in MB) is the one of the largest
+# child process waited for so far, i.e., it only grows from stage to stage. Unknown values are None.
+StageMetrics = namedtuple(
+    "StageMetrics",
+    ["stage", "wall_secs", "cpu_secs", "child_cpu_secs", "child_max_rss", "n_flags", "child_scope"],
+    defaults=[None, None, None, None, None, None],
+)
+
+
+def metrics_file(output_file: Path) -> Path:
+    """
+    Get the path of the metrics file belonging to an output file.
+
+    :param output_file:
+    :return:
+    """
+    return output_file.with_suffix(METRICS_SUFFIX)
+
+
+def process_wide(stages: Iterable[StageMetrics]) -> List[StageMetrics]:
+    """
+    Label the child values of stages as process-wide, e.g. for stages which ran in threads next to other stages.
+
+    :param stages:
+    :return:
+    """
+    return [
+        stage._replace(child_scope=CHILD_SCOPE_PROCESS) if stage.child_scope is not None else stage for stage in stages
+    ]
+
+
+class MetricsRecorder:
+    """
+    Recorder for the timing and resource usage of (possibly nested) stages.
+    """
+
+    def __init__(self, child_scope: str = CHILD_SCOPE_STAGE) -> None:
+        """
+        :param child_scope: Scope of the child values of the recorded stages; use CHILD_SCOPE_PROCESS if other threads
+            may run child processes at the same time
+        """
+        self._stages: List[StageMetrics] = []
+        self._child_scope = child_scope
+
+    @property
+    def stages(self) -> List[StageMetrics]:
+        """
+        Get the metrics of the finished stages (in the order they finished).
+
+        :return:
+        """
+        return list(self._stages)
+
+    def add(self, *stages: StageMetrics) -> None:
+        """
+        Add the metrics of stages measured elsewhere (e.g. in a worker process).
+
+        :param stages:
+        :return:
+        """
+        self._stages.extend(stages)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, Optional[int]]]:
+        """
+        Measure a stage. The yielded dictionary takes the no. of flags produced by the stage ("n_flags").
+
+        :param name:
+        :return:
+        """
+        counts: Dict[str, Optional[int]] = {"n_flags": None}
+
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        start_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+        try:
+            yield counts
+        finally:
+            children = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+            self._stages.append(
+                StageMetrics(
+                    name,
+                    time.perf_counter() - start_wall,
+                    time.process_time() - start_cpu,
+                    (children.ru_utime + children.ru_stime) - (start_children.ru_utime + start_children.ru_stime),
+                    children.ru_maxrss / 1024,  # KB on Linux
+                    counts["n_flags"],
+                    self._child_scope,
+                )
+            )
+
+    def to_json(self, file: Path) -> None:
+        """
+        Write the metrics into a JSON file.
+
+        :param file:
+        :return:
+        """
+        file.write_text(json.dumps({"stages": [stage._asdict() for stage in self._stages]}, indent=2))
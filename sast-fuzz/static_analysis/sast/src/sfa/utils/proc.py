@@ -12,24 +12,74 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import logging
 import multiprocessing as mp
 import os
+import queue
+import signal
 import subprocess  # nosec
+from collections import namedtuple
+from contextlib import ExitStack, suppress
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
+# Job run by the resource-aware scheduler: function arguments, no. of threads, memory (in MB), and priority (jobs with
+# higher priority are started first)
+SchedJob = namedtuple("SchedJob", ["args", "threads", "memory", "priority"], defaults=[1, 0, 0])
 
-def run_shell_command(
-    cmd: Union[str, List[str]], cwd: Optional[Path] = None, env: Optional[Dict[str, str]] = None
+# Max. no. of jobs the scheduler starts ahead of a waiting higher-priority job before it reserves the freed resources
+# for that job
+MAX_JOB_SKIPS: int = 3
+
+# Bytes per megabyte
+BYTES_PER_MB: int = 1024 * 1024
+
+# Size (in bytes) of the chunks read from the output streams of sub-processes
+STREAM_CHUNK_SIZE: int = 1024 * 1024
+
+
+def total_memory() -> int:
+    """
+    Get the size of the physical memory (in MB).
+
+    :return:
+    """
+    return (os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")) // BYTES_PER_MB
+
+
+async def _drain(stream: asyncio.StreamReader, sink: Callable[[bytes], Any]) -> None:
+    """
+    Pass the data of a stream chunk-wise to a sink until the stream is closed.
+
+    :param stream:
+    :param sink:
+    :return:
+    """
+    while chunk := await stream.read(STREAM_CHUNK_SIZE):
+        sink(chunk)
+
+
+async def run_shell_command_async(
+    cmd: Union[str, List[str]],
+    cwd: Optional[Path] = None,
+    env: Optional[Dict[str, str]] = None,
+    check: bool = False,
+    timeout: Optional[float] = None,
+    stdout_file: Optional[Path] = None,
 ) -> str:
     """
-    Run command as shell sub-process.
+    Run command as shell sub-process (asyncio). The output is read while the command runs; if the command times out
+    or the calling task is cancelled, the command's whole process group is killed.
 
     :param cmd:
     :param cwd:
     :param env:
-    :return:
+    :param check: If true, raise CalledProcessError if the command exits with a non-zero status
+    :param timeout: Max. run time (in seconds); TimeoutExpired is raised if exceeded
+    :param stdout_file: If given, stdout is streamed into this file instead of being returned
+    :return: Output of the command (empty if streamed into a file)
     """
     cmd_str = cmd if type(cmd) is str else " ".join(cmd)
     cmd_cwd = cwd or Path.cwd()
@@ -37,14 +87,72 @@ def run_shell_command(
 
     logging.info(f"Command: {cmd_str}")
 
-    proc_info = subprocess.run(
-        cmd_str, shell=True, cwd=cmd_cwd, env=cmd_env, capture_output=True, text=True, encoding="utf-8"
+    proc = await asyncio.create_subprocess_shell(
+        cmd_str,
+        cwd=cmd_cwd,
+        env=cmd_env,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
     )  # nosec
 
-    if proc_info.stderr:
-        logging.debug(proc_info.stderr)
+    stdout_chunks: List[bytes] = []
+    stderr_chunks: List[bytes] = []
+
+    with ExitStack() as stack:
+        sink = stack.enter_context(stdout_file.open("wb")).write if stdout_file is not None else stdout_chunks.append
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    _drain(proc.stdout, sink), _drain(proc.stderr, stderr_chunks.append), proc.wait()  # type: ignore
+                ),
+                timeout,
+            )
+        except BaseException as ex:
+            # Timeout or cancellation: the command is started in a new session, so its children are killed as well
+            with suppress(ProcessLookupError):
+                os.killpg(proc.pid, signal.SIGKILL)
+
+            await proc.wait()
+
+            if isinstance(ex, asyncio.TimeoutError):
+                raise subprocess.TimeoutExpired(cmd_str, timeout)  # type: ignore
+
+            raise
+
+    stdout = b"".join(stdout_chunks).decode("utf-8")
+    stderr = b"".join(stderr_chunks).decode("utf-8", errors="replace")
+
+    if stderr:
+        logging.debug(stderr)
+
+    if check and proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd_str, stdout, stderr)  # type: ignore
+
+    return stdout
+
+
+def run_shell_command(
+    cmd: Union[str, List[str]],
+    cwd: Optional[Path] = None,
+    env: Optional[Dict[str, str]] = None,
+    check: bool = False,
+    timeout: Optional[float] = None,
+    stdout_file: Optional[Path] = None,
+) -> str:
+    """
+    Run command as shell sub-process (see 'run_shell_command_async').
 
-    return proc_info.stdout
+    :param cmd:
+    :param cwd:
+    :param env:
+    :param check: If true, raise CalledProcessError if the command exits with a non-zero status
+    :param timeout: Max. run time (in seconds); TimeoutExpired is raised if exceeded
+    :param stdout_file: If given, stdout is streamed into this file instead of being returned
+    :return: Output of the command (empty if streamed into a file)
+    """
+    return asyncio.run(run_shell_command_async(cmd, cwd, env, check, timeout, stdout_file))
 
 
 def run_with_multiproc(func: Callable, items: List, n_jobs: int = mp.cpu_count() - 1) -> List:
@@ -67,3 +175,97 @@ def run_with_multiproc(func: Callable, items: List, n_jobs: int = mp.cpu_count()
             res = pool.map(func, items)
 
     return res
+
+
+def run_with_scheduler(
+    func: Callable,
+    jobs: List[SchedJob],
+    max_threads: int,
+    max_memory: int,
+    on_result: Optional[Callable[[int, Any], None]] = None,
+    in_process: bool = False,
+    max_skips: int = MAX_JOB_SKIPS,
+) -> List:
+    """
+    Run a function for each job with multi-processing (or multi-threading) such that the threads and memory declared by
+    the running jobs never exceed the given limits. Pending jobs are started in the order of their priority; a job that
+    does not fit into the currently free resources is passed over by smaller ones, but only 'max_skips' times: then,
+    no further jobs are started until it fits, so large jobs are not starved. Jobs exceeding a limit on their own are
+    run alone.
+
+    :param func:
+    :param jobs:
+    :param max_threads: Max. no. of threads used by all running jobs
+    :param max_memory: Max. memory (in MB) used by all running jobs
+    :param on_result: Function called (in the calling process) with the job index and result as soon as a job is done;
+        if given, the results are passed to this function instead of being collected
+    :param in_process: Run the jobs in threads of the calling process instead of worker processes, i.e., without
+        pickling the arguments; suited for jobs mostly waiting for sub-processes
+    :param max_skips: Max. no. of jobs started ahead of the first pending job
+    :return: Function results in the order of the jobs
+    """
+    results: List = [None] * len(jobs)
+
+    if len(jobs) == 0:
+        return results
+
+    demands = [(min(max(job.threads, 1), max_threads), min(max(job.memory, 0), max_memory)) for job in jobs]
+    pending = sorted(range(len(jobs)), key=lambda i: jobs[i].priority, reverse=True)
+
+    free_threads = max_threads
+    free_memory = max_memory
+
+    # No. of jobs started ahead of the first pending job
+    n_skips = 0
+
+    done: queue.Queue = queue.Queue()
+
+    pool_cls = ThreadPool if in_process else mp.Pool
+
+    with pool_cls(min(len(jobs), max_threads)) as pool:
+        n_running = 0
+
+        while len(pending) > 0 or n_running > 0:
+            for i in list(pending):
+                threads, memory = demands[i]
+
+                # Any job before this one did not fit
+                if i != pending[0] and n_skips >= max_skips:
+                    # Reserve the resources freed from now on for the first pending job
+                    break
+
+                if threads > free_threads or memory > free_memory:
+                    continue
+
+                n_skips = 0 if i == pending[0] else n_skips + 1
+
+                logging.debug(f"Scheduler: Start job {i} ({threads} thread(s), {memory} MB)")
+
+                pending.remove(i)
+                free_threads -= threads
+                free_memory -= memory
+                n_running += 1
+
+                pool.apply_async(
+                    func,
+                    jobs[i].args,
+                    callback=lambda res, i=i: done.put((i, res, None)),  # type: ignore
+                    error_callback=lambda err, i=i: done.put((i, None, err)),  # type: ignore
+                )
+
+            i, res, err = done.get()
+
+            if err is not None:
+                raise err
+
+            if on_result is None:
+                results[i] = res
+            else:
+                on_result(i, res)
+
+            threads, memory = demands[i]
+            free_threads += threads
+            free_memory += memory
+            n_running -= 1
+
+    return results
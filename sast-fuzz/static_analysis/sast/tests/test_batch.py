@@ -0,0 +1,154 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List, Optional, Tuple
+from unittest.mock import patch
+
+from sfa import AppConfig, SASTToolConfig, ScoreWeights
+from sfa.analysis import SASTFlag, SASTFlags
+from sfa.pipeline import BatchSubject, read_manifest, run_batch
+from sfa.utils.metrics import MetricsRecorder, metrics_file
+
+
+class WorkspaceWatcher:
+    """
+    Fake SAST tool runner reporting whether a directory (the workspace of an earlier subject) is removed while it runs.
+    """
+
+    def __init__(self, watched_dir: Optional[Path]) -> None:
+        self.watched_dir = watched_dir
+        self.num_threads = 1
+        self.memory = 0
+        self.priority = 0
+        self.metrics = MetricsRecorder()
+
+    def run(self) -> SASTFlags:
+        deadline = time.monotonic() + 5.0
+
+        with self.metrics.stage("WorkspaceWatcher.run"):
+            while self.watched_dir is not None and self.watched_dir.exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        removed = self.watched_dir is not None and not self.watched_dir.exists()
+
+        return SASTFlags({SASTFlag("watcher", "file.c", int(removed), "removed")})
+
+
+class WatcherFactory:
+    """
+    Fake SAST tool runner factory; the runners of all but the first subject watch the workspace of the first subject.
+    """
+
+    workspace_dirs: List[Path] = []
+
+    def __init__(self, args: Tuple) -> None:
+        self.workspace_dirs.append(args[4].root_dir)
+
+    def get_instances(self, tools: List) -> List[WorkspaceWatcher]:
+        return [WorkspaceWatcher(self.workspace_dirs[0] if len(self.workspace_dirs) > 1 else None)]
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app_config = AppConfig(ScoreWeights(0.5, 0.5), *([SASTToolConfig()] * 5))
+
+    def test_read_manifest(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            manifest_file = Path(temp_dir) / "manifest.yml"
+            manifest_file.write_text(
+                "subjects:\n"
+                "  - subject: 'subjects/a'\n"
+                "    inspection: '/data/a.json'\n"
+                "    output: 'out/a.csv'\n"
+                "  - subject: 'subjects/b'\n"
+                "    output: 'out/b.csv'\n"
+                "    flags: ['flags/b.csv']\n"
+            )
+
+            root_dir = Path(temp_dir).resolve()
+
+            expected = [
+                BatchSubject(root_dir / "subjects" / "a", Path("/data/a.json"), root_dir / "out" / "a.csv", []),
+                BatchSubject(
+                    root_dir / "subjects" / "b", None, root_dir / "out" / "b.csv", [root_dir / "flags" / "b.csv"]
+                ),
+            ]
+
+            # Act
+            actual = read_manifest(manifest_file)
+
+            # Assert
+            self.assertEqual(expected, actual)
+
+    def test_run_batch_no_tools(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            expected = SASTFlags({SASTFlag("tool", "file.c", 10, "vuln")})
+
+            flag_file = Path(temp_dir) / "flags.csv"
+            expected.to_csv(flag_file)
+
+            subjects = [
+                BatchSubject(Path(temp_dir), None, Path(temp_dir) / f"output{i}.csv", [flag_file]) for i in range(2)
+            ]
+
+            # Act
+            run_batch(subjects, [], [], None, self.app_config, parallel=False, use_cache=False)
+
+            # Assert
+            for subject in subjects:
+                self.assertEqual(expected, SASTFlags.from_csv(subject.output_file))
+
+                stages = json.loads(metrics_file(subject.output_file).read_text())["stages"]
+                self.assertEqual([("process", 1), ("write", 1)], [(s["stage"], s["n_flags"]) for s in stages])
+
+    def test_run_batch_failed_subject(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            subjects = [
+                BatchSubject(Path(temp_dir), None, Path(temp_dir) / "missing" / "output.csv", []),
+                BatchSubject(Path(temp_dir), None, Path(temp_dir) / "output.csv", []),
+            ]
+
+            # Act
+            run_batch(subjects, [], [], None, self.app_config, parallel=False, use_cache=False)
+
+            # Assert
+            self.assertFalse(subjects[0].output_file.exists())
+            self.assertTrue(subjects[1].output_file.exists())
+
+    def test_run_batch_removes_finished_workspaces(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            subjects = [BatchSubject(Path(temp_dir), None, Path(temp_dir) / f"output{i}.csv", []) for i in range(2)]
+
+            WatcherFactory.workspace_dirs.clear()
+
+            # Act
+            with patch("sfa.pipeline.SASTToolRunnerFactory", WatcherFactory):
+                run_batch(subjects, [], [], None, self.app_config, parallel=False, use_cache=False)
+
+            # Assert
+            self.assertIn(SASTFlag("watcher", "file.c", 1, "removed"), SASTFlags.from_csv(subjects[1].output_file))
+            self.assertFalse(any(workspace_dir.exists() for workspace_dir in WatcherFactory.workspace_dirs))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from benchmarks.run import BENCHMARKS, BenchResult, compare, read_results, run_benchmarks, write_results
+from benchmarks.synthetic import synthetic_flags, synthetic_sfi
+from sfa.analysis.filter import ReachabilityFilter
+from sfa.analysis.sfi import SFIData
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_synthetic_sfi(self) -> None:
+        # Act
+        sfi = SFIData(synthetic_sfi(2, 3, 4, bb_lines=2))
+
+        # Assert
+        self.assertEqual(6, len(sfi.funcs))
+        self.assertEqual(24, len(sfi.bbs))
+        self.assertEqual("file1.c:func2", sfi.find_func("file1.c", sfi.funcs["file1.c:func2"].line_start))
+        self.assertIsNone(sfi.find_func("file0.c", sfi.funcs["file0.c:func0"].line_end + 1))
+
+    def test_synthetic_flags(self) -> None:
+        # Arrange
+        sfi_data = synthetic_sfi(2, 3, 4)
+        sfi = SFIData(sfi_data)
+
+        # Act
+        flags = synthetic_flags(sfi_data, 1000, outside_rate=0.0)
+
+        # Assert
+        self.assertGreater(len(flags), 900)
+        self.assertTrue(all(sfi.find_bb(flag.file, flag.line) is not None for flag in flags))
+        self.assertEqual(flags, synthetic_flags(sfi_data, 1000, outside_rate=0.0))
+
+    def test_synthetic_flags_reachability(self) -> None:
+        # Arrange
+        sfi_data = synthetic_sfi(2, 3, 4, reachable_rate=0.0)
+
+        # Act
+        actual = ReachabilityFilter(SFIData(sfi_data)).filter(synthetic_flags(sfi_data, 100))
+
+        # Assert
+        self.assertEqual(0, len(actual))
+
+    def test_run_benchmarks(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            results_file = Path(temp_dir) / "results.json"
+
+            # Act
+            results = run_benchmarks([100, 200], flags_per_func=10, funcs_per_file=5, bbs_per_func=4, repeat=1)
+            write_results(results_file, results, {})
+
+            # Assert
+            self.assertEqual([(name, scale) for scale in [100, 200] for name in BENCHMARKS], [r[:2] for r in results])
+            self.assertEqual(results, read_results(results_file))
+
+    def test_compare(self) -> None:
+        # Arrange
+        baseline = [
+            BenchResult("bench1", 100, 100, 10, 1.0),
+            BenchResult("bench2", 100, 100, 10, 1.0),
+            BenchResult("bench3", 100, 100, 10, 0.001),  # Below the noise level
+        ]
+        results = [
+            BenchResult("bench1", 100, 100, 10, 1.2),
+            BenchResult("bench2", 100, 100, 10, 1.5),
+            BenchResult("bench2", 1000, 1000, 10, 9.0),
+            BenchResult("bench3", 100, 100, 10, 0.002),
+        ]
+
+        # Act
+        actual = compare(results, baseline, tolerance=1.25)
+
+        # Assert
+        self.assertEqual(1, len(actual))
+        self.assertTrue(actual[0].startswith("bench2 @ 100"))
+
+
+if __name__ == "__main__":
+    unittest.main()
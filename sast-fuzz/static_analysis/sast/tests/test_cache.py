@@ -0,0 +1,276 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List
+
+from sfa import CacheConfig, SASTToolConfig
+from sfa.analysis import SASTFlag, SASTFlags
+from sfa.analysis.cache import SECONDS_PER_DAY, ResultCache, cache_key
+from sfa.analysis.tool_runner import SASTToolRunner, SourceSARIFRunner
+
+
+class CountingRunner(SASTToolRunner):
+    """
+    SAST tool runner counting its analysis runs.
+    """
+
+    n_runs = 0
+
+    def _setup(self, temp_dir: Path) -> Path:
+        return temp_dir
+
+    def _analyze(self, working_dir: Path) -> Path:
+        self.n_runs += 1
+
+        report_file = working_dir / "report.csv"
+        report_file.write_text("tool,file.c,10,vuln")
+
+        return report_file
+
+    def _sanity_checks(self, report: Path) -> None:
+        pass
+
+    def _format(self, report: Path) -> SASTFlags:
+        tool, file, line, vuln = report.read_text().split(",")
+        return SASTFlags({SASTFlag(tool, file, int(line), vuln)})
+
+    def _tool_version(self) -> str:
+        return "1.0"
+
+
+class FakeSourceRunner(SourceSARIFRunner):
+    """
+    SARIF-reporting SAST tool runner flagging the first line of each analyzed source file.
+    """
+
+    analyzed: List[str] = []
+    n_version_calls = 0
+
+    def _analyze_targets(self, targets: List[Path], report_file: Path) -> None:
+        files = sorted(file for target in targets for file in (target.rglob("*.c") if target.is_dir() else [target]))
+        self.analyzed.extend(file.name for file in files)
+
+        results = [
+            {
+                "ruleId": "rule",
+                "locations": [
+                    {"physicalLocation": {"artifactLocation": {"uri": f"file://{file}"}, "region": {"startLine": 1}}}
+                ],
+            }
+            for file in files
+        ]
+
+        report = {
+            "version": "2.1.0",
+            "runs": [
+                {"tool": {"driver": {"name": "Fake", "rules": [{"id": "rule", "name": "Rule"}]}}, "results": results}
+            ],
+        }
+
+        report_file.write_text(json.dumps(report))
+
+    def _tool_version(self) -> str:
+        self.n_version_calls += 1
+        return "1.0"
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.cache_dir = Path(self.temp_dir.name) / "cache"
+
+        self.flags = SASTFlags({SASTFlag("tool1", "file1", 10, "vuln1"), SASTFlag("tool2", "file2", 20, "vuln2")})
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_cache_key(self) -> None:
+        # Act + Assert
+        self.assertEqual(cache_key("a", ["b", "c"]), cache_key("a", ["b", "c"]))
+        self.assertNotEqual(cache_key("a", ["b", "c"]), cache_key("a", ["c", "b"]))
+        self.assertNotEqual(cache_key("ab", "c"), cache_key("a", "bc"))
+
+    def test_put_get(self) -> None:
+        # Arrange
+        cache = ResultCache(CacheConfig(self.cache_dir, 1, 1))
+
+        # Act
+        cache.put("key", self.flags)
+
+        # Assert
+        self.assertEqual(self.flags, cache.get("key"))
+        self.assertIsNone(cache.get("other-key"))
+
+    def test_evict_age(self) -> None:
+        # Arrange
+        cache = ResultCache(CacheConfig(self.cache_dir, 1, 1))
+        cache.put("old", self.flags)
+
+        old_time = time.time() - 2 * SECONDS_PER_DAY
+        os.utime(self.cache_dir / "old.csv", (old_time, old_time))
+
+        # Act
+        cache.put("new", self.flags)
+
+        # Assert
+        self.assertIsNone(cache.get("old"))
+        self.assertEqual(self.flags, cache.get("new"))
+
+    def test_evict_size(self) -> None:
+        # Arrange
+        cache = ResultCache(CacheConfig(self.cache_dir, 1, 0))
+
+        # Act
+        cache.put("key", self.flags)
+
+        # Assert
+        self.assertIsNone(cache.get("key"))
+
+    def test_evict_state_age(self) -> None:
+        # Arrange
+        cache = ResultCache(CacheConfig(self.cache_dir, 1, 1))
+
+        state_file = cache.state_file("old")
+        state_file.parent.mkdir(parents=True)
+        state_file.write_text("{}")
+
+        old_time = time.time() - 2 * SECONDS_PER_DAY
+        os.utime(state_file, (old_time, old_time))
+
+        # Act
+        cache.put("new", self.flags)
+
+        # Assert
+        self.assertFalse(state_file.exists())
+
+    def test_evict_state_size(self) -> None:
+        # Arrange
+        cache = ResultCache(CacheConfig(self.cache_dir, 1, 0))
+
+        state_file = cache.state_file("key")
+        state_file.parent.mkdir(parents=True)
+        state_file.write_text("{}")
+
+        # Act
+        cache.evict()
+
+        # Assert
+        self.assertFalse(state_file.exists())
+
+    def test_runner_cache_hit(self) -> None:
+        # Arrange
+        subject_dir = Path(self.temp_dir.name) / "subject"
+        subject_dir.mkdir()
+        (subject_dir / "file.c").write_text("int main() { return 0; }")
+
+        cache = ResultCache(CacheConfig(self.cache_dir, 1, 1))
+        runner = CountingRunner(subject_dir, SASTToolConfig(), cache)
+
+        # Act
+        first = runner.run()
+        second = runner.run()
+
+        # Assert
+        self.assertEqual(first, second)
+        self.assertEqual(1, runner.n_runs)
+
+    def test_runner_metrics(self) -> None:
+        # Arrange
+        runner = CountingRunner(Path(self.temp_dir.name), SASTToolConfig(sanity_checks="always"))
+
+        # Act
+        runner.run()
+
+        # Assert
+        self.assertEqual(
+            [
+                ("CountingRunner.setup", None),
+                ("CountingRunner.analyze", None),
+                ("CountingRunner.sanity_checks", None),
+                ("CountingRunner.format", 1),
+                ("CountingRunner.run", 1),
+            ],
+            [(stage.stage, stage.n_flags) for stage in runner.metrics.stages],
+        )
+
+    def test_runner_cache_subject_changed(self) -> None:
+        # Arrange
+        subject_dir = Path(self.temp_dir.name) / "subject"
+        subject_dir.mkdir()
+        (subject_dir / "file.c").write_text("int main() { return 0; }")
+
+        cache = ResultCache(CacheConfig(self.cache_dir, 1, 1))
+        runner = CountingRunner(subject_dir, SASTToolConfig(), cache)
+
+        # Act
+        runner.run()
+        (subject_dir / "file.c").write_text("int main() { return 1; }")
+        runner.run()
+
+        # Assert
+        self.assertEqual(2, runner.n_runs)
+
+    def test_incremental_runner(self) -> None:
+        # Arrange
+        subject_dir = Path(self.temp_dir.name) / "subject"
+        (subject_dir / "src").mkdir(parents=True)
+        (subject_dir / "main.c").write_text("int main() { return 0; }")
+        (subject_dir / "src" / "util.c").write_text("int util() { return 0; }")
+
+        cache = ResultCache(CacheConfig(self.cache_dir, 1, 1))
+        runner = FakeSourceRunner(subject_dir, SASTToolConfig(), cache, incremental=True)
+        runner.analyzed = []
+
+        # Act
+        first = runner.run()
+        (subject_dir / "src" / "util.c").write_text("int util() { return 1; }")
+        second = runner.run()
+
+        # Assert
+        expected = SASTFlags({SASTFlag("fake", "main.c", 1, "Rule"), SASTFlag("fake", "src/util.c", 1, "Rule")})
+
+        self.assertEqual(expected, first)
+        self.assertEqual(expected, second)
+        self.assertEqual(["main.c", "util.c", "util.c"], runner.analyzed)
+        self.assertEqual(2, runner.n_version_calls)
+
+    def test_incremental_runner_removed_file(self) -> None:
+        # Arrange
+        subject_dir = Path(self.temp_dir.name) / "subject"
+        subject_dir.mkdir()
+        (subject_dir / "main.c").write_text("int main() { return 0; }")
+        (subject_dir / "util.c").write_text("int util() { return 0; }")
+
+        cache = ResultCache(CacheConfig(self.cache_dir, 1, 1))
+        runner = FakeSourceRunner(subject_dir, SASTToolConfig(), cache, incremental=True)
+        runner.analyzed = []
+
+        # Act
+        runner.run()
+        (subject_dir / "util.c").unlink()
+        actual = runner.run()
+
+        # Assert
+        self.assertEqual(SASTFlags({SASTFlag("fake", "main.c", 1, "Rule")}), actual)
+        self.assertEqual(["main.c", "util.c"], runner.analyzed)
+
+
+if __name__ == "__main__":
+    unittest.main()
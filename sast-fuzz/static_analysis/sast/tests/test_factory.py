@@ -0,0 +1,83 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sfa import AppConfig, SASTToolConfig, ScoreWeights
+from sfa.analysis.factory import (
+    SASTFlagFilterFactory,
+    SASTFlagFilterMode,
+    SASTFlagGroupingFactory,
+    SASTFlagGroupingMode,
+)
+from sfa.analysis.filter import PathFilter
+from sfa.analysis.grouping import FunctionGrouping
+from sfa.analysis.sfi import SFIData
+
+
+class TestSASTFlagGroupingFactory(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sfi = SFIData.from_file(Path(__file__).parent / "data" / "sfi" / "quicksort.json")
+        self.app_config = AppConfig(ScoreWeights(0.5, 0.5), *([SASTToolConfig()] * 5))
+
+    def test_get_instance(self) -> None:
+        # Arrange
+        factory = SASTFlagGroupingFactory((self.sfi, self.app_config))
+
+        # Act
+        actual = factory.get_instance(SASTFlagGroupingMode.FUNCTION)
+
+        # Assert
+        self.assertIsInstance(actual, FunctionGrouping)
+        self.assertIs(actual, factory.get_instance(SASTFlagGroupingMode.FUNCTION))
+
+    def test_get_instance_lazy(self) -> None:
+        with patch("sfa.analysis.factory.BasicBlockGrouping") as bb_grouping, patch(
+            "sfa.analysis.factory.FunctionGrouping"
+        ) as func_grouping:
+            # Arrange
+            factory = SASTFlagGroupingFactory((self.sfi, self.app_config))
+
+            # Act
+            factory.get_instance(SASTFlagGroupingMode.FUNCTION)
+
+            # Assert
+            bb_grouping.assert_not_called()
+            func_grouping.assert_called_once_with(self.sfi, self.app_config.score_weights)
+
+    def test_get_instance_no_param(self) -> None:
+        # Arrange
+        factory = SASTFlagGroupingFactory(None)
+
+        # Act + Assert
+        self.assertRaises(KeyError, factory.get_instance, SASTFlagGroupingMode.FUNCTION)
+
+
+class TestSASTFlagFilterFactory(unittest.TestCase):
+    def test_get_instance_without_sfi(self) -> None:
+        # Arrange
+        app_config = AppConfig(ScoreWeights(0.5, 0.5), *([SASTToolConfig()] * 5))
+        factory = SASTFlagFilterFactory((None, app_config))
+
+        # Act
+        actual = factory.get_instance(SASTFlagFilterMode.PTH)
+
+        # Assert
+        self.assertIsInstance(actual, PathFilter)
+
+
+if __name__ == "__main__":
+    unittest.main()
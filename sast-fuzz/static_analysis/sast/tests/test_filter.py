@@ -14,15 +14,17 @@
 
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
-from sfa.analysis import SASTFlag, SASTFlags
-from sfa.analysis.filter import ReachabilityFilter
+from sfa.analysis import GroupedSASTFlag, SASTFlag, SASTFlags
+from sfa.analysis.filter import PathFilter, ReachabilityFilter, SASTFlagFilterEngine, ScoreFilter, VulnFilter
+from sfa.analysis.sfi import SFIData
 
 
 class TestReachabilityFilter(unittest.TestCase):
     def setUp(self) -> None:
-        inspec_file = Path(__file__).parent / "data" / "sfi" / "quicksort.json"
-        self.filter = ReachabilityFilter(inspec_file)
+        sfi = SFIData.from_file(Path(__file__).parent / "data" / "sfi" / "quicksort.json")
+        self.filter = ReachabilityFilter(sfi)
 
     def test_filter_correct(self) -> None:
         # Arrange
@@ -38,6 +40,17 @@ class TestReachabilityFilter(unittest.TestCase):
         # Assert
         self.assertEqual(flags, actual)
 
+    def test_filter_subject_path(self) -> None:
+        # Arrange
+        flag1 = SASTFlag("tool1", "src/quicksort.c", 29, "-")
+        flag2 = SASTFlag("tool2", "src/quicksort.c", 39, "-")  # Outside function scope
+
+        # Act
+        actual = self.filter.filter(SASTFlags({flag1, flag2}))
+
+        # Assert
+        self.assertEqual(SASTFlags({flag1}), actual)
+
     def test_filter_scope_one_out(self) -> None:
         # Arrange
         flag1 = SASTFlag("tool1", "quicksort.c", 29, "-")
@@ -71,6 +84,19 @@ class TestReachabilityFilter(unittest.TestCase):
         # Assert
         self.assertEqual(expected, actual)
 
+    def test_filter_iter(self) -> None:
+        # Arrange
+        flag1 = SASTFlag("tool1", "quicksort.c", 29, "-")
+        flag2 = SASTFlag("tool2", "quicksort.c", 39, "-")  # Outside function scope
+        flag3 = SASTFlag("tool3", "quicksort.c", 60, "-")
+
+        # Act
+        actual = self.filter.filter_iter(iter([flag1, flag2, flag3]))
+
+        # Assert
+        self.assertEqual(flag1, next(actual))
+        self.assertEqual([flag3], list(actual))
+
     def test_filter_dc(self) -> None:
         # Arrange
         flag1 = SASTFlag("tool1", "quicksort.c", 80, "-")  # Dead code
@@ -121,5 +147,111 @@ class TestReachabilityFilter(unittest.TestCase):
         self.assertEqual(expected, actual)
 
 
+class TestPathFilter(unittest.TestCase):
+    def test_filter(self) -> None:
+        # Arrange
+        flag_filter = PathFilter(["*/third_party/*", "vendor/*"])
+
+        flag1 = SASTFlag("tool1", "src/main.c", 10, "-")
+        flag2 = SASTFlag("tool1", "src/third_party/zlib/inflate.c", 20, "-")
+        flag3 = SASTFlag("tool2", "vendor/lib.c", 30, "-")
+        flag4 = SASTFlag("tool2", "src/vendor.c", 40, "-")
+
+        # Act
+        actual = flag_filter.filter(SASTFlags({flag1, flag2, flag3, flag4}))
+
+        # Assert
+        self.assertEqual(SASTFlags({flag1, flag4}), actual)
+
+    def test_filter_no_patterns(self) -> None:
+        # Arrange
+        flags = SASTFlags({SASTFlag("tool1", "src/third_party/lib.c", 10, "-")})
+
+        # Act
+        actual = PathFilter([]).filter(flags)
+
+        # Assert
+        self.assertEqual(flags, actual)
+
+
+class TestVulnFilter(unittest.TestCase):
+    def test_filter(self) -> None:
+        # Arrange
+        flag_filter = VulnFilter({"tool1": ["CWE-12*"]}, {"tool2": ["style"]})
+
+        flag1 = SASTFlag("tool1", "main.c", 10, "CWE-120")
+        flag2 = SASTFlag("tool1", "main.c", 20, "CWE-476")  # Not allowed
+        flag3 = SASTFlag("tool2", "main.c", 30, "style")  # Denied
+        flag4 = SASTFlag("tool2", "main.c", 40, "CWE-476")
+        flag5 = SASTFlag("tool3", "main.c", 50, "style")
+
+        # Act
+        actual = flag_filter.filter(SASTFlags({flag1, flag2, flag3, flag4, flag5}))
+
+        # Assert
+        self.assertEqual(SASTFlags({flag1, flag4, flag5}), actual)
+
+
+class TestScoreFilter(unittest.TestCase):
+    def test_filter(self) -> None:
+        # Arrange
+        flag1 = GroupedSASTFlag("tool1", "main.c", 10, "vuln1", 1, 3, 1, 5, 0.5)
+        flag2 = GroupedSASTFlag("tool2", "main.c", 20, "vuln2", 1, 5, 1, 5, 0.1)  # Score too low
+        flag3 = SASTFlag("tool3", "main.c", 30, "vuln3")  # Not grouped
+
+        # Act
+        actual = ScoreFilter(0.3).filter(SASTFlags({flag1, flag2, flag3}))
+
+        # Assert
+        self.assertEqual(SASTFlags({flag1, flag3}), actual)
+
+
+class TestSASTFlagFilterEngine(unittest.TestCase):
+    def setUp(self) -> None:
+        self.flags = [SASTFlag("tool1", f"third_party/file{i % 4}.c", i, f"vuln{i % 3}") for i in range(100)]
+
+    def test_filter_like_single_filters(self) -> None:
+        # Arrange
+        path_filter = PathFilter(["*/file0.c"])
+        vuln_filter = VulnFilter({}, {"tool1": ["vuln1"]})
+
+        expected = vuln_filter.filter(path_filter.filter(SASTFlags(self.flags)))
+
+        # Act
+        actual = SASTFlagFilterEngine([vuln_filter, path_filter]).filter(SASTFlags(self.flags))
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_stats(self) -> None:
+        # Arrange
+        engine = SASTFlagFilterEngine([PathFilter(["*/file0.c"]), VulnFilter({}, {"tool1": ["vuln1"]})])
+
+        # Act
+        actual = list(engine.filter_iter(self.flags))
+
+        # Assert
+        self.assertEqual({"path", "vuln"}, {stats.name for stats in engine.stats})
+        self.assertEqual(100, max(stats.n_in for stats in engine.stats))
+        self.assertEqual(100 - len(actual), sum(stats.n_removed for stats in engine.stats))
+
+    @patch("sfa.analysis.filter.ENGINE_CHUNK_SIZE", 10)
+    def test_order_by_selectivity(self) -> None:
+        # Arrange
+        keep_all = PathFilter([])
+        remove_all = PathFilter(["*"])
+
+        engine = SASTFlagFilterEngine([keep_all, remove_all])
+
+        # Act
+        actual = list(engine.filter_iter(self.flags))
+
+        # Assert
+        self.assertEqual([], actual)
+        self.assertEqual(100, engine.stats[0].n_in)
+        self.assertEqual(100, engine.stats[0].n_removed)
+        self.assertLess(engine.stats[1].n_in, 100)
+
+
 if __name__ == "__main__":
     unittest.main()
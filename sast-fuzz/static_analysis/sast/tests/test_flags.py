@@ -17,7 +17,17 @@ import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
-from sfa.analysis import CSV_SEP, SASTFlag, GroupedSASTFlag, SASTFlags
+import numpy as np
+
+from sfa.analysis import (
+    BINARY_SUFFIX,
+    CSV_SEP,
+    GroupedSASTFlag,
+    GroupedSASTFlag_with_funcname,
+    SASTFlag,
+    SASTFlags,
+    read_csv,
+)
 
 
 class TestFlags(unittest.TestCase):
@@ -123,6 +133,80 @@ class TestFlags(unittest.TestCase):
 
             self.assertEqual(expected, actual)
 
+    def test_add_duplicate(self) -> None:
+        # Act
+        self.flags.add(SASTFlag("tool1", "file1", 10, "vuln1"))
+
+        # Assert
+        self.assertEqual(len(self.flags), 2)
+
+    def test_add_numpy_line(self) -> None:
+        # Act
+        self.flags.add(SASTFlag("tool1", "file1", np.int64(10), "vuln1"))
+
+        # Assert
+        self.assertEqual(len(self.flags), 2)
+        self.assertIn(SASTFlag("tool2", "file2", np.int64(20), "vuln2"), self.flags)
+        self.assertTrue(all(type(flag.line) is int for flag in self.flags))
+
+    def test_remove_missing(self) -> None:
+        # Act + Assert
+        self.assertRaises(KeyError, self.flags.remove, SASTFlag("tool1", "file1", 11, "vuln1"))
+        self.assertRaises(KeyError, self.flags.remove, SASTFlag("tool9", "file1", 10, "vuln1"))
+
+    def test_update_different_strings(self) -> None:
+        # Arrange
+        other = SASTFlags()
+        other.add(SASTFlag("tool3", "file3", 30, "vuln3"))
+        other.add(SASTFlag("tool1", "file2", 10, "vuln2"))
+
+        expected = {
+            SASTFlag("tool1", "file1", 10, "vuln1"),
+            SASTFlag("tool2", "file2", 20, "vuln2"),
+            SASTFlag("tool3", "file3", 30, "vuln3"),
+            SASTFlag("tool1", "file2", 10, "vuln2"),
+        }
+
+        # Act
+        self.flags.update(other)
+
+        # Assert
+        self.assertEqual(expected, set(self.flags))
+
+    def test_iter_interned_strings(self) -> None:
+        # Arrange
+        self.flags.add(SASTFlag("tool1", "".join(["fi", "le1"]), 11, "vuln1"))
+
+        # Act
+        files = [flag.file for flag in self.flags if flag.tool == "tool1"]
+
+        # Assert
+        self.assertEqual(2, len(files))
+        self.assertIs(files[0], files[1])
+
+    def test_columns(self) -> None:
+        # Act
+        cols = self.flags.columns()
+
+        # Assert
+        actual = {
+            SASTFlag(cols.tools[t], cols.files[f], line, cols.vulns[v])
+            for t, f, line, v in zip(cols.tool_codes, cols.file_codes, cols.lines, cols.vuln_codes)
+        }
+        self.assertEqual(set(self.flags), actual)
+
+    def test_mixed_flag_types(self) -> None:
+        # Arrange
+        grouped_flag = GroupedSASTFlag("tool1", "file1", 10, "vuln1", 1, 3, 1, 5, 0.267)
+
+        # Act
+        self.flags.add(grouped_flag)
+
+        # Assert
+        self.assertEqual(len(self.flags), 3)
+        self.assertIn(grouped_flag, self.flags)
+        self.assertIn(SASTFlag("tool1", "file1", 10, "vuln1"), self.flags)
+
 
 class TestFlagsGrouped(unittest.TestCase):
     def setUp(self) -> None:
@@ -228,5 +312,129 @@ class TestFlagsGrouped(unittest.TestCase):
             self.assertEqual(expected, actual)
 
 
+class TestFlagsCSV(unittest.TestCase):
+    def test_roundtrip(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            temp_file = Path(temp_dir) / "test.csv"
+            expected = SASTFlags(
+                [
+                    SASTFlag("tool1", "dir,1/file1", 10, "vuln1"),
+                    GroupedSASTFlag("tool2", 'file"2', 20, "vuln2", 1, 5, 1, 5, 0.2),
+                    GroupedSASTFlag_with_funcname("tool3", "file3", 30, "vuln3", 1, 7, 1, 5, 0.171, "func,3"),
+                ]
+            )
+
+            # Act
+            expected.to_csv(temp_file)
+            actual = SASTFlags.from_csv(temp_file)
+
+            # Assert
+            self.assertEqual(expected, actual)
+
+    def test_from_csv_multiple_files(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            temp_file1 = Path(temp_dir) / "test1.csv"
+            temp_file2 = Path(temp_dir) / "test2.csv"
+
+            SASTFlags([SASTFlag("tool1", "file1", 10, "vuln1")]).to_csv(temp_file1)
+            SASTFlags([SASTFlag("tool1", "file1", 10, "vuln1"), SASTFlag("tool2", "file2", 20, "vuln2")]).to_csv(
+                temp_file2
+            )
+
+            # Act
+            actual = SASTFlags.from_csv(temp_file1, temp_file2)
+
+            # Assert
+            expected = SASTFlags([SASTFlag("tool1", "file1", 10, "vuln1"), SASTFlag("tool2", "file2", 20, "vuln2")])
+
+            self.assertEqual(expected, actual)
+
+    def test_read_csv_skips_malformed_rows(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            temp_file = Path(temp_dir) / "test.csv"
+
+            with temp_file.open("w") as file:
+                file.writelines(
+                    [
+                        CSV_SEP.join(["tool1", "file1", "10", "vuln1"]) + os.linesep,
+                        os.linesep,
+                        CSV_SEP.join(["tool2", "file2", "20"]) + os.linesep,
+                    ]
+                )
+
+            # Act
+            actual = list(read_csv(temp_file))
+
+            # Assert
+            self.assertEqual([SASTFlag("tool1", "file1", 10, "vuln1")], actual)
+
+
+class TestFlagsBinary(unittest.TestCase):
+    def setUp(self) -> None:
+        self.flags = SASTFlags(
+            [
+                SASTFlag("tool1", "file1", 10, "vuln1"),
+                SASTFlag("tool2", "file1", 20, "vuln2"),
+                SASTFlag("tool2", "file2", -1, "vuln2"),
+                GroupedSASTFlag("tool2", "file2", 20, "vuln2", 1, 5, 1, 5, 0.2),
+                GroupedSASTFlag_with_funcname("tool3", "file3", 30, "vuln3", 1, 7, 1, 5, 0.171, "func3"),
+            ]
+        )
+
+    def test_roundtrip(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            temp_file = Path(temp_dir) / f"test{BINARY_SUFFIX}"
+
+            # Act
+            self.flags.to_binary(temp_file)
+            actual = SASTFlags.from_binary(temp_file)
+
+            # Assert
+            self.assertEqual(self.flags, actual)
+
+    def test_roundtrip_empty(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            temp_file = Path(temp_dir) / f"test{BINARY_SUFFIX}"
+
+            # Act
+            SASTFlags().to_binary(temp_file)
+            actual = SASTFlags.from_binary(temp_file)
+
+            # Assert
+            self.assertEqual(SASTFlags(), actual)
+
+    def test_from_files_mixed_formats(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            bin_file = Path(temp_dir) / f"test{BINARY_SUFFIX}"
+            csv_file = Path(temp_dir) / "test.csv"
+
+            SASTFlags([SASTFlag("tool1", "file1", 10, "vuln1")]).to_file(bin_file)
+            SASTFlags([SASTFlag("tool4", "file1", 10, "vuln4")]).to_file(csv_file)
+
+            # Act
+            actual = SASTFlags.from_files(csv_file, bin_file)
+
+            # Assert
+            expected = SASTFlags([SASTFlag("tool1", "file1", 10, "vuln1"), SASTFlag("tool4", "file1", 10, "vuln4")])
+
+            self.assertEqual(expected, actual)
+
+    def test_from_binary_invalid_file(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            temp_file = Path(temp_dir) / f"test{BINARY_SUFFIX}"
+            self.flags.to_csv(temp_file)
+
+            # Act & Assert
+            with self.assertRaises(ValueError):
+                SASTFlags.from_binary(temp_file)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -14,11 +14,20 @@
 
 import unittest
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from typing import Set
 
-from sfa.utils.fs import copy_dir, find_files
-
-from tempfile import TemporaryDirectory
+from sfa.utils.fs import (
+    clone_dir,
+    clone_file,
+    copy_dir,
+    find_files,
+    hash_dir,
+    link_dir,
+    supports_clone,
+    supports_link,
+    wait_for_file,
+)
 
 
 class TestFSUtils(unittest.TestCase):
@@ -82,6 +91,87 @@ class TestFSUtils(unittest.TestCase):
             self.assertTrue(actual.exists())
             self.assertTrue((actual / temp_file.name).exists())
 
+    def test_clone_dir(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            src_dir = Path(temp_dir) / "src"
+            dst_dir = Path(temp_dir) / "dst"
+
+            src_dir.mkdir()
+
+            temp_file = src_dir / "build.sh"
+            temp_file.write_text("#!/bin/sh")
+            temp_file.chmod(0o755)
+
+            # Act
+            actual = clone_dir(src_dir, dst_dir)
+
+            # Assert
+            self.assertEqual(dst_dir, actual)
+            self.assertEqual(hash_dir(src_dir), hash_dir(actual))
+            self.assertEqual(temp_file.stat().st_mode, (actual / temp_file.name).stat().st_mode)
+
+    def test_clone_dir_independent(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            dst_dir = clone_dir(self.root_dir, Path(temp_dir) / "dst")
+
+            expected = hash_dir(self.root_dir)
+
+            # Act
+            (dst_dir / "test.json").write_text("{}")
+
+            # Assert
+            self.assertEqual(expected, hash_dir(self.root_dir))
+
+    def test_clone_file_str_paths(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            src_file = Path(temp_dir) / "src.txt"
+            src_file.write_text("content")
+
+            # Act
+            actual = clone_file(str(src_file), str(Path(temp_dir) / "dst.txt"))
+
+            # Assert
+            self.assertEqual(Path(temp_dir) / "dst.txt", actual)
+            self.assertEqual("content", actual.read_text())
+
+    def test_supports_clone(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Act
+            actual = supports_clone(Path(temp_dir))
+
+            # Assert
+            self.assertIsInstance(actual, bool)
+            self.assertEqual([], list(Path(temp_dir).iterdir()))
+
+    def test_link_dir(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            src_dir = Path(temp_dir) / "src"
+            src_dir.mkdir()
+
+            (src_dir / "main.c").write_text("int main() { return 0; }")
+            (src_dir / "Makefile").write_text("all:")
+
+            # Act
+            actual = link_dir(src_dir, Path(temp_dir) / "dst", [".c"])
+
+            # Assert
+            self.assertEqual(hash_dir(src_dir), hash_dir(actual))
+            self.assertEqual((src_dir / "main.c").stat().st_ino, (actual / "main.c").stat().st_ino)
+            self.assertNotEqual((src_dir / "Makefile").stat().st_ino, (actual / "Makefile").stat().st_ino)
+
+    def test_supports_link(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Act
+            actual = supports_link(Path(temp_dir))
+
+            # Assert
+            self.assertTrue(actual)
+            self.assertEqual([], list(Path(temp_dir).iterdir()))
+
     def test_find_files_no_rec_no_exts(self) -> None:
         # Arrange
         expected = {self.root_dir / "test.json"}
@@ -142,6 +232,54 @@ class TestFSUtils(unittest.TestCase):
         # Assert
         self.assertEqual(expected, actual)
 
+    def test_hash_dir(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            dst_dir = copy_dir(self.root_dir, Path(temp_dir), extend_dst=True)
+
+            # Act + Assert
+            self.assertEqual(hash_dir(self.root_dir), hash_dir(dst_dir))
+
+    def test_hash_dir_content_changed(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            dst_dir = copy_dir(self.root_dir, Path(temp_dir), extend_dst=True)
+
+            expected = hash_dir(dst_dir)
+
+            # Act
+            (dst_dir / "test.json").write_text("{}")
+
+            # Assert
+            self.assertNotEqual(expected, hash_dir(dst_dir))
+
+    def test_hash_dir_file_renamed(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            dst_dir = copy_dir(self.root_dir, Path(temp_dir), extend_dst=True)
+
+            expected = hash_dir(dst_dir)
+
+            # Act
+            (dst_dir / "test.json").rename(dst_dir / "renamed.json")
+
+            # Assert
+            self.assertNotEqual(expected, hash_dir(dst_dir))
+
+    def test_wait_for_file(self) -> None:
+        # Arrange
+        expected = self.root_dir / "test.json"
+
+        # Act
+        actual = wait_for_file(expected, timeout=1.0, interval=0.01)
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_wait_for_file_timeout(self) -> None:
+        # Act + Assert
+        self.assertRaises(TimeoutError, wait_for_file, self.root_dir / "missing.json", timeout=0.05, interval=0.01)
+
 
 if __name__ == "__main__":
     unittest.main()
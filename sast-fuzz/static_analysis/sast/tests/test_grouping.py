@@ -15,10 +15,14 @@
 import unittest
 from pathlib import Path
 from typing import Set, Tuple
+from unittest.mock import patch
+
+import numpy as np
 
 from sfa import ScoreWeights
-from sfa.analysis import GroupedSASTFlag, SASTFlag, SASTFlags
-from sfa.analysis.grouping import CONCAT_CHAR, BasicBlockGrouping, BasicBlockV2Grouping, FunctionGrouping
+from sfa.analysis import GroupedSASTFlag, GroupedSASTFlag_with_funcname, SASTFlag, SASTFlags
+from sfa.analysis.grouping import CONCAT_CHAR, BasicBlockGrouping, BasicBlockV2Grouping, FunctionGrouping, unique_rows
+from sfa.analysis.sfi import SFIData
 
 
 def unfold(flags: SASTFlags) -> Set[Tuple]:
@@ -42,14 +46,14 @@ def unfold(flags: SASTFlags) -> Set[Tuple]:
             flag.score,
         )
         for flag in flags
-        if isinstance(flag, GroupedSASTFlag)
+        if isinstance(flag, (GroupedSASTFlag, GroupedSASTFlag_with_funcname))
     }
 
 
 class TestBasicBlockGrouping(unittest.TestCase):
     def setUp(self) -> None:
-        inspec_file = Path(__file__).parent / "data" / "sfi" / "quicksort.json"
-        self.grouping = BasicBlockGrouping(inspec_file, ScoreWeights(0.5, 0.5))
+        sfi = SFIData.from_file(Path(__file__).parent / "data" / "sfi" / "quicksort.json")
+        self.grouping = BasicBlockGrouping(sfi, ScoreWeights(0.5, 0.5))
 
     def test_group_same_bb(self) -> None:
         # Arrange
@@ -59,7 +63,9 @@ class TestBasicBlockGrouping(unittest.TestCase):
         flags.add(SASTFlag("tool3", "quicksort.c", 73, "vuln3"))  # Block 16
 
         expected = SASTFlags()
-        expected.add(GroupedSASTFlag("tool1-tool2-tool3", "quicksort.c", 65, "vuln1:67-vuln2:70-vuln3:73", 3, 8, 3, 3, 0.688))
+        expected.add(
+            GroupedSASTFlag("tool1-tool2-tool3", "quicksort.c", 65, "vuln1:67-vuln2:70-vuln3:73", 3, 8, 3, 3, 0.688)
+        )
 
         # Act
         actual = self.grouping.group(flags)
@@ -187,11 +193,27 @@ class TestBasicBlockGrouping(unittest.TestCase):
         # Assert
         self.assertEqual(unfold(expected), unfold(actual))
 
+    def test_group_overlapping_bbs(self) -> None:
+        # Arrange
+        flags = SASTFlags()
+        flags.add(SASTFlag("tool1", "quicksort.c", 57, "vuln1"))  # Blocks 11, 12 and 14 -> first listed: block 11
+        flags.add(SASTFlag("tool2", "quicksort.c", 22, "vuln2"))  # Blocks 1, 2 and 6 -> first listed: block 1
+
+        expected = SASTFlags()
+        expected.add(GroupedSASTFlag("tool1", "quicksort.c", 56, "vuln1:57", 1, 2, 1, 2, 0.5))
+        expected.add(GroupedSASTFlag("tool2", "quicksort.c", 13, "vuln2:22", 1, 4, 1, 2, 0.375))
+
+        # Act
+        actual = self.grouping.group(flags)
+
+        # Assert
+        self.assertEqual(unfold(expected), unfold(actual))
+
 
 class TestBasicBlockV2Grouping(unittest.TestCase):
     def setUp(self) -> None:
-        inspec_file = Path(__file__).parent / "data" / "sfi" / "quicksort.json"
-        self.grouping = BasicBlockV2Grouping(inspec_file, ScoreWeights(0.5, 0.5))
+        sfi = SFIData.from_file(Path(__file__).parent / "data" / "sfi" / "quicksort.json")
+        self.grouping = BasicBlockV2Grouping(sfi, ScoreWeights(0.5, 0.5))
 
     def test_group_same_func(self) -> None:
         # Arrange
@@ -334,8 +356,8 @@ class TestBasicBlockV2Grouping(unittest.TestCase):
 
 class TestFunctionGrouping(unittest.TestCase):
     def setUp(self) -> None:
-        inspec_file = Path(__file__).parent / "data" / "sfi" / "quicksort.json"
-        self.grouping = FunctionGrouping(inspec_file, ScoreWeights(0.5, 0.5))
+        sfi = SFIData.from_file(Path(__file__).parent / "data" / "sfi" / "quicksort.json")
+        self.grouping = FunctionGrouping(sfi, ScoreWeights(0.5, 0.5))
 
     def test_group_same_func(self) -> None:
         # Arrange
@@ -345,7 +367,11 @@ class TestFunctionGrouping(unittest.TestCase):
         flags.add(SASTFlag("tool3", "quicksort.c", 60, "vuln3"))  # Function "printArray"
 
         expected = SASTFlags()
-        expected.add(GroupedSASTFlag("tool1-tool2-tool3", "quicksort.c", (56 + 1), "vuln1:58-vuln2:59-vuln3:60", 3, 6, 3, 3, 0.75))
+        expected.add(
+            GroupedSASTFlag(
+                "tool1-tool2-tool3", "quicksort.c", (56 + 1), "vuln1:58-vuln2:59-vuln3:60", 3, 6, 3, 3, 0.75
+            )
+        )
 
         # Act
         actual = self.grouping.group(flags)
@@ -474,5 +500,73 @@ class TestFunctionGrouping(unittest.TestCase):
         self.assertEqual(unfold(expected), unfold(actual))
 
 
+class TestGroupingWeights(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sfi = SFIData.from_file(Path(__file__).parent / "data" / "sfi" / "quicksort.json")
+
+        self.flags = SASTFlags()
+        self.flags.add(SASTFlag("tool1", "quicksort.c", 67, "vuln1"))  # Block 16
+        self.flags.add(SASTFlag("tool2", "quicksort.c", 19, "vuln2"))  # Block 1
+        self.flags.add(SASTFlag("tool3", "quicksort.c", 73, "vuln3"))  # Block 16
+
+    def test_emit_other_weights(self) -> None:
+        for grouping_cls in [BasicBlockGrouping, BasicBlockV2Grouping, FunctionGrouping]:
+            # Arrange
+            grouping = grouping_cls(self.sfi, ScoreWeights(0.5, 0.5))
+            stats = grouping.block_stats(self.flags)
+
+            for weights in [ScoreWeights(0.0, 1.0), ScoreWeights(0.3, 0.7), ScoreWeights(1.0, 0.0)]:
+                expected = grouping_cls(self.sfi, weights).group(self.flags)
+
+                # Act
+                actual = grouping.emit(stats, weights)
+
+                # Assert
+                self.assertEqual(unfold(expected), unfold(actual))
+
+    def test_group_empty(self) -> None:
+        for grouping_cls in [BasicBlockGrouping, BasicBlockV2Grouping, FunctionGrouping]:
+            # Arrange
+            grouping = grouping_cls(self.sfi, ScoreWeights(0.5, 0.5))
+
+            # Act
+            actual = grouping.group(SASTFlags())
+            actual_stream = grouping.group(iter([]))
+
+            # Assert
+            self.assertEqual(0, len(actual))
+            self.assertEqual(0, len(actual_stream))
+
+    @patch("sfa.analysis.grouping.CHUNK_SIZE", 2)
+    def test_group_stream(self) -> None:
+        for grouping_cls in [BasicBlockGrouping, BasicBlockV2Grouping, FunctionGrouping]:
+            # Arrange
+            grouping = grouping_cls(self.sfi, ScoreWeights(0.5, 0.5))
+
+            # Including a flag outside of all blocks
+            flags = SASTFlags([*self.flags, SASTFlag("tool4", "other.c", 10, "vuln4")])
+            expected = grouping.group(flags)
+
+            # Act
+            actual = grouping.group(iter([*flags, *flags]))  # Duplicates, e.g. from multiple flag files
+
+            # Assert
+            self.assertEqual(unfold(expected), unfold(actual))
+
+
+class TestUniqueRows(unittest.TestCase):
+    def test_unique_rows(self) -> None:
+        # Arrange
+        col1 = np.array([2, 1, 2, 1, 2])
+        col2 = np.array([5, 3, 5, 4, 1])
+
+        # Act
+        actual = unique_rows(col1, col2)
+
+        # Assert
+        self.assertEqual([1, 1, 2, 2], actual[0].tolist())
+        self.assertEqual([3, 4, 1, 5], actual[1].tolist())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,134 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import unittest
+
+import numpy as np
+
+from sfa.utils.interval import IntervalIndex, IntervalSet
+
+
+class TestIntervalIndex(unittest.TestCase):
+    def test_find_disjoint(self) -> None:
+        # Arrange
+        index = IntervalIndex([(1, 5, "a"), (10, 12, "b"), (6, 8, "c")])
+
+        # Act + Assert
+        self.assertEqual("a", index.find(1))
+        self.assertEqual("a", index.find(5))
+        self.assertEqual("c", index.find(7))
+        self.assertEqual("b", index.find(12))
+
+        self.assertIsNone(index.find(0))
+        self.assertIsNone(index.find(9))
+        self.assertIsNone(index.find(13))
+
+    def test_find_first_match_wins(self) -> None:
+        # Arrange
+        index = IntervalIndex([(5, 10, "outer"), (6, 7, "inner"), (9, 15, "tail"), (1, 20, "all")])
+
+        # Act + Assert
+        self.assertEqual("all", index.find(1))
+        self.assertEqual("outer", index.find(6))
+        self.assertEqual("outer", index.find(10))
+        self.assertEqual("tail", index.find(11))
+        self.assertEqual("all", index.find(16))
+
+    def test_find_empty(self) -> None:
+        # Arrange
+        index = IntervalIndex([(5, 4, "invalid")])
+
+        # Act + Assert
+        self.assertEqual(0, len(index))
+        self.assertNotIn(4, index)
+        self.assertNotIn(5, index)
+
+    def test_contains_numpy_int(self) -> None:
+        # Arrange
+        index = IntervalIndex([(1, 5, "a")])
+
+        # Act + Assert
+        self.assertIn(np.int64(3), index)
+        self.assertNotIn(np.int32(6), index)
+        self.assertNotIn(3.0, index)
+
+    def test_find_like_linear_scan(self) -> None:
+        # Arrange
+        rng = random.Random(42)  # nosec
+
+        intervals = []
+        for i in range(200):
+            start = rng.randint(0, 500)
+            intervals.append((start, start + rng.randint(-1, 30), i))
+
+        index = IntervalIndex(intervals)
+
+        def linear_scan(point: int) -> object:
+            return next((value for start, end, value in intervals if start <= point <= end), None)
+
+        # Act + Assert
+        for point in range(-5, 540):
+            self.assertEqual(linear_scan(point), index.find(point))
+
+    def test_segments(self) -> None:
+        # Arrange
+        index = IntervalIndex([(5, 10, "outer"), (6, 7, "inner"), (12, 15, "tail")])
+
+        # Act
+        actual = index.segments()
+
+        # Assert
+        self.assertEqual(([5, 12], [10, 15], ["outer", "tail"]), actual)
+
+
+class TestIntervalSet(unittest.TestCase):
+    def test_merge(self) -> None:
+        # Arrange
+        intervals = [(10, 12), (1, 5), (4, 8), (9, 9), (20, 25), (21, 22), (30, 29)]
+
+        # Act
+        actual = IntervalSet(intervals)
+
+        # Assert
+        self.assertEqual([(1, 12), (20, 25)], actual.intervals())
+
+    def test_contains_numpy_int(self) -> None:
+        # Arrange
+        interval_set = IntervalSet([(1, 5), (10, 12)])
+
+        # Act + Assert
+        self.assertIn(np.int64(11), interval_set)
+        self.assertIn(np.array([1, 5])[1], interval_set)
+        self.assertNotIn(np.int64(7), interval_set)
+        self.assertNotIn("3", interval_set)
+
+    def test_contains_like_linear_scan(self) -> None:
+        # Arrange
+        rng = random.Random(42)  # nosec
+
+        intervals = []
+        for _ in range(200):
+            start = rng.randint(0, 500)
+            intervals.append((start, start + rng.randint(-1, 30)))
+
+        interval_set = IntervalSet(intervals)
+
+        # Act + Assert
+        for point in range(-5, 540):
+            self.assertEqual(any(start <= point <= end for start, end in intervals), point in interval_set)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import unittest
+from typing import Any
+
+from sfa.utils.json_stream import JSONStream
+
+DOCUMENT = {
+    "version": "1.0",
+    "items": [{"id": 1, "tags": ["a", "b"]}, {"id": 12345678, "tags": []}],
+    "empty": {},
+    "meta": {"nested": [[1, 2], {"x": None}], "flag": True},
+}
+
+
+def walk(doc: JSONStream) -> Any:
+    """
+    Rebuild a JSON value by walking it with the pull parser.
+
+    :param doc:
+    :return:
+    """
+    char = doc.peek()
+
+    if char == "{":
+        return {key: walk(doc) for key in doc.iter_object()}
+    if char == "[":
+        return [walk(doc) for _ in doc.iter_array()]
+
+    return doc.read_value()
+
+
+class TestJSONStream(unittest.TestCase):
+    def test_walk_string(self) -> None:
+        # Arrange
+        doc = JSONStream(json.dumps(DOCUMENT, indent=2))
+
+        # Act
+        actual = walk(doc)
+
+        # Assert
+        self.assertEqual(DOCUMENT, actual)
+        self.assertEqual("", doc.peek())
+
+    def test_walk_stream_small_chunks(self) -> None:
+        # Arrange
+        doc = JSONStream(io.StringIO(json.dumps(DOCUMENT, indent=2)), chunk_size=3)
+
+        # Act
+        actual = walk(doc)
+
+        # Assert
+        self.assertEqual(DOCUMENT, actual)
+
+    def test_skip_value(self) -> None:
+        # Arrange
+        doc = JSONStream(io.StringIO(json.dumps(DOCUMENT)), chunk_size=5)
+
+        # Act
+        actual = {}
+        for key in doc.iter_object():
+            if key == "version":
+                actual[key] = doc.read_value()
+            else:
+                doc.skip_value()
+
+        # Assert
+        self.assertEqual({"version": "1.0"}, actual)
+
+    def test_invalid(self) -> None:
+        # Arrange
+        doc = JSONStream(io.StringIO('{"a": 1 "b": 2}'), chunk_size=4)
+
+        # Act + Assert
+        with self.assertRaises(ValueError):
+            walk(doc)
+
+    def test_truncated(self) -> None:
+        # Arrange
+        doc = JSONStream(io.StringIO('{"a": [1, 2'), chunk_size=4)
+
+        # Act + Assert
+        with self.assertRaises(ValueError):
+            walk(doc)
+
+
+if __name__ == "__main__":
+    unittest.main()
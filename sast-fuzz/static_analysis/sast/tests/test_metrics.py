@@ -0,0 +1,123 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sfa.utils.metrics import (
+    CHILD_SCOPE_PROCESS,
+    CHILD_SCOPE_STAGE,
+    METRICS_SUFFIX,
+    MetricsRecorder,
+    StageMetrics,
+    metrics_file,
+    process_wide,
+)
+from sfa.utils.proc import run_shell_command
+
+
+class TestMetrics(unittest.TestCase):
+    def test_stage(self) -> None:
+        # Arrange
+        metrics = MetricsRecorder()
+
+        # Act
+        with metrics.stage("outer"):
+            with metrics.stage("inner") as counts:
+                run_shell_command("python3 -c 'sum(range(10 ** 6))'")
+                counts["n_flags"] = 42
+
+        # Assert
+        inner, outer = metrics.stages
+
+        self.assertEqual(("inner", 42), (inner.stage, inner.n_flags))
+        self.assertEqual(("outer", None), (outer.stage, outer.n_flags))
+        self.assertGreater(inner.child_cpu_secs, 0.0)
+        self.assertGreater(inner.child_max_rss, 0.0)
+        self.assertGreaterEqual(outer.wall_secs, inner.wall_secs)
+        self.assertEqual(CHILD_SCOPE_STAGE, inner.child_scope)
+
+    def test_stage_failed(self) -> None:
+        # Arrange
+        metrics = MetricsRecorder()
+
+        # Act
+        with self.assertRaises(ValueError):
+            with metrics.stage("failing"):
+                raise ValueError()
+
+        # Assert
+        self.assertEqual(["failing"], [stage.stage for stage in metrics.stages])
+
+    def test_process_wide(self) -> None:
+        # Arrange
+        metrics = MetricsRecorder()
+
+        with metrics.stage("tool"):
+            pass
+
+        metrics.add(StageMetrics("filter.reachability", 0.5, n_flags=3))
+
+        # Act
+        actual = process_wide(metrics.stages)
+
+        # Assert
+        self.assertEqual([CHILD_SCOPE_PROCESS, None], [stage.child_scope for stage in actual])
+
+    def test_stage_process_scope(self) -> None:
+        # Arrange
+        metrics = MetricsRecorder(CHILD_SCOPE_PROCESS)
+
+        # Act
+        with metrics.stage("tool"):
+            pass
+
+        # Assert
+        self.assertEqual([CHILD_SCOPE_PROCESS], [stage.child_scope for stage in metrics.stages])
+
+    def test_to_json(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            metrics = MetricsRecorder()
+            metrics.add(StageMetrics("filter.reachability", 0.5, n_flags=3))
+
+            file = metrics_file(Path(temp_dir) / "output.csv")
+
+            # Act
+            metrics.to_json(file)
+
+            # Assert
+            self.assertEqual(Path(temp_dir) / f"output{METRICS_SUFFIX}", file)
+            self.assertEqual(
+                {
+                    "stages": [
+                        {
+                            "stage": "filter.reachability",
+                            "wall_secs": 0.5,
+                            "cpu_secs": None,
+                            "child_cpu_secs": None,
+                            "child_max_rss": None,
+                            "n_flags": 3,
+                            "child_scope": None,
+                        }
+                    ]
+                },
+                json.loads(file.read_text()),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
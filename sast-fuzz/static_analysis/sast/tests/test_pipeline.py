@@ -0,0 +1,127 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Iterable, Set, Tuple
+
+from sfa import AppConfig, FilterConfig, SASTToolConfig, ScoreWeights
+from sfa.analysis import BINARY_SUFFIX, SASTFlag, SASTFlags
+from sfa.analysis.factory import SASTFlagFilterMode, SASTFlagGroupingMode
+from sfa.analysis.grouping import CONCAT_CHAR
+from sfa.analysis.sfi import SFIData
+from sfa.pipeline import process_flags, stream_flags
+from sfa.utils.metrics import MetricsRecorder
+
+
+def unfold(flags: Iterable[Tuple]) -> Set[Tuple]:
+    """
+    Unfold SAST flags into a set of tuples, with the (concatenated) tools and vulns. converted into sets.
+
+    :param flags:
+    :return:
+    """
+    return {
+        (frozenset(flag[0].split(CONCAT_CHAR)), *flag[1:3], frozenset(flag[3].split(CONCAT_CHAR)), *flag[4:])
+        for flag in flags
+    }
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app_config = AppConfig(ScoreWeights(0.5, 0.5), *([SASTToolConfig()] * 5))
+        self.sfi = SFIData.from_file(Path(__file__).parent / "data" / "sfi" / "quicksort.json")
+
+        self.flags = SASTFlags()
+        self.flags.add(SASTFlag("tool1", "quicksort.c", 29, "vuln1"))
+        self.flags.add(SASTFlag("tool2", "quicksort.c", 39, "vuln2"))  # Outside function scope
+        self.flags.add(SASTFlag("tool3", "quicksort.c", 60, "vuln3"))
+        self.flags.add(SASTFlag("tool4", "quicksort.c", 76, "vuln4"))
+
+    def test_stream_flags(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            csv_file = Path(temp_dir) / "flags.csv"
+            bin_file = Path(temp_dir) / f"flags{BINARY_SUFFIX}"
+
+            self.flags.to_file(csv_file)
+            self.flags.to_file(bin_file)
+
+            # Act
+            actual = list(stream_flags([csv_file, bin_file]))
+
+            # Assert
+            self.assertEqual(2 * len(self.flags), len(actual))
+            self.assertEqual(self.flags, SASTFlags(actual))
+
+    def test_process_flags_no_stages(self) -> None:
+        # Act
+        actual = process_flags(iter([*self.flags, *self.flags]), [], None, None, self.app_config)
+
+        # Assert
+        self.assertEqual(self.flags, actual)
+
+    def test_process_flags_stream(self) -> None:
+        for grouping_mode in [None, *SASTFlagGroupingMode]:
+            # Arrange
+            expected = process_flags(self.flags, [SASTFlagFilterMode.REH], grouping_mode, self.sfi, self.app_config)
+
+            # Act
+            actual = process_flags(
+                iter([*self.flags, *self.flags]), [SASTFlagFilterMode.REH], grouping_mode, self.sfi, self.app_config
+            )
+
+            # Assert
+            self.assertEqual(3 if grouping_mode is None else len(expected), len(actual))
+            self.assertEqual(unfold(expected), unfold(actual))
+
+    def test_process_flags_min_score(self) -> None:
+        # Arrange
+        app_config = AppConfig(ScoreWeights(0.5, 0.5), *([SASTToolConfig()] * 5), filters=FilterConfig(min_score=0.18))
+
+        grouped = process_flags(self.flags, [], SASTFlagGroupingMode.FUNCTION, self.sfi, app_config)
+
+        # Act
+        actual = process_flags(
+            self.flags, [SASTFlagFilterMode.SCR], SASTFlagGroupingMode.FUNCTION, self.sfi, app_config
+        )
+
+        # Assert
+        self.assertEqual({flag for flag in grouped if flag.score >= 0.18}, set(actual))
+        self.assertEqual(2, len(actual))
+
+    def test_process_flags_metrics(self) -> None:
+        # Arrange
+        metrics = MetricsRecorder()
+
+        # Act
+        actual = process_flags(
+            iter(self.flags),
+            [SASTFlagFilterMode.REH],
+            SASTFlagGroupingMode.FUNCTION,
+            self.sfi,
+            self.app_config,
+            metrics,
+        )
+
+        # Assert
+        self.assertEqual(
+            [("filter.reachability", 3), ("group.function", len(actual)), ("process", len(actual))],
+            [(stage.stage, stage.n_flags) for stage in metrics.stages],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
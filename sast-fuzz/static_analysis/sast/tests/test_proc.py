@@ -12,9 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import subprocess  # nosec
+import time
 import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Tuple
 
-from sfa.utils.proc import run_shell_command, run_with_multiproc
+from sfa.utils.proc import SchedJob, run_shell_command, run_shell_command_async, run_with_multiproc, run_with_scheduler
 
 
 def square(x: int) -> int:
@@ -27,6 +33,19 @@ def square(x: int) -> int:
     return x**2
 
 
+def timed_sleep(secs: float) -> Tuple[float, float]:
+    """
+    Sleep and report the start and end time.
+
+    :param secs:
+    :return:
+    """
+    start = time.monotonic()
+    time.sleep(secs)
+
+    return start, time.monotonic()
+
+
 class TestProcUtils(unittest.TestCase):
     def test_run_shell_command(self) -> None:
         # Arrange
@@ -39,6 +58,64 @@ class TestProcUtils(unittest.TestCase):
         # Assert
         self.assertEqual(expected, actual)
 
+    def test_run_shell_command_check(self) -> None:
+        # Act + Assert
+        self.assertRaises(subprocess.CalledProcessError, run_shell_command, "exit 3", check=True)
+
+    def test_run_shell_command_no_check(self) -> None:
+        # Act
+        actual = run_shell_command("echo 'Hello' && exit 3")
+
+        # Assert
+        self.assertEqual("Hello\n", actual)
+
+    def test_run_shell_command_stdout_file(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            stdout_file = Path(temp_dir) / "stdout.txt"
+
+            # Act
+            actual = run_shell_command("seq 1 100000", stdout_file=stdout_file)
+
+            # Assert
+            self.assertEqual("", actual)
+            self.assertEqual(list(map(str, range(1, 100001))), stdout_file.read_text().split())
+
+    def test_run_shell_command_timeout(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            pid_file = Path(temp_dir) / "pid.txt"
+
+            start = time.monotonic()
+
+            # Act
+            with self.assertRaises(subprocess.TimeoutExpired):
+                run_shell_command(f"sleep 10 & echo $! > {pid_file}; wait", timeout=0.5)
+
+            # Assert
+            self.assertLess(time.monotonic() - start, 5)
+
+            # The children of the shell are killed as well (and possibly not reaped yet)
+            time.sleep(0.1)
+            stat_file = Path("/proc") / pid_file.read_text().strip() / "stat"
+
+            self.assertTrue(not stat_file.exists() or stat_file.read_text().split()[2] == "Z")
+
+    def test_run_shell_command_async_cancel(self) -> None:
+        # Arrange
+        async def _run() -> None:
+            task = asyncio.ensure_future(run_shell_command_async("sleep 10"))
+            await asyncio.sleep(0.2)
+
+            task.cancel()
+            await task
+
+        start = time.monotonic()
+
+        # Act + Assert
+        self.assertRaises(asyncio.CancelledError, asyncio.run, _run())
+        self.assertLess(time.monotonic() - start, 5)
+
     def test_run_with_multiproc(self) -> None:
         # Arrange
 
@@ -51,6 +128,92 @@ class TestProcUtils(unittest.TestCase):
         # Assert
         self.assertEqual(expected, actual)
 
+    def test_run_with_scheduler(self) -> None:
+        # Arrange
+        jobs = [SchedJob((x,), threads=2, memory=100) for x in range(1, 6)]
+        expected = [1, 4, 9, 16, 25]
+
+        # Act
+        actual = run_with_scheduler(square, jobs, max_threads=4, max_memory=1000)
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_run_with_scheduler_in_process(self) -> None:
+        # Arrange
+        jobs = [SchedJob((x,), threads=2, memory=100) for x in range(1, 6)]
+        expected = [1, 4, 9, 16, 25]
+
+        # Act
+        actual = run_with_scheduler(lambda x: x**2, jobs, max_threads=4, max_memory=1000, in_process=True)
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_run_with_scheduler_on_result(self) -> None:
+        # Arrange
+        jobs = [SchedJob((x,)) for x in range(1, 4)]
+        collected = {}
+
+        # Act
+        actual = run_with_scheduler(square, jobs, max_threads=2, max_memory=1000, on_result=collected.__setitem__)
+
+        # Assert
+        self.assertEqual({0: 1, 1: 4, 2: 9}, collected)
+        self.assertEqual([None, None, None], actual)
+
+    def test_run_with_scheduler_thread_limit(self) -> None:
+        # Arrange
+        jobs = [SchedJob((0.2,), threads=3), SchedJob((0.2,), threads=2)]
+
+        # Act
+        (start1, end1), (start2, end2) = run_with_scheduler(timed_sleep, jobs, max_threads=4, max_memory=1000)
+
+        # Assert
+        self.assertTrue(end1 <= start2 or end2 <= start1)
+
+    def test_run_with_scheduler_memory_limit(self) -> None:
+        # Arrange
+        jobs = [SchedJob((0.2,), memory=600), SchedJob((0.2,), memory=600)]
+
+        # Act
+        (start1, end1), (start2, end2) = run_with_scheduler(timed_sleep, jobs, max_threads=4, max_memory=1000)
+
+        # Assert
+        self.assertTrue(end1 <= start2 or end2 <= start1)
+
+    def test_run_with_scheduler_priority(self) -> None:
+        # Arrange
+        jobs = [SchedJob((0.1,), priority=0), SchedJob((0.1,), priority=1)]
+
+        # Act
+        (start1, _), (_, end2) = run_with_scheduler(timed_sleep, jobs, max_threads=1, max_memory=1000)
+
+        # Assert
+        self.assertLessEqual(end2, start1)
+
+    def test_run_with_scheduler_oversized_job(self) -> None:
+        # Arrange
+        jobs = [SchedJob((3,), threads=16, memory=4000)]
+
+        # Act
+        actual = run_with_scheduler(square, jobs, max_threads=4, max_memory=1000)
+
+        # Assert
+        self.assertEqual([9], actual)
+
+    def test_run_with_scheduler_no_starvation(self) -> None:
+        # Arrange
+        jobs = [SchedJob((0.3,), memory=600, priority=2), SchedJob((0.1,), memory=800, priority=1)]
+        jobs += [SchedJob((0.1,), memory=300) for _ in range(10)]
+
+        # Act
+        actual = run_with_scheduler(timed_sleep, jobs, max_threads=8, max_memory=1000, in_process=True, max_skips=2)
+
+        # Assert
+        start_large, _ = actual[1]
+        self.assertEqual(2, sum(start < start_large for start, _ in actual[2:]))
+
 
 if __name__ == "__main__":
     unittest.main()
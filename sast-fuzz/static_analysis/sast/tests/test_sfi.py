@@ -0,0 +1,58 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from pathlib import Path
+
+from sfa.analysis.sfi import CodeBlockInfo, SFIData
+
+
+class TestSFIData(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sfi = SFIData.from_file(Path(__file__).parent / "data" / "sfi" / "quicksort.json")
+
+    def test_from_file(self) -> None:
+        # Assert
+        self.assertEqual(6, len(self.sfi.funcs))
+        self.assertEqual(17, len(self.sfi.bbs))
+        self.assertEqual(5, len(self.sfi.reachable_funcs))
+
+        self.assertEqual(CodeBlockInfo("quicksort.c", 56, 61, 6), self.sfi.funcs["quicksort.c:printArray"])
+        self.assertEqual(CodeBlockInfo("quicksort.c", 58, 59, 2), self.sfi.bbs[13])
+        self.assertNotIn("quicksort.c:dead_func", self.sfi.reachable_funcs)
+
+    def test_find_func(self) -> None:
+        # Act + Assert
+        self.assertEqual("quicksort.c:printArray", self.sfi.find_func("quicksort.c", 58))
+        self.assertEqual("quicksort.c:dead_func", self.sfi.find_func("quicksort.c", 80))
+
+        self.assertIsNone(self.sfi.find_func("quicksort.c", 54))  # Outside function scope
+        self.assertIsNone(self.sfi.find_func("main.c", 58))  # Wrong file
+
+    def test_find_bb(self) -> None:
+        # Act + Assert
+        self.assertEqual(16, self.sfi.find_bb("quicksort.c", 70))
+        self.assertEqual(11, self.sfi.find_bb("quicksort.c", 57))  # Overlapping blocks -> first listed wins
+
+        self.assertIsNone(self.sfi.find_bb("quicksort.c", 43))  # Inside function, but not in any block
+        self.assertIsNone(self.sfi.find_bb("main.c", 70))  # Wrong file
+
+    def test_find_subject_path(self) -> None:
+        # Act + Assert
+        self.assertEqual("quicksort.c:printArray", self.sfi.find_func("src/quicksort.c", 58))
+        self.assertEqual(16, self.sfi.find_bb("src/quicksort.c", 70))
+
+
+if __name__ == "__main__":
+    unittest.main()
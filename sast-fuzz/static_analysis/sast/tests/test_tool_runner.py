@@ -12,11 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import unittest
 from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List
 
+from sfa import SASTToolConfig
 from sfa.analysis import SASTFlag, SASTFlags
-from sfa.analysis.tool_runner import convert_sarif
+from sfa.analysis.filter import PathFilter
+from sfa.analysis.tool_runner import ClangScanRunner, InferRunner, SARIFReader, convert_sarif, default_sarif_checks
 
 
 class TestFlagSetSarif(unittest.TestCase):
@@ -35,6 +40,183 @@ class TestFlagSetSarif(unittest.TestCase):
         # Assert
         self.assertEqual(expected, actual)
 
+    def test_convert_sarif_stream(self) -> None:
+        # Arrange
+        expected = SASTFlags()
+        expected.add(SASTFlag("sast-tool", "file1", 10, "Rule-1"))
+        expected.add(SASTFlag("sast-tool", "file2", 20, "Rule-2"))
+
+        # Act
+        with self.sarif_file.open("r") as sarif_stream:
+            actual = convert_sarif(sarif_stream, default_sarif_checks)
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_convert_sarif_into_flags(self) -> None:
+        # Arrange
+        flags = SASTFlags({SASTFlag("other-tool", "file3", 30, "Rule-3")})
+
+        # Act
+        with self.sarif_file.open("r") as sarif_stream:
+            actual = convert_sarif(sarif_stream, flags=flags)
+
+        # Assert
+        self.assertIs(flags, actual)
+        self.assertEqual(3, len(actual))
+
+    def test_convert_sarif_results_before_tool(self) -> None:
+        # Arrange
+        sarif_data = json.loads(self.sarif_file.read_text())
+        sarif_data["runs"] = [{"results": run["results"], "tool": run["tool"]} for run in sarif_data["runs"]]
+
+        expected = convert_sarif(self.sarif_file.read_text())
+
+        # Act
+        actual = convert_sarif(json.dumps(sarif_data))
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_convert_sarif_empty(self) -> None:
+        # Act + Assert
+        self.assertRaises(ValueError, convert_sarif, "  ")
+
+    def test_sarif_checks_version(self) -> None:
+        # Arrange
+        sarif_data = json.loads(self.sarif_file.read_text())
+        sarif_data["version"] = "1.0.0"
+
+        # Act + Assert
+        self.assertRaises(ValueError, convert_sarif, json.dumps(sarif_data), default_sarif_checks)
+
+    def test_sarif_reader_runs(self) -> None:
+        # Arrange
+        reader = SARIFReader(self.sarif_file.read_text())
+
+        # Act
+        flags = list(reader)
+
+        # Assert
+        self.assertEqual(2, len(flags))
+        self.assertEqual("2.1.0", reader.version)
+        self.assertEqual(1, len(reader.runs))
+        self.assertEqual("sast-tool", reader.runs[0].tool)
+
+
+class TestReportFormat(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+
+        # Subject and its working copy (as checked out by the runners)
+        self.subject_dir = Path(self.temp_dir.name) / "subject"
+        self.work_dir = Path(self.temp_dir.name) / "work" / "subject"
+
+        self.report_dir = Path(self.temp_dir.name) / "report"
+        self.report_dir.mkdir()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def _sarif(uris: List[str]) -> str:
+        results = [
+            {
+                "ruleId": "rule",
+                "locations": [{"physicalLocation": {"artifactLocation": {"uri": uri}, "region": {"startLine": 1}}}],
+            }
+            for uri in uris
+        ]
+
+        return json.dumps(
+            {
+                "version": "2.1.0",
+                "runs": [
+                    {
+                        "tool": {"driver": {"name": "Tool", "rules": [{"id": "rule", "name": "Rule"}]}},
+                        "results": results,
+                    }
+                ],
+            }
+        )
+
+    def test_convert_sarif_map_path(self) -> None:
+        # Arrange
+        sarif = self._sarif(["file:///path/to/src/main.c"])
+
+        # Act
+        actual = convert_sarif(sarif, map_path=lambda uri: uri.replace("file:///path/to/", ""))
+
+        # Assert
+        self.assertEqual(SASTFlags({SASTFlag("tool", "src/main.c", 1, "Rule")}), actual)
+
+    def test_clang_scan_report_dir(self) -> None:
+        # Arrange
+        (self.report_dir / "checker1.sarif").write_text(self._sarif([f"file://{self.work_dir}/src/main.c"]))
+        (self.report_dir / "checker2.sarif").write_text(self._sarif([f"file://{self.work_dir}/third_party/lib.c"]))
+
+        runner = ClangScanRunner(self.subject_dir, SASTToolConfig())
+        runner._work_dir = self.work_dir
+
+        expected = SASTFlags(
+            {SASTFlag("tool", "src/main.c", 1, "Rule"), SASTFlag("tool", "third_party/lib.c", 1, "Rule")}
+        )
+
+        # Act
+        actual = runner._check_and_format(self.report_dir, True)
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_clang_scan_path_filter(self) -> None:
+        # Arrange
+        uris = [f"file://{self.work_dir}/src/main.c", f"file://{self.work_dir}/src/third_party/zlib/inflate.c"]
+        (self.report_dir / "checker.sarif").write_text(self._sarif(uris + ["file:///usr/include/stdio.h"]))
+
+        runner = ClangScanRunner(self.subject_dir, SASTToolConfig())
+        runner._work_dir = self.work_dir
+
+        flags = runner._check_and_format(self.report_dir, False)
+
+        # Act
+        actual = PathFilter(["*/third_party/*", "/usr/*"]).filter(flags)
+
+        # Assert
+        self.assertEqual(SASTFlags({SASTFlag("tool", "src/main.c", 1, "Rule")}), actual)
+
+    def test_infer_report_file(self) -> None:
+        # Arrange
+        report_file = self.report_dir / "report.json"
+        report_file.write_text(
+            json.dumps(
+                [
+                    {"file": "src/file1.c", "line": 10, "bug_type": "NULL_DEREFERENCE", "qualifier": "..."},
+                    {"file": "vendor/file2.c", "line": 20, "bug_type": "RESOURCE_LEAK", "qualifier": "..."},
+                ]
+            )
+        )
+
+        # Infer reports the file paths relative to the working copy
+        runner = InferRunner(self.subject_dir, SASTToolConfig())
+        runner._work_dir = self.work_dir
+
+        expected = SASTFlags(
+            {
+                SASTFlag("infer", "src/file1.c", 10, "NULL_DEREFERENCE"),
+                SASTFlag("infer", "vendor/file2.c", 20, "RESOURCE_LEAK"),
+            }
+        )
+
+        # Act
+        actual = runner._format(report_file)
+
+        # Assert
+        self.assertEqual(expected, actual)
+        self.assertEqual(
+            SASTFlags({SASTFlag("infer", "src/file1.c", 10, "NULL_DEREFERENCE")}),
+            PathFilter(["*/vendor/*"]).filter(actual),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,113 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from sfa.analysis.workspace import SubjectWorkspace
+from sfa.utils.fs import copy_dir, hash_dir
+
+
+class TestSubjectWorkspace(unittest.TestCase):
+    def setUp(self) -> None:
+        self.subject_dir = Path(__file__).parent / "data" / "files"
+
+    def test_checkout(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            workspace = SubjectWorkspace(self.subject_dir, Path(temp_dir) / "workspace")
+
+            # Act
+            actual = workspace.checkout(Path(temp_dir))
+
+            # Assert
+            self.assertEqual(Path(temp_dir) / self.subject_dir.name, actual)
+            self.assertEqual(hash_dir(self.subject_dir), hash_dir(actual))
+
+    def test_checkout_copies_subject_once(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            with patch("sfa.analysis.workspace.supports_clone", return_value=True):
+                workspace = SubjectWorkspace(self.subject_dir, Path(temp_dir))
+
+            with patch("sfa.analysis.workspace.copy_dir", side_effect=copy_dir) as copy_mock:
+                # Act
+                first = workspace.checkout(Path(temp_dir) / "first")
+                second = workspace.checkout(Path(temp_dir) / "second")
+
+            # Assert
+            copy_mock.assert_called_once()
+            self.assertNotEqual(first, second)
+            self.assertEqual(hash_dir(first), hash_dir(second))
+
+    def test_checkout_links_sources(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            subject_dir = Path(temp_dir) / "subject"
+            subject_dir.mkdir()
+            (subject_dir / "main.c").write_text("int main() { return 0; }")
+            (subject_dir / "build.sh").write_text("#!/bin/sh")
+
+            with patch("sfa.analysis.workspace.supports_clone", return_value=False), self.assertLogs(level="INFO"):
+                workspace = SubjectWorkspace(subject_dir, Path(temp_dir) / "workspace")
+
+            # Act
+            first = workspace.checkout(Path(temp_dir) / "first")
+            second = workspace.checkout(Path(temp_dir) / "second")
+
+            # Assert
+            self.assertEqual(hash_dir(subject_dir), hash_dir(second))
+            self.assertEqual((first / "main.c").stat().st_ino, (second / "main.c").stat().st_ino)
+            self.assertNotEqual((subject_dir / "main.c").stat().st_ino, (first / "main.c").stat().st_ino)
+            self.assertNotEqual((first / "build.sh").stat().st_ino, (second / "build.sh").stat().st_ino)
+
+    def test_checkout_without_clones_or_links(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            with patch("sfa.analysis.workspace.supports_clone", return_value=False):
+                with patch("sfa.analysis.workspace.supports_link", return_value=False), self.assertLogs(
+                    level="WARNING"
+                ):
+                    workspace = SubjectWorkspace(self.subject_dir, Path(temp_dir) / "workspace")
+
+            with patch("sfa.analysis.workspace.copy_dir", side_effect=copy_dir) as copy_mock:
+                # Act
+                first = workspace.checkout(Path(temp_dir) / "first")
+                second = workspace.checkout(Path(temp_dir) / "second")
+
+            # Assert
+            self.assertEqual(2, copy_mock.call_count)
+            self.assertFalse(workspace.snapshot_dir.exists())
+            self.assertEqual(Path(temp_dir) / "first" / self.subject_dir.name, first)
+            self.assertEqual(hash_dir(self.subject_dir), hash_dir(second))
+
+    def test_checkout_isolated(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            # Arrange
+            workspace = SubjectWorkspace(self.subject_dir, Path(temp_dir))
+
+            first = workspace.checkout(Path(temp_dir) / "first")
+
+            # Act
+            (first / "test.json").write_text("{}")
+            second = workspace.checkout(Path(temp_dir) / "second")
+
+            # Assert
+            self.assertEqual(hash_dir(self.subject_dir), hash_dir(second))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,7 +21,7 @@ import typer
 from typing_extensions import Annotated
 
 from cdd.container.summary import DedupSummary
-from cdd.grouping import group_by
+from cdd.grouping import GroupingMode, group_by
 
 
 def main(
@@ -71,6 +71,14 @@ def main(
             "--consider-lines", is_flag=True, help="Consider the line numbers of the stack frames in the deduplication."
         ),
     ] = False,
+    grouping_mode: Annotated[
+        GroupingMode,
+        typer.Option(
+            "--grouping",
+            case_sensitive=False,
+            help="Grouping mode: sort (bug IDs in stack trace order) or hash (linear time, bug IDs in stack signature order).",
+        ),
+    ] = GroupingMode.SORT,
 ) -> None:
     def flatten(l: List) -> List:
         return list(chain.from_iterable(l))
@@ -80,7 +88,7 @@ def main(
             [entry.elems for entry in flatten([DedupSummary.from_csv(file).summary for file in input_files])]
         )
 
-        summary = group_by(sanitizer_infos, n_frames, consider_filepaths, consider_lines)
+        summary = group_by(sanitizer_infos, n_frames, consider_filepaths, consider_lines, grouping_mode)
         summary.to_csv(output_file)
 
     except Exception as ex:
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import logging
+from itertools import chain
 from pathlib import Path
 from typing import List, Optional
 
@@ -20,10 +21,33 @@ import typer
 from typing_extensions import Annotated
 
 from cdd import DEFAULT_CONFIG_FILE, AppConfig
-from cdd.container.san import SanitizerOutput
-from cdd.grouping import group_by
+from cdd.container.san import ParseResult, parse_files
+from cdd.grouping import GroupingMode, group_by_frames
+from cdd.store import STORE_FILE_NAME, DedupStore
 from cdd.utils.fs import find_files
-from cdd.utils.proc import get_cpu_count, run_program_with_sanitizer, run_with_multiproc
+from cdd.utils.proc import get_cpu_count, paused_gc, run_program_with_sanitizer, run_with_multiproc
+
+# No. of sanitizer output files parsed per job (in parallel mode)
+PARSE_BATCH_SIZE: int = 256
+
+
+def parse_sanitizer_files(sanitizer_files: List[Path], parallel: bool) -> List[ParseResult]:
+    """
+    Parse sanitizer output files, in batches of parallel jobs if requested.
+
+    :param sanitizer_files:
+    :param parallel:
+    :return:
+    """
+    batches = [sanitizer_files[i : i + PARSE_BATCH_SIZE] for i in range(0, len(sanitizer_files), PARSE_BATCH_SIZE)]
+    n_parse_jobs = 1 if not parallel else min(get_cpu_count() - 1, len(batches))
+
+    if n_parse_jobs > 1:
+        # The parse results are unpickled in this process
+        with paused_gc():
+            return list(chain(*run_with_multiproc(parse_files, [(batch,) for batch in batches], n_parse_jobs)))
+
+    return parse_files(sanitizer_files)
 
 
 def main(
@@ -92,6 +116,22 @@ def main(
             "--consider-lines", is_flag=True, help="Consider the line numbers of the stack frames in the deduplication."
         ),
     ] = False,
+    grouping_mode: Annotated[
+        GroupingMode,
+        typer.Option(
+            "--grouping",
+            case_sensitive=False,
+            help="Grouping mode: sort (bug IDs in stack trace order) or hash (linear time, bug IDs in stack signature order).",
+        ),
+    ] = GroupingMode.SORT,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            "--incremental",
+            is_flag=True,
+            help=f"Keep a dedup store ({STORE_FILE_NAME}) in the output directory: only parse new or modified sanitizer output files, and keep the bug IDs of earlier runs. Note: Requires hash grouping (--grouping hash).",
+        ),
+    ] = False,
     config_file: Annotated[
         Path,
         typer.Option(
@@ -105,11 +145,17 @@ def main(
         ),
     ] = DEFAULT_CONFIG_FILE,
     parallel: Annotated[
-        bool, typer.Option("--parallel", is_flag=True, help="Run the deduplication in parallel.")
+        bool,
+        typer.Option(
+            "--parallel", is_flag=True, help="Run the programs and parse the sanitizer output files in parallel."
+        ),
     ] = False,
 ) -> None:
     app_config = AppConfig.from_yaml(config_file)
 
+    if incremental and grouping_mode != GroupingMode.HASH:
+        raise typer.BadParameter("The incremental mode requires hash grouping.", param_hint="--grouping")
+
     sanitizer_dirs = sanitizer_dirs or []
 
     if shell_command is not None:
@@ -132,22 +178,52 @@ def main(
 
         sanitizer_dirs.append(sanitizer_dir)
 
-    sanitizer_files = find_files(sanitizer_dirs)
+    sanitizer_files = sorted(find_files(sanitizer_dirs))
 
     if len(sanitizer_files) == 0:
         logging.info("No sanitizer output files found.")
         exit(1)
 
-    sanitizer_infos = []
-    for sanitizer_file in sanitizer_files:
-        try:
-            sanitizer_infos.append(SanitizerOutput.from_file(sanitizer_file))
+    # All numbers of stack frames are deduplicated in a single pass
+    n_frames_set: List[Optional[int]] = list(sorted(set(n_frames_list))) if n_frames_list else [None]
 
-        except Exception as ex:
-            logging.error(ex)
+    if incremental:
+        with DedupStore(output_dir / STORE_FILE_NAME) as store:
+            if n_removed := store.prune(sanitizer_files):
+                logging.info(f"{n_removed} sanitizer output file(s) removed from the dedup store.")
 
-    for n_frames in set(n_frames_list or [None]):  # type: ignore
-        summary_file = output_dir / f"summary{'' if n_frames is None else '_nf' + str(n_frames)}.csv"
+            stale_files = store.stale_files(sanitizer_files)
+
+            new_results = parse_sanitizer_files(sorted(stale_files), parallel)
+
+            for result in new_results:
+                if result.error is not None:
+                    logging.error(result.error)
+
+            store.update(new_results, stale_files)
+
+            logging.info(f"{len(new_results)} new or modified sanitizer output file(s) parsed.")
 
-        summary = group_by(sanitizer_infos, n_frames, consider_filepaths, consider_lines)
+            results = store.results(sanitizer_files)
+            sanitizer_infos = [result.san_output for result in results if result.error is None]
+
+            logging.info(f"{len(sanitizer_infos)} of {len(results)} sanitizer output file(s) valid.")
+
+            summaries = store.group_by_frames(sanitizer_infos, n_frames_set, consider_filepaths, consider_lines)
+    else:
+        results = parse_sanitizer_files(sanitizer_files, parallel)
+
+        sanitizer_infos = []
+        for result in results:
+            if result.error is not None:
+                logging.error(result.error)
+            else:
+                sanitizer_infos.append(result.san_output)
+
+        logging.info(f"{len(sanitizer_infos)} of {len(results)} sanitizer output file(s) parsed.")
+
+        summaries = group_by_frames(sanitizer_infos, n_frames_set, consider_filepaths, consider_lines, grouping_mode)
+
+    for n_frames, summary in summaries.items():
+        summary_file = output_dir / f"summary{'' if n_frames is None else '_nf' + str(n_frames)}.csv"
         summary.to_csv(summary_file)
@@ -16,7 +16,9 @@ import re
 from collections import namedtuple
 from enum import Enum, auto
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
+
+from cdd.utils.proc import paused_gc
 
 # Stack frame separator
 STACK_FRAME_SEP: str = ":"
@@ -24,12 +26,27 @@ STACK_FRAME_SEP: str = ":"
 # Stack trace separator
 STACK_TRACE_SEP: str = "="
 
+# Original input file line (prepended to the sanitizer output)
+INPUT_REGEX: re.Pattern = re.compile(r"INPUT_FILE:\s(.+)")
+
+# Sanitizer and vuln.-type line
+VINFO_REGEX: re.Pattern = re.compile(r"ERROR:\s([^:]+):\s([a-zA-Z-_]+)")
+
+# Stack frame line; the alternatives are tried in order: function with source location (groups 2-4), function only
+# (group 5), and module only, e.g. "#5 0x41c3bd  (/path/to/binary+0x41c3bd)"
+FRAME_REGEX: re.Pattern = re.compile(
+    r"#([0-9]+)(?:.*in\s([a-zA-Z0-9_]+)\s([^:]+):([0-9]+)|.*in\s([a-zA-Z0-9_]+)|.*\(.+\))"
+)
+
 # Stack frame information
 StackFrame = namedtuple("StackFrame", ["id", "file", "function", "line"])
 
 # Stack trace, i.e. list of stack frames
 StackTrace = List[StackFrame]
 
+# Result of parsing a sanitizer output file: the file, and the sanitizer output or the error message
+ParseResult = namedtuple("ParseResult", ["file", "san_output", "error"])
+
 
 def frame_to_string(frame: StackFrame) -> str:
     """
@@ -84,6 +101,33 @@ def string_to_trace(string: str) -> StackTrace:
     return [string_to_frame(frame) for frame in string.split(STACK_TRACE_SEP)]
 
 
+def file_name(path: str) -> str:
+    """
+    Get the file name of a path (as Path.name, but without creating a Path object in the common case).
+
+    :param path:
+    :return:
+    """
+    name = path[path.rfind("/") + 1 :]
+
+    return name if name not in ("", ".", "..") else Path(path).name
+
+
+def frame_key(frame: StackFrame, consider_filepaths: bool = False, consider_lines: bool = False) -> Tuple:
+    """
+    Get the part of a stack frame considered in the deduplication.
+
+    :param frame:
+    :param consider_filepaths:
+    :param consider_lines:
+    :return:
+    """
+    if consider_filepaths:
+        return frame if consider_lines else (frame.id, frame.file, frame.function)
+
+    return (frame.id, frame.function, frame.line) if consider_lines else (frame.id, frame.function)
+
+
 def find_input(line: str) -> Optional[str]:
     """
     Find the original input filepath in a sanitizer output line.
@@ -91,8 +135,8 @@ def find_input(line: str) -> Optional[str]:
     :param line:
     :return:
     """
-    if m := re.search(r"INPUT_FILE:\s(.+)", line):
-        return str(m.group(1))
+    if m := INPUT_REGEX.search(line):
+        return str(m.group(1)).rstrip()
     else:
         return None
 
@@ -104,7 +148,7 @@ def find_vinfo(line: str) -> Optional[Tuple[str, str]]:
     :param line:
     :return:
     """
-    if m := re.search(r"ERROR:\s([^:]+):\s([a-zA-Z-_]+)", line):
+    if m := VINFO_REGEX.search(line):
         return str(m.group(1)).lower(), str(m.group(2)).lower()
     else:
         return None
@@ -117,16 +161,20 @@ def find_frame(line: str) -> Optional[StackFrame]:
     :param line:
     :return:
     """
-    if m := re.search(r"#([0-9]+).*in\s([a-zA-Z0-9_]+)\s([^:]+):([0-9]+)", line):
-        return StackFrame(int(m.group(1)), Path(m.group(3)).name, m.group(2), int(m.group(4)))
+    if not (m := FRAME_REGEX.search(line)):
+        return None
+
+    if m.group(2) is not None:
+        return StackFrame(int(m.group(1)), file_name(m.group(3)), m.group(2), int(m.group(4)))
 
-    if m := re.search(r"#([0-9]+).*in\s([a-zA-Z0-9_]+)", line):
-        return StackFrame(int(m.group(1)), "-", m.group(2), -1)
+    if m.group(5) is not None:
+        return StackFrame(int(m.group(1)), "-", m.group(5), -1)
 
-    if m := re.search(r"#([0-9]+).*\(.+\)", line):
-        return StackFrame(int(m.group(1)), "-", "-", -1)
+    return StackFrame(int(m.group(1)), "-", "-", -1)
 
-    return None
+
+def _unpickle_output(input_file: str, sanitizer: str, vuln_type: str, frames: List[Tuple]) -> "SanitizerOutput":
+    return SanitizerOutput(input_file, sanitizer, vuln_type, [StackFrame._make(frame) for frame in frames])
 
 
 class ParseState(Enum):
@@ -145,6 +193,9 @@ class SanitizerOutput:
     Sanitizer output container.
     """
 
+    # Sanitizer outputs are created (and passed between processes) in large numbers
+    __slots__ = ("input_file", "sanitizer", "vuln_type", "stack_trace")
+
     def __init__(self, input_file: str, sanitizer: str, vuln_type: str, stack_trace: StackTrace) -> None:
         self.input_file = input_file
         self.sanitizer = sanitizer
@@ -164,16 +215,11 @@ class SanitizerOutput:
         """
         stack_trace = self.stack_trace if n_frames is None else self.stack_trace[:n_frames]
 
-        if consider_filepaths:
-            if not consider_lines:
-                stack_trace = [(t.id, t.file, t.function) for t in stack_trace]  # type: ignore
-        else:
-            if not consider_lines:
-                stack_trace = [(t.id, t.function) for t in stack_trace]  # type: ignore
-            else:
-                stack_trace = [(t.id, t.function, t.line) for t in stack_trace]  # type: ignore
+        return self.sanitizer, self.vuln_type, [frame_key(t, consider_filepaths, consider_lines) for t in stack_trace]
 
-        return self.sanitizer, self.vuln_type, stack_trace
+    def __reduce__(self) -> Tuple:
+        # Pickle the stack frames as plain tuples, which is considerably faster than pickling named tuples
+        return _unpickle_output, (self.input_file, self.sanitizer, self.vuln_type, [tuple(f) for f in self.stack_trace])
 
     def __eq__(self, o: object) -> bool:
         if not isinstance(o, SanitizerOutput):
@@ -184,11 +230,28 @@ class SanitizerOutput:
     @classmethod
     def from_file(cls, sanitizer_file: Path) -> "SanitizerOutput":
         """
-        Create a SanitizerOutput object from the sanitizer output file.
+        Create a SanitizerOutput object from the sanitizer output file. The file is read line by line, and only up to
+        the end of the (first) stack trace.
 
         :param sanitizer_file:
         :return:
         """
+        with sanitizer_file.open("r") as lines:
+            san_output = cls.from_lines(lines)
+
+        if san_output is None:
+            raise Exception(f"Invalid sanitizer output in '{sanitizer_file}'!")
+
+        return san_output
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> Optional["SanitizerOutput"]:
+        """
+        Create a SanitizerOutput object from the lines of a sanitizer output (in a single pass).
+
+        :param lines:
+        :return: Sanitizer output or None if the lines don't contain a valid sanitizer output
+        """
         input_id = ""
         san = "-"
         vtype = "-"
@@ -196,7 +259,9 @@ class SanitizerOutput:
 
         state = ParseState.VTYPE
 
-        for line in [l.strip() for l in sanitizer_file.read_text().splitlines()]:
+        for line in lines:
+            is_empty = len(line) == 0 or line.isspace()
+
             if state == ParseState.VTYPE:
                 if i := find_input(line):
                     input_id = i
@@ -208,20 +273,40 @@ class SanitizerOutput:
                 if f := find_frame(line):
                     stack_trace.append(f)
                     state = ParseState.TRACE
-                elif len(line) == 0 and san != "leaksanitizer":
+                elif is_empty and san != "leaksanitizer":
                     state = ParseState.VALID
                     break
 
             elif state == ParseState.TRACE:
                 if f := find_frame(line):
                     stack_trace.append(f)
-                elif len(line) == 0:
+                elif is_empty:
                     state = ParseState.VALID
                     break
                 else:
                     break
 
         if state != ParseState.VALID:
-            raise Exception(f"Invalid sanitizer output in '{sanitizer_file}'!")
+            return None
 
         return SanitizerOutput(input_id, san, vtype, stack_trace)
+
+
+def parse_files(sanitizer_files: List[Path]) -> List[ParseResult]:
+    """
+    Parse sanitizer output files; invalid files are reported instead of raising an error.
+
+    :param sanitizer_files:
+    :return:
+    """
+    results = []
+
+    with paused_gc():
+        for sanitizer_file in sanitizer_files:
+            try:
+                results.append(ParseResult(sanitizer_file, SanitizerOutput.from_file(sanitizer_file), None))
+
+            except Exception as ex:
+                results.append(ParseResult(sanitizer_file, None, str(ex)))
+
+    return results
@@ -12,18 +12,40 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from itertools import groupby
-from typing import List, Optional
+import hashlib
+from collections import defaultdict
+from enum import Enum
+from itertools import chain, groupby
+from typing import Dict, List, Optional, Tuple
 
-from cdd.container.san import SanitizerOutput
+from cdd.container.san import SanitizerOutput, frame_key
 from cdd.container.summary import DedupEntry, DedupSummary
 
+# Digest size (in bytes) of the stack signatures
+SIGNATURE_SIZE: int = 16
+
+# Separators of the fields and the stack frames in the signature input (not expected in sanitizer outputs)
+SIGNATURE_FIELD_SEP: str = "\x1f"
+SIGNATURE_FRAME_SEP: str = "\x1e"
+
+
+class GroupingMode(Enum):
+    """
+    Grouping mode. Sort: sort the outputs by their (normalized) stack traces; the bug IDs follow the sorting order.
+    Hash: bucket the outputs by a digest of their stack traces in linear time; the bug IDs follow the order of the
+    digests, i.e., they don't depend on the order of the outputs, but differ from the ones of the sort mode.
+    """
+
+    SORT = "sort"
+    HASH = "hash"
+
 
 def group_by(
     sanitizer_infos: List[SanitizerOutput],
     n_frames: Optional[int] = None,
     consider_filepaths: bool = False,
     consider_lines: bool = False,
+    mode: GroupingMode = GroupingMode.SORT,
 ) -> DedupSummary:
     """
     Group/deduplicate sanitizer outputs.
@@ -32,8 +54,12 @@ def group_by(
     :param n_frames:
     :param consider_filepaths:
     :param consider_lines:
+    :param mode:
     :return:
     """
+    if mode == GroupingMode.HASH:
+        return group_by_frames(sanitizer_infos, [n_frames], consider_filepaths, consider_lines, mode)[n_frames]
+
     keyfunc = lambda s: s.sorting_key(n_frames, consider_filepaths, consider_lines)
 
     return DedupSummary(
@@ -45,3 +71,256 @@ def group_by(
             for i, (k, g) in enumerate(groupby(sorted(sanitizer_infos, key=keyfunc), key=keyfunc))
         ],
     )
+
+
+class DedupEngine:
+    """
+    Deduplication of sanitizer outputs for several numbers of stack frames at once. The outputs are inserted into a
+    prefix trie over (sanitizer, vuln.-type) and the (normalized) stack frames; the group of an output for n frames is
+    the trie node reached after n frames (or at the end of a shorter stack trace). The bug IDs follow the pre-order of
+    the trie, which is the order of the sorting keys used by 'group_by', so the summaries are the same as the ones of
+    'group_by'. Only the first 'max_frames' stack frames are inserted (if given).
+    """
+
+    def __init__(
+        self,
+        sanitizer_infos: List[SanitizerOutput],
+        consider_filepaths: bool = False,
+        consider_lines: bool = False,
+        max_frames: Optional[int] = None,
+    ) -> None:
+        self._infos = sanitizer_infos
+        self._consider_filepaths = consider_filepaths
+        self._consider_lines = consider_lines
+        self._max_frames = max_frames
+
+        # Children of the trie nodes by key (node 0 is the root)
+        self._children: List[Dict[Tuple, int]] = [{}]
+
+        # Trie nodes visited by each output, i.e., the nodes for 0, 1, ... stack frames; outputs with the same stack
+        # trace (the common case for duplicate crashes) share their path
+        paths: Dict[Tuple, List[int]] = {}
+
+        self._paths: List[List[int]] = []
+        for info in sanitizer_infos:
+            trace_key = (info.sanitizer, info.vuln_type, *info.stack_trace[: self._max_frames])
+
+            if (path := paths.get(trace_key)) is None:
+                path = paths[trace_key] = self._insert(info)
+
+            self._paths.append(path)
+
+        self._ranks = self._preorder_ranks()
+
+    def _insert(self, info: SanitizerOutput) -> List[int]:
+        """
+        Insert a sanitizer output into the trie.
+
+        :param info:
+        :return: Visited trie nodes
+        """
+        stack_trace = info.stack_trace if self._max_frames is None else info.stack_trace[: self._max_frames]
+        keys = chain(
+            [(info.sanitizer, info.vuln_type)],
+            (frame_key(frame, self._consider_filepaths, self._consider_lines) for frame in stack_trace),
+        )
+
+        node = 0
+        path = []
+
+        for key in keys:
+            child = self._children[node].get(key)
+
+            if child is None:
+                child = len(self._children)
+                self._children[node][key] = child
+                self._children.append({})
+
+            node = child
+            path.append(node)
+
+        return path
+
+    def _preorder_ranks(self) -> List[int]:
+        """
+        Rank the trie nodes in pre-order, visiting the children in the order of their keys.
+
+        :return: Rank by node
+        """
+        ranks = [0] * len(self._children)
+        stack = [0]
+        rank = 0
+
+        while len(stack) > 0:
+            node = stack.pop()
+
+            ranks[node] = rank
+            rank += 1
+
+            stack.extend(child for _, child in sorted(self._children[node].items(), reverse=True))
+
+        return ranks
+
+    def summary(self, n_frames: Optional[int] = None) -> DedupSummary:
+        """
+        Group/deduplicate the sanitizer outputs.
+
+        :param n_frames: Number of stack frames to be considered (None: all frames); must not exceed 'max_frames'
+        :return:
+        """
+        if self._max_frames is not None and (n_frames is None or n_frames > self._max_frames):
+            raise ValueError(f"Number of frames exceeds the max. number of frames ({self._max_frames}).")
+
+        groups: Dict[int, List[SanitizerOutput]] = defaultdict(list)
+
+        for info, path in zip(self._infos, self._paths):
+            groups[path[-1] if n_frames is None else path[min(n_frames, len(path) - 1)]].append(info)
+
+        return DedupSummary(
+            n_frames,
+            self._consider_filepaths,
+            self._consider_lines,
+            [
+                DedupEntry(
+                    i,
+                    groups[node][0].sorting_key(n_frames, self._consider_filepaths, self._consider_lines),
+                    groups[node],
+                )
+                for i, node in enumerate(sorted(groups, key=self._ranks.__getitem__))
+            ],
+        )
+
+
+def stack_signatures(
+    info: SanitizerOutput,
+    n_frames_list: List[Optional[int]],
+    consider_filepaths: bool = False,
+    consider_lines: bool = False,
+) -> List[str]:
+    """
+    Get the stack signatures of a sanitizer output, i.e., digests of the sanitizer, the vuln.-type, and the (normalized)
+    stack frames, for several numbers of stack frames. The signatures are computed in a single pass over the frames.
+
+    :param info:
+    :param n_frames_list: Numbers of stack frames (None: all frames)
+    :param consider_filepaths:
+    :param consider_lines:
+    :return: Signature by number of stack frames (in the order of 'n_frames_list')
+    """
+    max_frames = None if None in n_frames_list else max(n_frames_list)  # type: ignore
+    stack_trace = info.stack_trace if max_frames is None else info.stack_trace[:max_frames]
+
+    signature = hashlib.blake2b(
+        f"{info.sanitizer}{SIGNATURE_FIELD_SEP}{info.vuln_type}".encode(), digest_size=SIGNATURE_SIZE
+    )
+
+    # Signatures of traces cut off before their end
+    prefix_signatures: Dict[int, str] = {}
+
+    for i, frame in enumerate(stack_trace):
+        if i in n_frames_list:
+            prefix_signatures[i] = signature.hexdigest()
+
+        key = frame_key(frame, consider_filepaths, consider_lines)
+        signature.update((SIGNATURE_FRAME_SEP + SIGNATURE_FIELD_SEP.join(str(value) for value in key)).encode())
+
+    full_signature = signature.hexdigest()
+
+    return [
+        full_signature if n_frames is None else prefix_signatures.get(n_frames, full_signature)
+        for n_frames in n_frames_list
+    ]
+
+
+def bucket_by_signatures(
+    sanitizer_infos: List[SanitizerOutput],
+    n_frames_list: List[Optional[int]],
+    consider_filepaths: bool = False,
+    consider_lines: bool = False,
+) -> Dict[Optional[int], Dict[str, List[SanitizerOutput]]]:
+    """
+    Bucket sanitizer outputs by their stack signatures for several numbers of stack frames (in a single pass over the
+    outputs). The outputs keep their order within the buckets.
+
+    :param sanitizer_infos:
+    :param n_frames_list: Numbers of stack frames (None: all frames)
+    :param consider_filepaths:
+    :param consider_lines:
+    :return: Buckets (by signature) by number of stack frames
+    """
+    buckets: List[Dict[str, List[SanitizerOutput]]] = [defaultdict(list) for _ in n_frames_list]
+
+    # Outputs with the same stack trace (the common case for duplicate crashes) share their signatures
+    signatures: Dict[Tuple, List[str]] = {}
+
+    for info in sanitizer_infos:
+        trace_key = (info.sanitizer, info.vuln_type, *info.stack_trace)
+
+        if (info_signatures := signatures.get(trace_key)) is None:
+            info_signatures = signatures[trace_key] = stack_signatures(
+                info, n_frames_list, consider_filepaths, consider_lines
+            )
+
+        for bucket, signature in zip(buckets, info_signatures):
+            bucket[signature].append(info)
+
+    return dict(zip(n_frames_list, buckets))
+
+
+def _group_by_signatures(
+    sanitizer_infos: List[SanitizerOutput],
+    n_frames_list: List[Optional[int]],
+    consider_filepaths: bool = False,
+    consider_lines: bool = False,
+) -> Dict[Optional[int], DedupSummary]:
+    """
+    Group/deduplicate sanitizer outputs for several numbers of stack frames by their stack signatures.
+
+    :param sanitizer_infos:
+    :param n_frames_list: Numbers of stack frames (None: all frames)
+    :param consider_filepaths:
+    :param consider_lines:
+    :return: Summary by number of stack frames
+    """
+    return {
+        n_frames: DedupSummary(
+            n_frames,
+            consider_filepaths,
+            consider_lines,
+            [
+                DedupEntry(
+                    i, bucket[signature][0].sorting_key(n_frames, consider_filepaths, consider_lines), bucket[signature]
+                )
+                for i, signature in enumerate(sorted(bucket))
+            ],
+        )
+        for n_frames, bucket in bucket_by_signatures(
+            sanitizer_infos, n_frames_list, consider_filepaths, consider_lines
+        ).items()
+    }
+
+
+def group_by_frames(
+    sanitizer_infos: List[SanitizerOutput],
+    n_frames_list: List[Optional[int]],
+    consider_filepaths: bool = False,
+    consider_lines: bool = False,
+    mode: GroupingMode = GroupingMode.SORT,
+) -> Dict[Optional[int], DedupSummary]:
+    """
+    Group/deduplicate sanitizer outputs for several numbers of stack frames (in a single pass over the outputs).
+
+    :param sanitizer_infos:
+    :param n_frames_list: Numbers of stack frames (None: all frames)
+    :param consider_filepaths:
+    :param consider_lines:
+    :param mode:
+    :return: Summary by number of stack frames
+    """
+    if mode == GroupingMode.HASH:
+        return _group_by_signatures(sanitizer_infos, n_frames_list, consider_filepaths, consider_lines)
+
+    max_frames = None if None in n_frames_list else max(n_frames_list)  # type: ignore
+    engine = DedupEngine(sanitizer_infos, consider_filepaths, consider_lines, max_frames)
+
+    return {n_frames: engine.summary(n_frames) for n_frames in n_frames_list}
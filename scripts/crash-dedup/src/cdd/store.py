@@ -0,0 +1,263 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sqlite3
+from collections import namedtuple
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from cdd.container.san import ParseResult, SanitizerOutput, StackFrame
+from cdd.container.summary import DedupEntry, DedupSummary
+from cdd.grouping import bucket_by_signatures
+from cdd.utils.proc import paused_gc
+
+# Name of the dedup store file (placed in the output directory)
+STORE_FILE_NAME: str = "dedup.db"
+
+# Version of the store schema (kept in the "user_version" of the database)
+SCHEMA_VERSION: int = 1
+
+# Value of the no. of stack frames standing for "all frames" in the store (primary keys must not be NULL)
+ALL_FRAMES: int = 0
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    input_file TEXT,
+    sanitizer TEXT,
+    vuln_type TEXT,
+    stack_trace TEXT,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS bugs (
+    n_frames INTEGER NOT NULL,
+    consider_filepaths INTEGER NOT NULL,
+    consider_lines INTEGER NOT NULL,
+    signature TEXT NOT NULL,
+    bug_id INTEGER NOT NULL,
+    PRIMARY KEY (n_frames, consider_filepaths, consider_lines, signature)
+);
+"""
+
+# State of a sanitizer output file; a file whose state differs from the stored one is parsed again
+FileState = namedtuple("FileState", ["mtime_ns", "size"])
+
+
+def file_state(file: Path) -> FileState:
+    """
+    Get the state of a file.
+
+    :param file:
+    :return:
+    """
+    stat = os.stat(file)
+
+    return FileState(stat.st_mtime_ns, stat.st_size)
+
+
+class DedupStore:
+    """
+    Persistent (SQLite) store of the parsed sanitizer output files and the assigned bug IDs. Only new or modified files
+    have to be parsed again, and outputs with a known stack signature keep the bug ID of an earlier run; new signatures
+    get new bug IDs. The bug IDs are kept per no. of stack frames, 'consider_filepaths', and 'consider_lines'.
+    """
+
+    def __init__(self, db_file: Path) -> None:
+        self._conn = sqlite3.connect(db_file)
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+
+        if version not in (0, SCHEMA_VERSION):
+            self._conn.close()
+            raise Exception(f"Unsupported dedup store version {version} in '{db_file}'!")
+
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __enter__(self) -> "DedupStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def prune(self, files: Iterable[Path]) -> int:
+        """
+        Remove the stored parse results of all files except the given ones (e.g. files deleted since the last run), so
+        that the store doesn't grow beyond the current files. The bug IDs are kept.
+
+        :param files: Current files
+        :return: No. of removed files
+        """
+        with self._conn:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS current_files (path TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM current_files")
+            self._conn.executemany("INSERT OR IGNORE INTO current_files VALUES (?)", [(str(file),) for file in files])
+
+            n_removed = self._conn.execute(
+                "DELETE FROM files WHERE path NOT IN (SELECT path FROM current_files)"
+            ).rowcount
+
+            self._conn.execute("DELETE FROM current_files")
+
+        return n_removed
+
+    def stale_files(self, files: Iterable[Path]) -> Dict[Path, FileState]:
+        """
+        Get the files that are not in the store or have been modified since they were stored.
+
+        :param files:
+        :return: Current state by stale file
+        """
+        stored = {
+            path: FileState(mtime_ns, size)
+            for path, mtime_ns, size in self._conn.execute("SELECT path, mtime_ns, size FROM files")
+        }
+
+        stale = {}
+
+        for file in files:
+            state = file_state(file)
+
+            if stored.get(str(file)) != state:
+                stale[file] = state
+
+        return stale
+
+    def update(self, results: List[ParseResult], states: Dict[Path, FileState]) -> None:
+        """
+        Store the parse results of files.
+
+        :param results:
+        :param states: State of the files before they were parsed
+        :return:
+        """
+
+        def row(result: ParseResult) -> tuple:
+            state = states[result.file]
+            output = result.san_output
+
+            if output is None:
+                return str(result.file), state.mtime_ns, state.size, None, None, None, None, result.error
+
+            return (
+                str(result.file),
+                state.mtime_ns,
+                state.size,
+                output.input_file,
+                output.sanitizer,
+                output.vuln_type,
+                json.dumps([list(frame) for frame in output.stack_trace]),
+                None,
+            )
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [row(result) for result in results]
+            )
+
+    def results(self, files: Iterable[Path]) -> List[ParseResult]:
+        """
+        Get the stored parse results of files (in the order of the files); files not in the store are skipped.
+
+        :param files:
+        :return:
+        """
+        stored: Dict[str, Tuple[Optional[SanitizerOutput], Optional[str]]] = {}
+
+        with paused_gc():
+            for path, input_file, sanitizer, vuln_type, stack_trace, error in self._conn.execute(
+                "SELECT path, input_file, sanitizer, vuln_type, stack_trace, error FROM files"
+            ):
+                if error is not None:
+                    stored[path] = (None, error)
+                else:
+                    trace = [StackFrame._make(frame) for frame in json.loads(stack_trace)]
+                    stored[path] = (SanitizerOutput(input_file, sanitizer, vuln_type, trace), None)
+
+        return [ParseResult(file, *stored[str(file)]) for file in files if str(file) in stored]
+
+    def group_by_frames(
+        self,
+        sanitizer_infos: List[SanitizerOutput],
+        n_frames_list: List[Optional[int]],
+        consider_filepaths: bool = False,
+        consider_lines: bool = False,
+    ) -> Dict[Optional[int], DedupSummary]:
+        """
+        Group/deduplicate sanitizer outputs by their stack signatures (see 'GroupingMode.HASH'), keeping the bug IDs of
+        the signatures already in the store. New signatures get the next free bug IDs (in the order of the signatures).
+
+        :param sanitizer_infos:
+        :param n_frames_list: Numbers of stack frames (None: all frames)
+        :param consider_filepaths:
+        :param consider_lines:
+        :return: Summary by number of stack frames (entries ordered by bug ID)
+        """
+        buckets = bucket_by_signatures(sanitizer_infos, n_frames_list, consider_filepaths, consider_lines)
+
+        summaries = {}
+
+        with self._conn:
+            for n_frames, bucket in buckets.items():
+                config = (ALL_FRAMES if n_frames is None else n_frames, consider_filepaths, consider_lines)
+
+                bug_ids = {
+                    signature: bug_id
+                    for signature, bug_id in self._conn.execute(
+                        "SELECT signature, bug_id FROM bugs "
+                        "WHERE n_frames = ? AND consider_filepaths = ? AND consider_lines = ?",
+                        config,
+                    )
+                }
+
+                next_id = max(bug_ids.values(), default=-1) + 1
+                new_signatures = sorted(signature for signature in bucket if signature not in bug_ids)
+
+                for i, signature in enumerate(new_signatures):
+                    bug_ids[signature] = next_id + i
+
+                self._conn.executemany(
+                    "INSERT INTO bugs VALUES (?, ?, ?, ?, ?)",
+                    [(*config, signature, bug_ids[signature]) for signature in new_signatures],
+                )
+
+                summaries[n_frames] = DedupSummary(
+                    n_frames,
+                    consider_filepaths,
+                    consider_lines,
+                    [
+                        DedupEntry(
+                            bug_ids[signature],
+                            bucket[signature][0].sorting_key(n_frames, consider_filepaths, consider_lines),
+                            bucket[signature],
+                        )
+                        for signature in sorted(bucket, key=lambda s: bug_ids[s])
+                    ],
+                )
+
+        return summaries
@@ -12,13 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gc
 import logging
 import multiprocessing as mp
 import os
 import subprocess  # nosec
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Union
+from typing import Callable, Dict, Iterator, List, Optional, Union
 
 from cdd.utils.fs import find_files
 
@@ -32,6 +34,24 @@ def get_cpu_count() -> int:
     return mp.cpu_count()
 
 
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """
+    Pause the (cyclic) garbage collector. Creating many small objects without reference cycles otherwise triggers
+    repeated collections, each scanning the whole (growing) heap.
+
+    :return:
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
 def run_shell_command(
     cmd: Union[str, List[str]], cwd: Optional[Path] = None, env: Optional[Dict[str, str]] = None
 ) -> str:
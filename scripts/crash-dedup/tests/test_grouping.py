@@ -18,7 +18,7 @@ from typing import Set
 
 from cdd.container.san import SanitizerOutput, StackFrame
 from cdd.container.summary import DedupSummary
-from cdd.grouping import group_by
+from cdd.grouping import DedupEngine, GroupingMode, group_by, group_by_frames
 
 
 def check_grouping(summary: DedupSummary, expected: Set[str]) -> bool:
@@ -290,3 +290,114 @@ class TestGrouping(unittest.TestCase):
         # Assert
         for group in expected:
             self.assertTrue(check_grouping(actual, group))
+
+    def test_group_by_frames(self) -> None:
+        # Arrange
+        sanitizer_infos = [SanitizerOutput.from_file(f) for f in self.sanitizer_files]
+        n_frames_list = [1, 5, 7, None]
+
+        for consider_filepaths, consider_lines in [(False, False), (True, False), (False, True), (True, True)]:
+            expected = {n: group_by(sanitizer_infos, n, consider_filepaths, consider_lines) for n in n_frames_list}
+
+            # Act
+            actual = group_by_frames(sanitizer_infos, n_frames_list, consider_filepaths, consider_lines)
+
+            # Assert
+            self.assertEqual(expected, actual)
+
+            for n_frames in n_frames_list:
+                self.assertEqual(
+                    [entry.key for entry in expected[n_frames].summary],
+                    [entry.key for entry in actual[n_frames].summary],
+                )
+
+    def test_group_by_frames_short_traces(self) -> None:
+        # Arrange
+        sanitizer_infos = [
+            SanitizerOutput("input1", "san1", "type1", [StackFrame(0, "file1", "func1", 10)]),
+            SanitizerOutput(
+                "input2", "san1", "type1", [StackFrame(0, "file1", "func1", 10), StackFrame(1, "file2", "func2", 20)]
+            ),
+            SanitizerOutput("input3", "san1", "type1", []),
+        ]
+
+        # Act
+        actual = group_by_frames(sanitizer_infos, [1, 2], True, True)
+
+        # Assert
+        self.assertEqual(
+            [["input3"], ["input1", "input2"]], [[i.input_file for i in e.elems] for e in actual[1].summary]
+        )
+        self.assertEqual(
+            [["input3"], ["input1"], ["input2"]], [[i.input_file for i in e.elems] for e in actual[2].summary]
+        )
+
+    def test_dedup_engine_max_frames(self) -> None:
+        # Arrange
+        engine = DedupEngine([SanitizerOutput("input1", "san1", "type1", [])], max_frames=3)
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            engine.summary(5)
+
+        with self.assertRaises(ValueError):
+            engine.summary(None)
+
+    def test_group_by_hash(self) -> None:
+        # Arrange
+        sanitizer_infos = [SanitizerOutput.from_file(f) for f in self.sanitizer_files]
+        n_frames_list = [1, 5, 7, None]
+
+        def partition(summary: DedupSummary) -> Set[frozenset]:
+            return {frozenset(info.input_file for info in entry.elems) for entry in summary.summary}
+
+        for consider_filepaths, consider_lines in [(False, False), (True, False), (False, True), (True, True)]:
+            expected = group_by_frames(sanitizer_infos, n_frames_list, consider_filepaths, consider_lines)
+
+            # Act
+            actual = group_by_frames(
+                sanitizer_infos, n_frames_list, consider_filepaths, consider_lines, GroupingMode.HASH
+            )
+
+            # Assert
+            for n_frames in n_frames_list:
+                self.assertEqual(partition(expected[n_frames]), partition(actual[n_frames]))
+                self.assertEqual(
+                    actual[n_frames],
+                    group_by(sanitizer_infos, n_frames, consider_filepaths, consider_lines, GroupingMode.HASH),
+                )
+
+    def test_group_by_hash_stable_bug_ids(self) -> None:
+        # Arrange
+        sanitizer_infos = [SanitizerOutput.from_file(f) for f in self.sanitizer_files]
+
+        # Act
+        actual = group_by(sanitizer_infos, 5, mode=GroupingMode.HASH)
+        actual_reversed = group_by(list(reversed(sanitizer_infos)), 5, mode=GroupingMode.HASH)
+
+        # Assert
+        self.assertEqual(
+            {info.input_file: entry.bug_id for entry in actual.summary for info in entry.elems},
+            {info.input_file: entry.bug_id for entry in actual_reversed.summary for info in entry.elems},
+        )
+
+    def test_group_by_hash_short_traces(self) -> None:
+        # Arrange
+        sanitizer_infos = [
+            SanitizerOutput("input1", "san1", "type1", [StackFrame(0, "file1", "func1", 10)]),
+            SanitizerOutput(
+                "input2", "san1", "type1", [StackFrame(0, "file1", "func1", 10), StackFrame(1, "file2", "func2", 20)]
+            ),
+            SanitizerOutput("input3", "san1", "type1", []),
+            SanitizerOutput("input4", "san1", "type2", [StackFrame(0, "file1", "func1", 10)]),
+        ]
+
+        # Act
+        actual = group_by_frames(sanitizer_infos, [1, 2], True, True, GroupingMode.HASH)
+
+        # Assert
+        self.assertEqual(
+            {frozenset(["input1", "input2"]), frozenset(["input3"]), frozenset(["input4"])},
+            {frozenset(i.input_file for i in e.elems) for e in actual[1].summary},
+        )
+        self.assertEqual(4, len(actual[2].summary))
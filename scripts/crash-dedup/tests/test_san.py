@@ -14,6 +14,7 @@
 
 import unittest
 from pathlib import Path
+from tempfile import TemporaryDirectory
 
 from cdd.container.san import (
     SanitizerOutput,
@@ -24,7 +25,11 @@ from cdd.container.san import (
     string_to_trace,
     STACK_FRAME_SEP,
     STACK_TRACE_SEP,
+    file_name,
+    find_frame,
+    parse_files,
 )
+from cdd.utils.proc import run_with_multiproc
 
 
 class TestStackFrame(unittest.TestCase):
@@ -91,6 +96,37 @@ class TestStackTrace(unittest.TestCase):
         self.assertEqual(expected, actual)
 
 
+class TestFindFrame(unittest.TestCase):
+    def test_find_frame(self) -> None:
+        # Arrange
+        lines = [
+            "    #3 0x50a4ff in readMovie /path/to/build/../../util/main.c:277:4",
+            "    #6 0x41c3bd in _start (/path/to/swftophp+0x41c3bd)",
+            "    #5 0x7f2b1c  (/lib/x86_64-linux-gnu/libc.so.6+0x29d8f)",
+            "==703472==ABORTING",
+        ]
+        expected = [
+            StackFrame(3, "main.c", "readMovie", 277),
+            StackFrame(6, "-", "_start", -1),
+            StackFrame(5, "-", "-", -1),
+            None,
+        ]
+
+        # Act
+        actual = [find_frame(line) for line in lines]
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_file_name(self) -> None:
+        for path in ["/path/to/file.c", "file.c", "/path/to/../file.c", "/path/to/dir/", "/path/to/.", "/"]:
+            # Act
+            actual = file_name(path)
+
+            # Assert
+            self.assertEqual(Path(path).name, actual)
+
+
 class TestSanitizerOutput(unittest.TestCase):
     def test_from_file(self) -> None:
         # Arrange
@@ -187,3 +223,75 @@ class TestSanitizerOutput(unittest.TestCase):
         # Assert
         for i in range(len(expected)):
             self.assertEqual(expected[i], actual[i])
+
+    def test_from_lines(self) -> None:
+        # Arrange
+        lines = [
+            "INPUT_FILE: /path/to/file01\n",
+            "==1==ERROR: AddressSanitizer: SEGV on unknown address 0x000000000000\n",
+            "    #0 0x50424a in func /path/to/file.c:10:13\n",
+            "    #1 0x41c3bd in _start (/path/to/binary+0x41c3bd)\n",
+            "\n",
+            "SUMMARY: AddressSanitizer: SEGV /path/to/file.c:10:13 in func\n",
+        ]
+        expected = SanitizerOutput(
+            "/path/to/file01",
+            "addresssanitizer",
+            "segv",
+            [StackFrame(0, "file.c", "func", 10), StackFrame(1, "-", "_start", -1)],
+        )
+
+        # Act
+        actual = SanitizerOutput.from_lines(lines)
+
+        # Assert
+        self.assertEqual(expected, actual)
+        self.assertEqual(expected.input_file, actual.input_file)  # type: ignore
+
+    def test_from_lines_truncated(self) -> None:
+        # Arrange
+        lines = ["==1==ERROR: AddressSanitizer: SEGV on unknown address\n", "    #0 0x50424a in func /file.c:10:13\n"]
+
+        # Act
+        actual = SanitizerOutput.from_lines(lines)
+
+        # Assert
+        self.assertIsNone(actual)
+
+
+class TestParseFiles(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+
+        self.invalid_file = Path(self.temp_dir.name) / "invalid"
+        self.invalid_file.write_text("==1==ERROR: AddressSanitizer: SEGV on unknown address\n")
+
+        self.sanitizer_files = [
+            Path(__file__).parent / "data" / "sanitizer" / "test.703472",
+            self.invalid_file,
+            Path(__file__).parent / "data" / "sanitizer" / "test.703478",
+        ]
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_parse_files(self) -> None:
+        # Act
+        actual = parse_files(self.sanitizer_files)
+
+        # Assert
+        self.assertEqual(self.sanitizer_files, [result.file for result in actual])
+        self.assertEqual(SanitizerOutput.from_file(self.sanitizer_files[0]), actual[0].san_output)
+        self.assertIsNone(actual[1].san_output)
+        self.assertIn(str(self.invalid_file), actual[1].error)
+        self.assertIsNone(actual[2].error)
+
+    def test_parse_files_multiproc(self) -> None:
+        # Arrange
+        expected = parse_files(self.sanitizer_files)
+
+        # Act
+        actual = run_with_multiproc(parse_files, [([file],) for file in self.sanitizer_files], 2)
+
+        # Assert
+        self.assertEqual(expected, [result for results in actual for result in results])
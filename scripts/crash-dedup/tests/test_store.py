@@ -0,0 +1,159 @@
+# Copyright 2023-2024 Chair for Software & Systems Engineering, TUM
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Dict
+
+from cdd.container.san import ParseResult, SanitizerOutput, StackFrame, parse_files
+from cdd.container.summary import DedupSummary
+from cdd.grouping import GroupingMode, group_by_frames
+from cdd.store import DedupStore
+
+
+def bug_ids(summary: DedupSummary) -> Dict[str, int]:
+    """
+    Get the bug ID by input file of a summary.
+
+    :param summary:
+    :return:
+    """
+    return {info.input_file: entry.bug_id for entry in summary.summary for info in entry.elems}
+
+
+class TestDedupStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_file = self.temp_dir / "dedup.db"
+
+        self.sanitizer_files = []
+
+        for file in sorted((Path(__file__).parent / "data" / "sanitizer").iterdir()):
+            self.sanitizer_files.append(self.temp_dir / file.name)
+            shutil.copy(file, self.temp_dir / file.name)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    def update(self, store: DedupStore) -> None:
+        stale_files = store.stale_files(self.sanitizer_files)
+        store.update(parse_files(sorted(stale_files)), stale_files)
+
+    def test_stale_files(self) -> None:
+        # Arrange
+        with DedupStore(self.db_file) as store:
+            self.update(store)
+
+        stat = os.stat(self.sanitizer_files[0])
+        os.utime(self.sanitizer_files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        # Act
+        with DedupStore(self.db_file) as store:
+            actual = store.stale_files(self.sanitizer_files)
+
+        # Assert
+        self.assertEqual([self.sanitizer_files[0]], list(actual.keys()))
+
+    def test_results(self) -> None:
+        # Arrange
+        expected = parse_files(self.sanitizer_files)
+
+        trace = [StackFrame(0, "file1", "func1", 10)]
+        extra_results = [
+            ParseResult(self.temp_dir / "extra1", SanitizerOutput("input1", "san1", "type1", trace), None),
+            ParseResult(self.temp_dir / "extra2", SanitizerOutput("input2", "san1", "type1", []), None),
+            ParseResult(self.temp_dir / "extra3", None, "Invalid sanitizer output!"),
+        ]
+
+        for result in extra_results:
+            result.file.write_text("")
+
+        # Act
+        with DedupStore(self.db_file) as store:
+            self.update(store)
+            store.update(extra_results, store.stale_files([result.file for result in extra_results]))
+
+            actual = store.results(self.sanitizer_files + [result.file for result in extra_results])
+
+        # Assert
+        self.assertEqual(expected + extra_results, actual)
+        self.assertEqual(
+            [r.san_output.input_file for r in expected + extra_results[:2]],
+            [r.san_output.input_file for r in actual if r.san_output is not None],
+        )
+
+    def test_group_by_frames(self) -> None:
+        # Arrange
+        n_frames_list = [1, 5, None]
+
+        with DedupStore(self.db_file) as store:
+            self.update(store)
+            sanitizer_infos = [
+                result.san_output for result in store.results(self.sanitizer_files) if result.error is None
+            ]
+
+        expected = group_by_frames(sanitizer_infos, n_frames_list, True, False, GroupingMode.HASH)
+
+        # Act
+        with DedupStore(self.db_file) as store:
+            actual = store.group_by_frames(sanitizer_infos, n_frames_list, True, False)
+
+        # Assert
+        for n_frames in n_frames_list:
+            self.assertEqual(bug_ids(expected[n_frames]), bug_ids(actual[n_frames]))
+
+    def test_group_by_frames_keeps_bug_ids(self) -> None:
+        # Arrange
+        sanitizer_infos = [SanitizerOutput.from_file(f) for f in self.sanitizer_files]
+        new_info = SanitizerOutput("input_new", "san_new", "type_new", [StackFrame(0, "file1", "func1", 10)])
+
+        with DedupStore(self.db_file) as store:
+            expected = bug_ids(store.group_by_frames(sanitizer_infos[1:], [5])[5])
+
+        # Act
+        with DedupStore(self.db_file) as store:
+            actual = bug_ids(store.group_by_frames([new_info] + sanitizer_infos, [5])[5])
+
+        # Assert
+        for input_file, bug_id in expected.items():
+            self.assertEqual(bug_id, actual[input_file])
+
+        self.assertEqual(max(expected.values()) + 1, actual["input_new"])
+
+    def test_unsupported_version(self) -> None:
+        # Arrange
+        with sqlite3.connect(self.db_file) as conn:
+            conn.execute("PRAGMA user_version = 42")
+
+        # Act / Assert
+        with self.assertRaises(Exception):
+            DedupStore(self.db_file)
+
+    def test_prune(self) -> None:
+        # Arrange
+        with DedupStore(self.db_file) as store:
+            self.update(store)
+
+        # Act
+        with DedupStore(self.db_file) as store:
+            n_removed = store.prune(self.sanitizer_files[1:])
+            actual = store.results(self.sanitizer_files)
+
+        # Assert
+        self.assertEqual(1, n_removed)
+        self.assertEqual(self.sanitizer_files[1:], [result.file for result in actual])